@@ -5,18 +5,19 @@ example to search max in single peak problem
 # Copyright (c) 2015-2021 Neal Nie. All rights reserved.
 
 import numpy as np
-from openGA import GeneticAlgorithm, Individual
+from typing import List
+from openGA import GeneticAlgorithm
 
 
-def object_funct(x: float, y: float) -> float:
+def object_funct(x: np.ndarray, y: np.ndarray) -> np.ndarray:
     """single peak sine objective funciton
 
     Args:
-        x (float): x direction var in [0,1]
-        y (float): y direction var in [0,1]
+        x (np.ndarray): x direction var in [0,1]
+        y (np.ndarray): y direction var in [0,1]
 
     Returns:
-        float: object value, in [-1,1]
+        np.ndarray: object value, in [0,4]
     """
     x_rad = x * np.pi * 2
     y_rad = y * np.pi * 2
@@ -24,25 +25,19 @@ def object_funct(x: float, y: float) -> float:
     return t
 
 
-def patch_funct(self):
-    arg0 = self.plasm.to_dict()['x']
-    arg1 = self.plasm.to_dict()['y']
-    self._fitness = object_funct(arg0, arg1)
-
-
-def dummy_funct(self):
-    pass
+def batch_funct(genes: np.ndarray, names: List[str]) -> np.ndarray:
+    x = genes[:, names.index('x')]
+    y = genes[:, names.index('y')]
+    return object_funct(x, y)
 
 
 if __name__ == "__main__":
-    Individual.evaluate = patch_funct
-    Individual.express = dummy_funct
     base_gene = {
         'x': 0.7,
         'y': 0.2
     }
     ga = GeneticAlgorithm(base_gene)
-    ga._patched = True
+    ga.add_batch_patch(batch_funct)
     print("at initial condition")
     print(ga.people)
     ga.run(gen_max=100)
@@ -26,16 +26,38 @@ logger.addHandler(console)
 # logger.setLevel(logging.ERROR)
 
 # define default avaibable Class/Function/Variable of openGA
+from .schema import GeneSchema
 from .chromosome import Chromosome
+from .permutation import PermutationChromosome
 from .individual import Individual
 from .population import Population
+from .array_population import ArrayPopulation
+from .cache import FitnessCache
+from .store import FitnessStore
+from .recorder import Recorder, read_record
+from .stats import GenerationStats
+from .evaluator import Evaluator, BatchEvaluator, PatchEvaluator, FunctionEvaluator, PoolEvaluator, AsyncEvaluator
 from .genetic_algorithm import GeneticAlgorithm
 from .version import __version__
 
 __all__ = [
     "__version__",
+    "GeneSchema",
     "Chromosome",
+    "PermutationChromosome",
     "Individual",
     "Population",
+    "ArrayPopulation",
+    "FitnessCache",
+    "FitnessStore",
+    "Recorder",
+    "read_record",
+    "GenerationStats",
+    "Evaluator",
+    "BatchEvaluator",
+    "PatchEvaluator",
+    "FunctionEvaluator",
+    "PoolEvaluator",
+    "AsyncEvaluator",
     "GeneticAlgorithm"
 ]
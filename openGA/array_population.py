@@ -0,0 +1,508 @@
+"""
+array-backed population for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Union
+from .chromosome import Chromosome
+from .individual import Individual
+from .utils import get_stream, tournament, survive, RandomStream
+from .evaluator import Evaluator
+from .schema import GeneSchema
+
+logger = logging.getLogger('openGA')
+
+
+class ArrayPopulation(object):
+    """
+    population keeps genes of all individuals in one 2D array(individual x gene) with fitness, gen_id and idv_id columns.
+    rows [0, size) are current generation, rows after them are children. individuals are only created on demand.
+    """
+
+    def __init__(self, gen_id: int, genes: np.ndarray, gene_names: Union[List[str], GeneSchema, Chromosome], capacity: int = 20,
+                 fitness: Union[np.ndarray, None] = None, check: bool = True,
+                 rng: Union[RandomStream, None] = None, evaluator: Union[Evaluator, None] = None,
+                 copy: bool = True) -> ArrayPopulation:
+        """create array-backed population.
+
+        Args:
+            gen_id (int): generate id of current generation.
+            genes (np.ndarray): gene values of current generation in shape of (individual, gene).
+            gene_names (Union[List[str], GeneSchema, Chromosome]): list of gene name or gene schema, same order as gene columns, or chromosome as template whose type decides genetic operation.
+            capacity (int, optional): max individual could live in environment. Defaults to 20.
+            fitness (Union[np.ndarray, None], optional): fitness of each individual, NaN for not grow-up. Defaults to None(all not grow-up).
+            check (bool, optional): check flag of chromosome carried by individuals. Defaults to True.
+            rng (Union[RandomStream, None], optional): random stream for genetic operation. Defaults to None(module shared stream).
+            evaluator (Union[Evaluator, None], optional): evaluator to update fitness. Defaults to None(monkey patch of Individual).
+            copy (bool, optional): True, population keeps copy of genes and fitness. False, population takes ownership of float arrays as they are. Defaults to True.
+
+        Raises:
+            ValueError: error message of `gene matrix unmatch with gene names.`, if column number differs from gene number.
+
+        Returns:
+            ArrayPopulation: new population object.
+        """
+        if isinstance(gene_names, Chromosome):
+            self._plasm = gene_names._blank()
+            self._plasm.check = check
+        else:
+            self._plasm = Chromosome(gene_names, check)
+        dtype = self._plasm.schema.dtype
+        if copy:
+            genes = np.array(genes, dtype=dtype, ndmin=2)
+        else:
+            genes = np.atleast_2d(np.asarray(genes, dtype=dtype))
+        if genes.shape[1] != self._plasm.size():
+            raise ValueError('gene matrix unmatch with gene names, got %d columns for %d genes' % (
+                genes.shape[1], self._plasm.size()))
+        self._capacity = capacity
+        self._rng = get_stream(rng)
+        self._evaluator = evaluator
+        self._gen_id = gen_id
+        self._size = genes.shape[0]
+        self._genes = genes
+        if fitness is None:
+            self._fitness = np.full(self._size, np.nan)
+        else:
+            self._fitness = np.array(fitness, dtype=float) if copy else np.asarray(fitness, dtype=float)
+        self._gen_ids = np.full(self._size, gen_id, dtype=int)
+        self._idv_ids = np.arange(self._size)
+        self._parents = np.zeros(0, dtype=int)
+        self._children = np.zeros(0, dtype=int)
+        self._next_gen = np.zeros(0, dtype=int)
+
+    @classmethod
+    def from_individuals(cls, gen_id: int, curr_gen: List[Individual], capacity: int = 20,
+                         rng: Union[RandomStream, None] = None,
+                         evaluator: Union[Evaluator, None] = None) -> ArrayPopulation:
+        """create array-backed population from individuals.
+
+        Args:
+            gen_id (int): generate id of current generation.
+            curr_gen (List[Individual]): list of individual of current generation, at least one.
+            capacity (int, optional): max individual could live in environment. Defaults to 20.
+            rng (Union[RandomStream, None], optional): random stream for genetic operation. Defaults to None(module shared stream).
+            evaluator (Union[Evaluator, None], optional): evaluator to update fitness. Defaults to None(monkey patch of Individual).
+
+        Returns:
+            ArrayPopulation: new population object.
+        """
+        plasm = curr_gen[0]._plasm
+        genes = np.array([p._plasm._gene_values for p in curr_gen])
+        fitness = np.array([np.nan if p._fitness is None else p._fitness for p in curr_gen])
+        return cls(gen_id, genes, plasm, capacity, fitness, plasm.check, rng, evaluator, copy=False)
+
+    def individual(self, row: int) -> Individual:
+        """create individual from one row of gene array.
+
+        Args:
+            row (int): row index in gene array, children rows follow current generation rows.
+
+        Returns:
+            Individual: individual carries genes, fitness and ids of the row.
+        """
+        person = Individual(self._plasm)
+        person._plasm._assign(self._genes[row])
+        person.gen_id = int(self._gen_ids[row])
+        person.idv_id = int(self._idv_ids[row])
+        fit = self._fitness[row]
+        person._fitness = None if np.isnan(fit) else fit
+        return person
+
+    def _individuals(self, rows: np.ndarray) -> List[Individual]:
+        return [self.individual(i) for i in rows]
+
+    def to_df(self, default_fit: float = np.nan) -> pd.DataFrame:
+        """convert population into dataframe with row of each individual of current generation, built from columns of to_columns().
+
+        Args:
+            default_fit (float, optional): default value for fitness when individual not grow-up. Defaults to np.nan.
+
+        Returns:
+            pd.DataFrame: population in dataframe format.
+        """
+        return pd.DataFrame(self.to_columns(default_fit))
+
+    def to_columns(self, default_fit: float = np.nan) -> Dict[str, np.ndarray]:
+        """convert current generation into columns of `gen_id`, `idv_id`, `fitness` and ${gene_names} of plasm.
+
+        Args:
+            default_fit (float, optional): default value for fitness when individual not grow-up. Defaults to np.nan.
+
+        Returns:
+            Dict[str, np.ndarray]: column name and its values copied from gene array, row of each individual.
+        """
+        fitness = self._fitness[:self._size].copy()
+        fitness[np.isnan(fitness)] = default_fit
+        rlt = {
+            'gen_id': self._gen_ids[:self._size].copy(),
+            'idv_id': self._idv_ids[:self._size].copy(),
+            'fitness': fitness
+        }
+        genes = self._genes[:self._size].T.copy()
+        for i, name in enumerate(self._plasm._gene_names):
+            rlt[name] = genes[i]
+        return rlt
+
+    def __str__(self) -> str:
+        rlt_str = f"population({self._size:d}/{self._capacity}):\n"
+        rlt_str += f"current generation @{self._gen_id:d}:\n"
+        for p in self.curr_gen:
+            rlt_str += f"{p}\n"
+        rlt_str += f"parents [{len(self._parents):d}]:\n"
+        for p in self._individuals(self._parents):
+            rlt_str += f"{p}\n"
+        rlt_str += f"children [{len(self._children):d}]:\n"
+        for p in self._individuals(self._children):
+            rlt_str += f"{p}\n"
+        rlt_str += f"next generation [{len(self._next_gen):d}]:\n"
+        for p in self._individuals(self._next_gen):
+            rlt_str += f"{p}\n"
+        return rlt_str
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def gen_id(self) -> int:
+        """get generate id of `this` population.
+
+        Returns:
+            int: generate id.
+        """
+        return self._gen_id
+
+    @property
+    def evaluator(self) -> Union[Evaluator, None]:
+        """get evaluator of `this` population.
+
+        Returns:
+            Union[Evaluator, None]: evaluator, None for monkey patch of Individual.
+        """
+        return self._evaluator
+
+    @evaluator.setter
+    def evaluator(self, evaluator: Union[Evaluator, None]):
+        self._evaluator = evaluator
+
+    @property
+    def genes(self) -> np.ndarray:
+        """get a deep copy of gene array of current generation.
+
+        Returns:
+            np.ndarray: gene array in shape of (individual, gene).
+        """
+        return self._genes[:self._size].copy()
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """get a deep copy of fitness of current generation, NaN for not grow-up individual.
+
+        Returns:
+            np.ndarray: fitness array.
+        """
+        return self._fitness[:self._size].copy()
+
+    def decode(self, rows: Union[np.ndarray, None] = None) -> np.ndarray:
+        """map gene values of rows into physical units by bounds of gene schema in one call.
+
+        Args:
+            rows (Union[np.ndarray, None], optional): row indices in gene array. Defaults to None(current generation).
+
+        Returns:
+            np.ndarray: physical values in shape of (individual, gene).
+        """
+        if rows is None:
+            rows = np.arange(self._size)
+        return self._plasm.schema.decode(self._genes[rows])
+
+    @property
+    def nbytes(self) -> int:
+        """get memory footprint of arrays of `this` population, itemsize * gene number + 24 bytes per individual.
+
+        Returns:
+            int: bytes of gene, fitness and id arrays.
+        """
+        return self._genes.nbytes + self._fitness.nbytes + self._gen_ids.nbytes + self._idv_ids.nbytes
+
+    @property
+    def curr_gen(self) -> List[Individual]:
+        """get individuals in current generation, created from gene array.
+
+        Returns:
+            List[Individual]: list of individuals.
+        """
+        return self._individuals(range(self._size))
+
+    @property
+    def parents(self) -> List[Individual]:
+        """get parent individuals, created from gene array.
+
+        Raises:
+            ValueError: error message of `parents not avialable, need select() in prior.`.
+
+        Returns:
+            List[Individual]: list of parent individuals.
+        """
+        if not len(self._parents):
+            raise ValueError('parents not avialable, need select() in prior.')
+        return self._individuals(self._parents)
+
+    @property
+    def children(self) -> List[Individual]:
+        """get children individuals, created from gene array.
+
+        Raises:
+            ValueError: error message of `children not available, need reproduce() in prior.`.
+
+        Returns:
+            List[Individual]: list of children individuals.
+        """
+        if not len(self._children):
+            raise ValueError(
+                'children not available, need reproduce() in prior.')
+        return self._individuals(self._children)
+
+    @property
+    def next_gen(self) -> List[Individual]:
+        """get individuals in next generation, created from gene array.
+
+        Raises:
+            ValueError: error message of `next generation not available, need elimate() in prior.`.
+
+        Returns:
+            List[Individual]: list of individuals in next generation.
+        """
+        if not len(self._next_gen):
+            raise ValueError(
+                'next generation not available, need elimate() in prior.')
+        return self._individuals(self._next_gen)
+
+    def size(self) -> int:
+        """get number of individuals in current generation.
+        """
+        return self._size
+
+    def evaluate(self, rows: np.ndarray):
+        """evaluate performance of individuals at given rows to update fitness, grow-up ones are skipped.
+
+        Args:
+            rows (np.ndarray): row indices in gene array.
+        """
+        rows = np.asarray(rows, dtype=int)
+        pending = rows[np.isnan(self._fitness[rows])]
+        if self._evaluator is not None:
+            if len(pending):
+                self._fitness[pending] = self._evaluator.evaluate_genes(
+                    self._genes[pending], self._plasm)
+            return
+        for i in pending:
+            person = self.individual(i)
+            person.express()
+            person.evaluate()
+            self._fitness[i] = person.fitness
+
+    async def evaluate_async(self, rows: np.ndarray):
+        """Coroutine. evaluate performance of individuals at given rows to update fitness without blocking event loop.
+
+        Args:
+            rows (np.ndarray): row indices in gene array.
+        """
+        if self._evaluator is None:
+            self.evaluate(rows)
+            return
+        rows = np.asarray(rows, dtype=int)
+        pending = rows[np.isnan(self._fitness[rows])]
+        if len(pending):
+            self._fitness[pending] = await self._evaluator.evaluate_genes_async(
+                self._genes[pending], self._plasm)
+
+    def append_newcomer(self, newcomer: Individual):
+        """add new individual into current generation as adult.
+
+        Args:
+            newcomer (Individual): new individual to be added.
+
+        Raises:
+            ValueError: error message of `invalid newcomer.`, if newcomer's plasm not match with chromosome of population.
+        """
+        if not self._plasm.is_couple(newcomer._plasm):
+            raise ValueError('invalid newcomer as reproduction isolation')
+        # keep children rows behind current generation
+        row = self._size
+        fit = np.nan if newcomer._fitness is None else newcomer._fitness
+        self._genes = np.insert(self._genes, row, newcomer._plasm._gene_values, axis=0)
+        self._fitness = np.insert(self._fitness, row, fit)
+        self._gen_ids = np.insert(self._gen_ids, row, self._gen_id)
+        self._idv_ids = np.insert(self._idv_ids, row, row)
+        self._size += 1
+
+    def _append_newborn(self, genes: np.ndarray) -> np.ndarray:
+        """add rows of new individuals as children.
+
+        Args:
+            genes (np.ndarray): gene values of children in shape of (individual, gene).
+
+        Returns:
+            np.ndarray: row indices of children.
+        """
+        start = self._genes.shape[0]
+        n_born = genes.shape[0]
+        self._genes = np.vstack([self._genes, genes])
+        self._fitness = np.concatenate(
+            [self._fitness, np.full(n_born, np.nan)])
+        self._gen_ids = np.concatenate(
+            [self._gen_ids, np.full(n_born, self._gen_id, dtype=int)])
+        self._idv_ids = np.concatenate(
+            [self._idv_ids, np.arange(start, start + n_born)])
+        return np.arange(start, start + n_born)
+
+    def select(self, pool_size: Union[int, None] = None, tour_size: int = 2, replace: bool = False) -> np.ndarray:
+        """select indvidual from current generation as parents for reproduce by tournament.
+
+        Args:
+            pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
+            tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            replace (bool, optional): True, an individual could be selected as parent more than once. False, each parent is unique. Defaults to False.
+
+        Returns:
+            np.ndarray: row indices of parents.
+        """
+        if pool_size is None:
+            pool_size = int(self._size/2)
+        # evaluate parents
+        self.evaluate(np.arange(self._size))
+        # candidates compete
+        self._parents = tournament(
+            self._fitness[:self._size], pool_size, tour_size, replace, self._rng)
+        return self._parents.copy()
+
+    def reproduce(self, cross_prob: float = 0.9, gene_prob: float = 1.0) -> np.ndarray:
+        """generate child individuals from parent by sexual and asexual reproduction.
+
+        Args:
+            cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
+
+        Raises:
+            ValueError: error message of `invalid cross_prob.`, when cross_prob not in [0, 1].
+
+        Returns:
+            np.ndarray: row indices of children.
+        """
+        self._breed(cross_prob, gene_prob)
+        # evaluate children
+        self.evaluate(self._children)
+        return self._children.copy()
+
+    def _breed(self, cross_prob: float, gene_prob: float):
+        """generate rows of children from parents without evaluation.
+
+        Args:
+            cross_prob (float): cross-over probability.
+            gene_prob (float): mutation probability of each gene in asexual reproduction.
+
+        Raises:
+            ValueError: error message of `invalid cross_prob.`, when cross_prob not in [0, 1].
+        """
+        if not 0 <= cross_prob <= 1:
+            raise ValueError(
+                'invalid cross_prob. Must in [0,1], got %6.4f' % cross_prob)
+        # drop children of last reproduction
+        n_rows = self._size
+        self._genes = self._genes[:n_rows]
+        self._fitness = self._fitness[:n_rows]
+        self._gen_ids = self._gen_ids[:n_rows]
+        self._idv_ids = self._idv_ids[:n_rows]
+        n_parents = len(self._parents)
+        crossed = self._rng.random(n_parents) < cross_prob
+        if n_parents < 2:
+            crossed[:] = False
+        n_cross = int(np.count_nonzero(crossed))
+        # sexual produce, couple never pairs a parent with itself
+        p0_idx = self._rng.integers(0, max(n_parents, 1), n_cross)
+        p1_idx = (p0_idx + self._rng.integers(1, max(n_parents, 2), n_cross)) % max(n_parents, 1)
+        c0, c1 = self._plasm._cross_rows(self._genes[self._parents[p0_idx]],
+                                         self._genes[self._parents[p1_idx]], rng=self._rng)
+        # asexual produce mutation
+        p_idx = self._rng.integers(0, max(n_parents, 1), n_parents - n_cross)
+        c2 = self._plasm._mutate_rows(self._genes[self._parents[p_idx]],
+                                      gene_prob=gene_prob, rng=self._rng)
+        newborn = np.vstack([c0, c1, c2])
+        self._children = self._append_newborn(
+            newborn.astype(self._genes.dtype, copy=False))
+
+    def eliminate(self, survival: str = 'plus') -> np.ndarray:
+        """select rows of next generation by eliminating individuals with lower fitness in current generation and children group.
+
+        Args:
+            survival (str, optional): 'plus' for (mu+lambda), current generation and children compete together. 'comma' for (mu,lambda), only children survive. Defaults to 'plus'.
+
+        Returns:
+            np.ndarray: row indices of survivors with number of capacity, sorted on fitness from high to low.
+        """
+        # children rows follow current generation rows
+        self._next_gen = survive(self._fitness[:self._size], self._fitness[self._size:],
+                                 self._capacity, survival)
+        return self._next_gen.copy()
+
+    def evolve(self, pool_size: Union[int, None] = None, tour_size: int = 2, cross_prob: float = 0.9,
+               gene_prob: float = 1.0, replace: bool = False, survival: str = 'plus') -> ArrayPopulation:
+        """`this` population evolve into new population by select(), reproduce() and eliminate().
+
+        Args:
+            pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
+            tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
+            replace (bool, optional): True, an individual could be selected as parent more than once. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
+
+        Returns:
+            ArrayPopulation: new population after evolution.
+        """
+        self.select(pool_size, tour_size, replace)
+        self.reproduce(cross_prob, gene_prob)
+        survivors = self.eliminate(survival)
+        return self._next_population(survivors)
+
+    async def evolve_async(self, pool_size: Union[int, None] = None, tour_size: int = 2, cross_prob: float = 0.9,
+                           gene_prob: float = 1.0, replace: bool = False, survival: str = 'plus') -> ArrayPopulation:
+        """Coroutine. `this` population evolve into new population as evolve(), rows are evaluated by evaluate_async().
+
+        Args:
+            pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
+            tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
+            replace (bool, optional): True, an individual could be selected as parent more than once. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
+
+        Returns:
+            ArrayPopulation: new population after evolution.
+        """
+        await self.evaluate_async(np.arange(self._size))
+        self.select(pool_size, tour_size, replace)
+        self._breed(cross_prob, gene_prob)
+        await self.evaluate_async(self._children)
+        survivors = self.eliminate(survival)
+        return self._next_population(survivors)
+
+    def _next_population(self, survivors: np.ndarray) -> ArrayPopulation:
+        """create population of next generation from survivor rows.
+
+        Args:
+            survivors (np.ndarray): row indices of survivors.
+
+        Returns:
+            ArrayPopulation: new population after evolution.
+        """
+        next_gen_id = self._gen_id + 1
+        next_population = ArrayPopulation(next_gen_id, self._genes[survivors], self._plasm,
+                                          self._capacity, self._fitness[survivors], self._plasm.check, self._rng,
+                                          self._evaluator, copy=False)
+        return next_population
@@ -0,0 +1,140 @@
+"""
+fitness cache for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import numpy as np
+from collections import OrderedDict
+from typing import List, Union
+from .chromosome import GENE_PRECISION
+
+logger = logging.getLogger('openGA')
+
+
+def gene_keys(genes: np.ndarray, precision: Union[int, None] = GENE_PRECISION) -> List[bytes]:
+    """convert each row of gene matrix into genotype key.
+
+    Args:
+        genes (np.ndarray): gene values in shape of (individual, gene).
+        precision (Union[int, None], optional): decimals of gene values rounded into key. Defaults to GENE_PRECISION, None for exact values.
+
+    Returns:
+        List[bytes]: key of each row.
+    """
+    if precision is not None:
+        genes = np.round(genes, precision)
+    # adding zero folds -0.0 into 0.0, so both share one key
+    rounded = np.ascontiguousarray(genes, dtype=float) + 0.0
+    return [row.tobytes() for row in rounded]
+
+
+class FitnessCache(object):
+    """
+    fitness memo with least-recently-used eviction, keyed on gene values rounded to gene precision.
+    """
+
+    def __init__(self, maxsize: int = 4096, precision: Union[int, None] = GENE_PRECISION) -> FitnessCache:
+        """create fitness cache.
+
+        Args:
+            maxsize (int, optional): max number of genotype kept, least recently used one is evicted beyond it. Defaults to 4096.
+            precision (Union[int, None], optional): decimals of gene values rounded into key. Defaults to GENE_PRECISION, None for exact values.
+
+        Raises:
+            ValueError: error message of `invalid maxsize.`, when maxsize less than 1.
+
+        Returns:
+            FitnessCache: new cache object.
+        """
+        if maxsize < 1:
+            raise ValueError('invalid maxsize. Must >= 1, got %d' % maxsize)
+        self._maxsize = maxsize
+        self._precision = precision
+        self._memo = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def __str__(self) -> str:
+        return f"cache({len(self._memo):d}/{self._maxsize:d}): hits {self._hits:d}, misses {self._misses:d}"
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def maxsize(self) -> int:
+        """get max number of genotype kept.
+
+        Returns:
+            int: max size.
+        """
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        """get number of lookups served by cache.
+
+        Returns:
+            int: hit counter.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """get number of lookups not found in cache.
+
+        Returns:
+            int: miss counter.
+        """
+        return self._misses
+
+    def keys(self, genes: np.ndarray) -> List[bytes]:
+        """convert each row of gene matrix into cache key.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+
+        Returns:
+            List[bytes]: key of each row.
+        """
+        return gene_keys(genes, self._precision)
+
+    def get(self, key: bytes) -> Union[float, None]:
+        """look up fitness of key, and mark it as most recently used.
+
+        Args:
+            key (bytes): genotype key.
+
+        Returns:
+            Union[float, None]: fitness, None if not cached.
+        """
+        fit = self._memo.get(key)
+        if fit is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._memo.move_to_end(key)
+        return fit
+
+    def put(self, key: bytes, fit: float):
+        """add fitness of key, evict least recently used one when full.
+
+        Args:
+            key (bytes): genotype key.
+            fit (float): fitness value.
+        """
+        self._memo[key] = float(fit)
+        self._memo.move_to_end(key)
+        if len(self._memo) > self._maxsize:
+            self._memo.popitem(last=False)
+
+    def clear(self):
+        """drop all cached fitness and reset counters.
+        """
+        self._memo.clear()
+        self._hits = 0
+        self._misses = 0
@@ -0,0 +1,74 @@
+"""
+checkpoint file of genetic algorithm state
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import json
+import logging
+import os
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+logger = logging.getLogger('openGA')
+
+CHECKPOINT_VERSION = 1
+
+# key of json meta in checkpoint archive
+_META_KEY = '__meta__'
+
+
+def save_checkpoint(path: Union[str, Path], meta: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+    """write arrays and meta into uncompressed npz file atomically, file is replaced only after it is fully written.
+
+    Args:
+        path (Union[str, Path]): path of checkpoint file.
+        meta (Dict[str, Any]): json serializable settings and counters.
+        arrays (Dict[str, np.ndarray]): numeric arrays by name, name could contain `/` as namespace.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    meta = dict(meta, version=CHECKPOINT_VERSION)
+    with tmp.open('wb') as f:
+        np.savez(f, **{_META_KEY: np.array(json.dumps(meta))}, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """read checkpoint file written by save_checkpoint(), no object is unpickled.
+
+    Args:
+        path (Union[str, Path]): path of checkpoint file.
+
+    Raises:
+        ValueError: error message of `invalid checkpoint.`, when file is not checkpoint of supported version.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, np.ndarray]]: meta and arrays by name.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if _META_KEY not in data.files:
+            raise ValueError('invalid checkpoint. Must contain %s, got %s' %
+                             (_META_KEY, data.files))
+        meta = json.loads(str(data[_META_KEY]))
+        if meta.get('version') != CHECKPOINT_VERSION:
+            raise ValueError('invalid checkpoint. Must version %d, got %s' %
+                             (CHECKPOINT_VERSION, meta.get('version')))
+        arrays = {key: data[key] for key in data.files if key != _META_KEY}
+    return meta, arrays
+
+
+def split_arrays(arrays: Dict[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    """get arrays under namespace prefix, with prefix removed from name.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): arrays by name.
+        prefix (str): namespace, e.g. `stats/`.
+
+    Returns:
+        Dict[str, np.ndarray]: arrays of namespace.
+    """
+    return {key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)}
@@ -5,26 +5,28 @@ chromosome for genetic algorithm
 
 from __future__ import annotations
 import logging
+import sys
 import numpy as np
-from typing import Dict, Union, List, Tuple
-from .utils import limit, uniform_open, GENE_MIN, GENE_MAX
+from typing import Any, Dict, Union, List, Tuple
+from .utils import limit, get_stream, RandomStream, GENE_MIN, GENE_MAX, GENE_PRECISION
+from .schema import GeneSchema, get_schema
 
 logger = logging.getLogger('openGA')
 
-GENE_PRECISION = 4
 
-
-def dist_crossover(r: float, eta: Union[int, float] = 20) -> float:
+def dist_crossover(r: Union[float, np.ndarray], eta: Union[int, float] = 20) -> Union[float, np.ndarray]:
     """distribution of cross-over coefficiency $\beta$. mean = 1.
 
     Args:
-        r (float): random factor in (0, 1).
+        r (Union[float, np.ndarray]): random factor in (0, 1), or array of them.
         eta (Union[int, float], optional): distribution index. Defaults to 20.
 
     Returns:
-        float: cross-over factor $\beta$
+        Union[float, np.ndarray]: cross-over factor $\beta$, element-wise for array input.
     """
     k = 1 / (eta + 1)
+    if isinstance(r, np.ndarray):
+        return np.where(r <= 0.5, (2 * r) ** k, (2 * (1 - r)) ** -k)
     if r <= 0.5:
         rlt = (2 * r) ** k
     else:
@@ -32,17 +34,19 @@ def dist_crossover(r: float, eta: Union[int, float] = 20) -> float:
     return rlt
 
 
-def dist_mutation(r: float, eta: Union[int, float] = 20) -> float:
+def dist_mutation(r: Union[float, np.ndarray], eta: Union[int, float] = 20) -> Union[float, np.ndarray]:
     """distribution of mutation coefficiency $\theta$. mean = 0.
 
     Args:
-        r (float): random factor in (0, 1).
+        r (Union[float, np.ndarray]): random factor in (0, 1), or array of them.
         eta (Union[int, float], optional): distribution index. Defaults to 20.
 
     Returns:
-        float: mutation factor $\theta$
+        Union[float, np.ndarray]: mutation factor $\theta$, element-wise for array input.
     """
     k = 1 / (eta + 1)
+    if isinstance(r, np.ndarray):
+        return np.where(r < 0.5, (2 * r) ** k - 1, 1 - (2 * (1 - r)) ** k)
     if r < 0.5:
         rlt = (2 * r) ** k - 1
     else:
@@ -50,51 +54,195 @@ def dist_mutation(r: float, eta: Union[int, float] = 20) -> float:
     return rlt
 
 
-def get_crossover_coef(eta: Union[int, float] = 20) -> float:
+def get_crossover_coef(eta: Union[int, float] = 20, size: Union[int, Tuple[int, ...], None] = None,
+                       rng: Union[RandomStream, None] = None) -> Union[float, np.ndarray]:
     """calc. cross-over coefficiency $\beta$.
 
     Args:
         eta (Union[int, float], optional): distribution index. Defaults to 20.
+        size (Union[int, Tuple[int, ...], None], optional): shape of coefficiencies drawn in one call. Defaults to None(single float).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
 
     Returns:
-        float: cross-over coefficiency.
+        Union[float, np.ndarray]: cross-over coefficiency, array of `size` values if size given.
     """
-    u = uniform_open()
+    u = get_stream(rng).uniform_open(size=size)
     return dist_crossover(u, eta)
 
 
-def get_mutation_coef(eta: Union[int, float] = 20) -> float:
+def get_mutation_coef(eta: Union[int, float] = 20, size: Union[int, Tuple[int, ...], None] = None,
+                      rng: Union[RandomStream, None] = None) -> Union[float, np.ndarray]:
     """calc. mutation coefficiency $\theta$.
 
     Args:
         eta (Union[int, float], optional): distribution index. Defaults to 20.
+        size (Union[int, Tuple[int, ...], None], optional): shape of coefficiencies drawn in one call. Defaults to None(single float).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
 
     Returns:
-        float: mutation coefficiency.
+        Union[float, np.ndarray]: mutation coefficiency, array of `size` values if size given.
     """
-    u = uniform_open()
+    u = get_stream(rng).uniform_open(size=size)
     return dist_mutation(u, eta)
 
 
+def sbx_kernel(p0_genes: np.ndarray, p1_genes: np.ndarray, eta: Union[int, float] = 20,
+               rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """simulated binary cross-over on whole gene arrays, one $\beta$ drawn per gene.
+
+    Args:
+        p0_genes (np.ndarray): gene values of parent 0. 1D for one couple, 2D(couple x gene) for many.
+        p1_genes (np.ndarray): gene values of parent 1, same shape as p0_genes.
+        eta (Union[int, float], optional): cross-over coefficiency distribution index. Defaults to 20.
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: offspring gene values limited in [GENE_MIN, GENE_MAX].
+    """
+    beta = get_crossover_coef(eta, np.shape(p0_genes), rng)
+    a = 1 - beta
+    b = 1 + beta
+    c0_genes = np.clip(0.5 * (a * p0_genes + b * p1_genes), GENE_MIN, GENE_MAX)
+    c1_genes = np.clip(0.5 * (b * p0_genes + a * p1_genes), GENE_MIN, GENE_MAX)
+    return c0_genes, c1_genes
+
+
+def pm_kernel(genes: np.ndarray, eta: Union[int, float] = 20, gene_prob: float = 1.0,
+              rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """polynomial mutation on whole gene array, each gene mutates with probability `gene_prob`.
+
+    Args:
+        genes (np.ndarray): gene values. 1D for one chromosome, 2D(chromosome x gene) for many.
+        eta (Union[int, float], optional): mutation coefficiency distribution index. Defaults to 20.
+        gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        np.ndarray: mutated gene values limited in [GENE_MIN, GENE_MAX].
+    """
+    theta = get_mutation_coef(eta, np.shape(genes), rng)
+    if gene_prob < 1:
+        theta[get_stream(rng).random(theta.shape) >= gene_prob] = 0
+    return np.clip(genes + theta, GENE_MIN, GENE_MAX)
+
+
+def crossover_kernel(p0_genes: np.ndarray, p1_genes: np.ndarray, schema: GeneSchema, eta: Union[int, float] = 20,
+                     rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """cross-over by gene type of schema, simulated binary cross-over for 'real' and 'int' genes, uniform cross-over for 'category' and 'binary' genes.
+
+    Args:
+        p0_genes (np.ndarray): gene values of parent 0. 1D for one couple, 2D(couple x gene) for many.
+        p1_genes (np.ndarray): gene values of parent 1, same shape as p0_genes.
+        schema (GeneSchema): gene schema of parents.
+        eta (Union[int, float], optional): cross-over coefficiency distribution index. Defaults to 20.
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: offspring gene values limited in [GENE_MIN, GENE_MAX], not snapped.
+    """
+    c0_genes, c1_genes = sbx_kernel(p0_genes, p1_genes, eta, rng)
+    nominal = schema._nominal
+    if nominal.any():
+        swap = get_stream(rng).random(np.shape(c0_genes)) < 0.5
+        c0_genes = np.where(nominal, np.where(swap, p1_genes, p0_genes), c0_genes)
+        c1_genes = np.where(nominal, np.where(swap, p0_genes, p1_genes), c1_genes)
+    return c0_genes, c1_genes
+
+
+def mutation_kernel(genes: np.ndarray, schema: GeneSchema, eta: Union[int, float] = 20, gene_prob: float = 1.0,
+                    rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """mutation by gene type of schema, polynomial mutation for 'real' and 'int' genes, 'category' gene resets to another label and 'binary' gene flips.
+    mutated 'int' gene moves at least one level in direction of polynomial mutation.
+
+    Args:
+        genes (np.ndarray): gene values. 1D for one chromosome, 2D(chromosome x gene) for many.
+        schema (GeneSchema): gene schema of genes.
+        eta (Union[int, float], optional): mutation coefficiency distribution index. Defaults to 20.
+        gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        np.ndarray: mutated gene values limited in [GENE_MIN, GENE_MAX], not snapped.
+    """
+    rlt = pm_kernel(genes, eta, gene_prob, rng)
+    ordinal = schema._discrete & ~schema._nominal
+    if ordinal.any():
+        steps = np.where(ordinal, schema._steps, 1)
+        delta = rlt - genes
+        stuck = ordinal & (delta != 0) & (schema.snap(rlt) == schema.snap(genes))
+        step = np.sign(delta) / steps * (GENE_MAX - GENE_MIN)
+        rlt = np.where(stuck, np.clip(schema.snap(genes) + step, GENE_MIN, GENE_MAX), rlt)
+    nominal = schema._nominal
+    if nominal.any():
+        rng = get_stream(rng)
+        steps = np.where(nominal, schema._steps, 1)
+        hit = rng.random(np.shape(rlt)) < gene_prob
+        # shift level code by 1 to steps, so mutant always differs
+        shift = 1 + np.floor(rng.random(np.shape(rlt)) * steps)
+        codes = np.round((genes - GENE_MIN) / (GENE_MAX - GENE_MIN) * steps)
+        mutant = GENE_MIN + np.mod(codes + shift, steps + 1) / steps * (GENE_MAX - GENE_MIN)
+        rlt = np.where(nominal, np.where(hit, mutant, genes), rlt)
+    return rlt
+
+
+def random_kernel(schema: GeneSchema, size: Union[int, None] = None,
+                  rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """draw random gene values by gene type of schema, discrete genes are uniform over their levels.
+
+    Args:
+        schema (GeneSchema): gene schema.
+        size (Union[int, None], optional): number of chromosomes. Defaults to None(1D values of one chromosome).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        np.ndarray: gene values in [GENE_MIN, GENE_MAX], not rounded.
+    """
+    rng = get_stream(rng)
+    shape = (len(schema),) if size is None else (size, len(schema))
+    rlt = GENE_MIN + (GENE_MAX - GENE_MIN) * rng.random(shape)
+    if schema._discrete.any():
+        steps = np.where(schema._discrete, schema._steps, 1)
+        codes = np.minimum(np.floor(rng.random(shape) * (steps + 1)), steps)
+        rlt = np.where(schema._discrete, GENE_MIN + codes / steps * (GENE_MAX - GENE_MIN), rlt)
+    return rlt
+
+
 class Chromosome(object):
     """
-    chromosome with real-number(in [0,1]) encoded genes. 
+    chromosome with real-number(in [0,1]) encoded genes, typed genes of schema are snapped onto their levels. 
+    slotted without instance dict, takes about 64 bytes plus 112 + itemsize * gene number bytes of gene array on 64-bit CPython, gene schema is shared.
     """
 
-    def __init__(self, gene_names: List[str], check: bool = True) -> Chromosome:
+    __slots__ = ('_check', '_schema', '_gene_num', '_gene_values')
+
+    def __init__(self, gene_names: Union[List[str], GeneSchema], check: bool = True,
+                 precision: Union[int, None] = GENE_PRECISION, dtype: Union[str, type, np.dtype] = np.float64,
+                 bounds: Union[Dict[str, Tuple[float, float]], None] = None,
+                 log_scale: Union[List[str], None] = None, gene_types: Union[Dict[str, str], None] = None,
+                 categories: Union[Dict[str, List[Any]], None] = None) -> Chromosome:
         """create chromosome.
 
         Args:
-            gene_names (List[str]): list of gene name.
+            gene_names (Union[List[str], GeneSchema]): list of gene name, or gene schema shared with other chromosomes.
             check (bool, optional): True, check genes couple or not in genetic operation. False, on the contrary. Defaults to True.
+            precision (Union[int, None], optional): decimals of gene values rounded on each write, ignored for gene schema. Defaults to GENE_PRECISION, None for full precision.
+            dtype (Union[str, type, np.dtype], optional): float type of gene array, ignored for gene schema. Defaults to np.float64.
+            bounds (Union[Dict[str, Tuple[float, float]], None], optional): physical (lower, upper) bounds of gene name, ignored for gene schema. Defaults to None(all genes in [GENE_MIN, GENE_MAX]).
+            log_scale (Union[List[str], None], optional): name of genes decoded in log scale, ignored for gene schema. Defaults to None(all in linear scale).
+            gene_types (Union[Dict[str, str], None], optional): type in GENE_TYPES of gene name, ignored for gene schema. Defaults to None(all 'real').
+            categories (Union[Dict[str, List[Any]], None], optional): labels of 'category' gene name, ignored for gene schema. Defaults to None(no category gene).
 
         Returns:
             Chromosome: new chromosome object.
         """
         self._check = check
-        self._gene_num = len(gene_names)
-        self._gene_names = gene_names.copy()
-        self._gene_values = np.zeros(self._gene_num)
+        if isinstance(gene_names, GeneSchema):
+            self._schema = gene_names
+        else:
+            self._schema = get_schema(
+                gene_names, precision, dtype, bounds, log_scale, gene_types, categories)
+        self._gene_num = len(self._schema)
+        self._gene_values = np.zeros(self._gene_num, dtype=self._schema.dtype)
 
     def to_dict(self) -> Dict[str, float]:
         """convert chromosome into dict with gene name as key and gene value as dict value.
@@ -102,10 +250,7 @@ class Chromosome(object):
         Returns:
             Dict[str, float]: chromosome in dict format.
         """
-        rlt = {}
-        for i in range(self._gene_num):
-            rlt[self._gene_names[i]] = self._gene_values[i]
-        return rlt
+        return dict(zip(self._schema.names, self._gene_values))
 
     def __str__(self) -> str:
         return str(self.to_dict())
@@ -118,7 +263,7 @@ class Chromosome(object):
             return False
         if self._check != o._check:
             return False
-        if self._gene_names != o._gene_names:
+        if self._schema != o._schema:
             return False
         if np.any(self._gene_values != o._gene_values):
             return False
@@ -129,6 +274,28 @@ class Chromosome(object):
         """
         return self._gene_num
 
+    @property
+    def nbytes(self) -> int:
+        """get memory footprint of `this` chromosome, shared gene schema excluded.
+
+        Returns:
+            int: bytes of chromosome object and its gene array.
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self._gene_values)
+
+    @property
+    def schema(self) -> GeneSchema:
+        """get gene schema of chromosome, shared by chromosomes with same gene names.
+
+        Returns:
+            GeneSchema: gene schema.
+        """
+        return self._schema
+
+    @property
+    def _gene_names(self) -> Tuple[str, ...]:
+        return self._schema.names
+
     @property
     def check(self) -> bool:
         """check flag of chromosome. 
@@ -144,12 +311,33 @@ class Chromosome(object):
 
     @property
     def gene_values(self) -> np.ndarray:
-        """get a deep copy of gene value in array.
+        """get a read-only view of gene value in array, copy it before modification.
+
+        Returns:
+            np.ndarray: gene value array, non-writeable.
+        """
+        view = self._gene_values.view()
+        view.flags.writeable = False
+        return view
+
+    @gene_values.setter
+    def gene_values(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        if values.shape != self._gene_values.shape:
+            raise ValueError('invalid gene values. Must in shape of %s, got %s' % (
+                self._gene_values.shape, values.shape))
+        if self._check and (np.any(values < GENE_MIN) or np.any(values > GENE_MAX)):
+            logger.warning('get out of boundary values, limit to [%6.4f, %6.4f]' % (
+                GENE_MIN, GENE_MAX))
+        self._assign(values)
+
+    def decode(self) -> np.ndarray:
+        """map gene values into physical units by bounds of gene schema.
 
         Returns:
-            np.ndarray: gene value array.
+            np.ndarray: physical values in gene order.
         """
-        return self._gene_values.copy()
+        return self._schema.decode(self._gene_values)
 
     def update(self, value: float, index: int):
         """update gene value at specific index.
@@ -164,7 +352,18 @@ class Chromosome(object):
                 'get out of boundary value [%6.4f], limit to [%6.4f]' % (value, value_set))
         else:
             value_set = value
-        self._gene_values[index] = round(value_set, GENE_PRECISION)
+        self._gene_values[index] = self._schema.round(
+            self._schema.snap(value_set, index))
+
+    def _assign(self, values: np.ndarray):
+        """update all gene values at once with whole-array limit and round.
+
+        Args:
+            values (np.ndarray): gene values in gene order.
+        """
+        if self._check:
+            values = np.clip(values, GENE_MIN, GENE_MAX)
+        self._gene_values[:] = self._schema.round(self._schema.snap(values))
 
     def is_couple(self, couple: Chromosome) -> bool:
         """check other chromosome is couple or not.
@@ -175,6 +374,8 @@ class Chromosome(object):
         Returns:
             bool: True, able to generate offspring. False, on the contrary.
         """
+        if self._schema is couple._schema:
+            return True
         if self._gene_num != couple._gene_num:
             logger.info('Not couple for unbalance gene number')
             return False
@@ -185,30 +386,31 @@ class Chromosome(object):
                 return False
         return True
 
-    def random(self, inplace=False) -> Chromosome:
+    def random(self, inplace=False, rng: Union[RandomStream, None] = None) -> Chromosome:
         """randomize gene value of chromosome.
 
         Args:
             inplace (bool, optional): True, `this` chromosome will be randomized. False, `this` one stay the same. Defaults to False.
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
 
         Returns:
             Chromosome: randomized chromosome object.
         """
         mock = self.copy()
-        for i in range(mock._gene_num):
-            val = np.random.uniform(GENE_MIN, GENE_MAX)
-            val = round(val, GENE_PRECISION)
-            mock.update(val, i)
-            if inplace:
-                self.update(val, i)
+        values = self._random_rows(None, rng)
+        mock._gene_values[:] = values
+        if inplace:
+            self._gene_values[:] = values
         return mock
 
-    def crossover(self, couple: Chromosome, eta: Union[int, float] = 20) -> Tuple[Chromosome, Chromosome]:
+    def crossover(self, couple: Chromosome, eta: Union[int, float] = 20,
+                  rng: Union[RandomStream, None] = None) -> Tuple[Chromosome, Chromosome]:
         """generate offspring with cross-over operation.
 
         Args:
             couple (Chromosome): couple chromosome.
             eta (Union[int, float], optional): cross-over coefficiency distribution index. Defaults to 20.
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
 
         Raises:
             ValueError: error message of `couple unmatch, can not crossover`, if couple check failed.
@@ -219,35 +421,34 @@ class Chromosome(object):
         if self._check:
             if not self.is_couple(couple):
                 raise ValueError('couple unmatch, can not crossover')
-        offspring_0 = Chromosome(self._gene_names, self._check)
-        offspring_1 = Chromosome(self._gene_names, self._check)
-        for i in range(self._gene_num):
-            p0_gene_val = self._gene_values[i]
-            p1_gene_val = couple.gene_values[i]
-            beta = get_crossover_coef(eta)
-            a = 1 - beta
-            b = 1 + beta
-            c0_gene_val = limit(0.5 * (a * p0_gene_val + b * p1_gene_val))
-            c1_gene_val = limit(0.5 * (b * p0_gene_val + a * p1_gene_val))
-            offspring_0.update(c0_gene_val, i)
-            offspring_1.update(c1_gene_val, i)
+        offspring_0 = self._blank()
+        offspring_1 = self._blank()
+        offspring_0._gene_values[:], offspring_1._gene_values[:] = self._cross_rows(
+            self._gene_values, couple._gene_values[:self._gene_num], eta, rng)
         return offspring_0, offspring_1
 
-    def mutate(self, eta: Union[int, float] = 20) -> Chromosome:
+    def mutate(self, eta: Union[int, float] = 20, gene_prob: float = 1.0,
+               rng: Union[RandomStream, None] = None) -> Chromosome:
         """generate offspring with mutation operation.
 
         Args:
             eta (Union[int, float], optional): mutation coefficiency distribution index. Defaults to 20.
+            gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+        Raises:
+            ValueError: error message of `invalid gene_prob.`, when gene_prob not in [0, 1].
 
         Returns:
             Chromosome: offspring chromosome.
         """
-        offspring = Chromosome(self._gene_names)
-        for i in range(self._gene_num):
-            p_gene_val = self._gene_values[i]
-            theta = get_mutation_coef(eta)
-            c_gene_val = limit(p_gene_val + theta)
-            offspring.update(c_gene_val, i)
+        if not 0 <= gene_prob <= 1:
+            raise ValueError(
+                'invalid gene_prob. Must in [0,1], got %6.4f' % gene_prob)
+        offspring = self._blank()
+        offspring._check = True
+        offspring._gene_values[:] = self._mutate_rows(
+            self._gene_values, eta, gene_prob, rng)
         return offspring
 
     def copy(self) -> Chromosome:
@@ -256,7 +457,61 @@ class Chromosome(object):
         Returns:
             Chromosome: cloned chromosome.
         """
-        twin = Chromosome(self._gene_names, self._check)
-        for i in range(self._gene_num):
-            twin.update(self._gene_values[i], i)
+        twin = self._blank()
+        # values are already limited and rounded, copy array in one step
+        twin._gene_values[:] = self._gene_values
         return twin
+
+    def _blank(self) -> Chromosome:
+        """create chromosome of same type and schema as `this` one, with zero gene values.
+
+        Returns:
+            Chromosome: new chromosome.
+        """
+        return Chromosome(self._schema, self._check)
+
+    def _random_rows(self, size: Union[int, None] = None, rng: Union[RandomStream, None] = None) -> np.ndarray:
+        """draw random gene values of chromosomes, which are limited, snapped and rounded.
+
+        Args:
+            size (Union[int, None], optional): number of chromosomes. Defaults to None(1D values of one chromosome).
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+        Returns:
+            np.ndarray: gene values.
+        """
+        return self._schema.round(self._schema.snap(random_kernel(self._schema, size, rng)))
+
+    def _cross_rows(self, p0_genes: np.ndarray, p1_genes: np.ndarray, eta: Union[int, float] = 20,
+                    rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """cross-over gene values of couples, 1D for one couple, 2D(couple x gene) for many.
+
+        Args:
+            p0_genes (np.ndarray): gene values of parent 0.
+            p1_genes (np.ndarray): gene values of parent 1, same shape as p0_genes.
+            eta (Union[int, float], optional): cross-over coefficiency distribution index. Defaults to 20.
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: gene values of offspring, which are limited, snapped and rounded.
+        """
+        c0_genes, c1_genes = crossover_kernel(
+            p0_genes, p1_genes, self._schema, eta, rng)
+        return (self._schema.round(self._schema.snap(c0_genes)),
+                self._schema.round(self._schema.snap(c1_genes)))
+
+    def _mutate_rows(self, genes: np.ndarray, eta: Union[int, float] = 20, gene_prob: float = 1.0,
+                     rng: Union[RandomStream, None] = None) -> np.ndarray:
+        """mutate gene values of chromosomes, 1D for one chromosome, 2D(chromosome x gene) for many.
+
+        Args:
+            genes (np.ndarray): gene values.
+            eta (Union[int, float], optional): mutation coefficiency distribution index. Defaults to 20.
+            gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+        Returns:
+            np.ndarray: mutated gene values, which are limited, snapped and rounded.
+        """
+        return self._schema.round(self._schema.snap(
+            mutation_kernel(genes, self._schema, eta, gene_prob, rng)))
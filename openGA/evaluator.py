@@ -0,0 +1,467 @@
+"""
+evaluator to update fitness of individuals for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import asyncio
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+from .chromosome import Chromosome
+from .individual import Individual
+from .cache import FitnessCache
+from .store import FitnessStore
+
+logger = logging.getLogger('openGA')
+
+
+class Evaluator(object):
+    """
+    base of evaluator, scores gene matrix of pending individuals in one call. Need `_score()` implemented by subclass.
+    fitness cache, then fitness store, are consulted before `_score()` when attached.
+    """
+
+    _cache = None
+    _store = None
+    _evals = 0
+
+    @property
+    def cache(self) -> Union[FitnessCache, None]:
+        """get fitness cache of `this` evaluator.
+
+        Returns:
+            Union[FitnessCache, None]: fitness cache, None for no cache.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Union[FitnessCache, None]):
+        self._cache = cache
+
+    @property
+    def store(self) -> Union[FitnessStore, None]:
+        """get persistent fitness store of `this` evaluator, second level behind cache.
+
+        Returns:
+            Union[FitnessStore, None]: fitness store, None for no store.
+        """
+        return self._store
+
+    @store.setter
+    def store(self, store: Union[FitnessStore, None]):
+        self._store = store
+
+    @property
+    def evals(self) -> int:
+        """get number of individuals scored by objective, cache and store hits are not counted.
+
+        Returns:
+            int: evaluation counter.
+        """
+        return self._evals
+
+    def shutdown(self):
+        """release resources held by `this` evaluator, nothing to release by default.
+        """
+        pass
+
+    def _lookup(self, genes: np.ndarray) -> Tuple[np.ndarray, List[bytes], List[bytes], np.ndarray]:
+        """look up fitness of gene matrix in cache then store, each genotype absent from both is scored once.
+        cache and store key rows by their own precision.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+
+        Returns:
+            Tuple[np.ndarray, List[bytes], List[bytes], np.ndarray]: fitness with NaN for miss, key of each row, store key of each row, rows need scoring.
+        """
+        fitness = np.full(genes.shape[0], np.nan)
+        if self._cache is None and self._store is None:
+            return fitness, [], [], np.arange(genes.shape[0])
+        memo = self._cache if self._cache is not None else self._store
+        keys = memo.keys(genes)
+        store_keys = []
+        if self._store is not None:
+            store_keys = keys if memo is self._store else self._store.keys(genes)
+        unseen = set()
+        rows = []
+        for i, key in enumerate(keys):
+            if key in unseen:
+                continue
+            fit = None if self._cache is None else self._cache.get(key)
+            if fit is None:
+                unseen.add(key)
+                rows.append(i)
+            else:
+                fitness[i] = fit
+        if self._store is not None and rows:
+            found = self._store.get_many([store_keys[i] for i in rows])
+            known = {}
+            for i in [i for i in rows if store_keys[i] in found]:
+                fit = found[store_keys[i]]
+                fitness[i] = fit
+                known[keys[i]] = fit
+                if self._cache is not None:
+                    self._cache.put(keys[i], fit)
+            rows = [i for i in rows if store_keys[i] not in found]
+            self._fill(fitness, keys, known)
+        return fitness, keys, store_keys, np.array(rows, dtype=int)
+
+    def _settle(self, fitness: np.ndarray, keys: List[bytes], store_keys: List[bytes], rows: np.ndarray,
+                scored: np.ndarray) -> np.ndarray:
+        """fill scored fitness into rows, save them into cache and store, and copy them to duplicated genotypes.
+
+        Args:
+            fitness (np.ndarray): fitness with NaN for miss.
+            keys (List[bytes]): key of each row.
+            store_keys (List[bytes]): store key of each row.
+            rows (np.ndarray): rows scored.
+            scored (np.ndarray): fitness of scored rows.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        fitness[rows] = scored
+        if not keys:
+            return fitness
+        fresh = {}
+        stored = {}
+        for i, fit in zip(rows, scored):
+            fresh[keys[i]] = fit
+            if self._cache is not None:
+                self._cache.put(keys[i], fit)
+            if self._store is not None:
+                stored[store_keys[i]] = fit
+        if stored:
+            self._store.put_many(stored)
+        return self._fill(fitness, keys, fresh)
+
+    @staticmethod
+    def _fill(fitness: np.ndarray, keys: List[bytes], known: Dict[bytes, float]) -> np.ndarray:
+        """copy known fitness to rows of duplicated genotypes still missing.
+
+        Args:
+            fitness (np.ndarray): fitness with NaN for miss.
+            keys (List[bytes]): key of each row.
+            known (Dict[bytes, float]): fitness of genotype keys.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        for i in np.flatnonzero(np.isnan(fitness)):
+            if keys[i] in known:
+                fitness[i] = known[keys[i]]
+        return fitness
+
+    @staticmethod
+    def _pending(group: List[Individual]) -> Tuple[List[Individual], np.ndarray]:
+        """collect individuals not grow-up and their gene matrix.
+
+        Args:
+            group (List[Individual]): individuals for evalutation.
+
+        Returns:
+            Tuple[List[Individual], np.ndarray]: pending individuals and gene matrix in shape of (individual, gene).
+        """
+        pending = [person for person in group if not person.is_growup()]
+        genes = np.array([person._plasm._gene_values for person in pending])
+        return pending, genes
+
+    @staticmethod
+    def _check(fitness: Sequence[float], n: int) -> np.ndarray:
+        """convert fitness into vector and check its length.
+
+        Args:
+            fitness (Sequence[float]): fitness scored.
+            n (int): number of individuals scored.
+
+        Raises:
+            ValueError: error message of `fitness unmatch with genes.`, if number of fitness differs from number of individuals.
+
+        Returns:
+            np.ndarray: fitness vector.
+        """
+        fitness = np.asarray(fitness, dtype=float).reshape(-1)
+        if fitness.size != n:
+            raise ValueError('fitness unmatch with genes, got %d values for %d individuals' % (
+                fitness.size, n))
+        return fitness
+
+    def evaluate(self, group: List[Individual]) -> int:
+        """evaluate individuals not grow-up in group to update fitness.
+
+        Args:
+            group (List[Individual]): individuals for evalutation.
+
+        Returns:
+            int: number of individuals evaluated.
+        """
+        pending, genes = self._pending(group)
+        if not pending:
+            return 0
+        fitness = self.evaluate_genes(genes, pending[0]._plasm)
+        for person, fit in zip(pending, fitness):
+            person._fitness = float(fit)
+        return len(pending)
+
+    async def evaluate_async(self, group: List[Individual]) -> int:
+        """Coroutine. evaluate individuals not grow-up in group to update fitness.
+
+        Args:
+            group (List[Individual]): individuals for evalutation.
+
+        Returns:
+            int: number of individuals evaluated.
+        """
+        pending, genes = self._pending(group)
+        if not pending:
+            return 0
+        fitness = await self.evaluate_genes_async(genes, pending[0]._plasm)
+        for person, fit in zip(pending, fitness):
+            person._fitness = float(fit)
+        return len(pending)
+
+    def evaluate_genes(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        """evaluate fitness of gene matrix.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+            plasm (Chromosome): chromosome describes gene columns.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        fitness, keys, store_keys, rows = self._lookup(genes)
+        if len(rows):
+            scored = self._check(self._score(genes[rows], plasm), len(rows))
+            self._evals += len(rows)
+            self._settle(fitness, keys, store_keys, rows, scored)
+        return fitness
+
+    async def evaluate_genes_async(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        """Coroutine. evaluate fitness of gene matrix.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+            plasm (Chromosome): chromosome describes gene columns.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        fitness, keys, store_keys, rows = self._lookup(genes)
+        if len(rows):
+            scored = await self._score_async(genes[rows], plasm)
+            self._evals += len(rows)
+            self._settle(fitness, keys, store_keys, rows,
+                         self._check(scored, len(rows)))
+        return fitness
+
+    async def _score_async(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        """Coroutine. score fitness of gene matrix, blocks on `_score()` unless overridden by subclass.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+            plasm (Chromosome): chromosome describes gene columns.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        return self._score(genes, plasm)
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        """score fitness of gene matrix. Need implemented by subclass.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+            plasm (Chromosome): chromosome describes gene columns.
+
+        Returns:
+            np.ndarray: fitness of each row.
+        """
+        raise NotImplementedError(
+            '_score() of Evaluator need to implement by subclass')
+
+
+class BatchEvaluator(Evaluator):
+    """
+    evaluator calls vectorized fitness function once with gene matrix of all pending individuals.
+    """
+
+    def __init__(self, batch_funct: Callable[[np.ndarray, List[str]], np.ndarray], decode: bool = False) -> BatchEvaluator:
+        """create batch evaluator.
+
+        Args:
+            batch_funct (Callable[[np.ndarray, List[str]], np.ndarray]): callback takes gene matrix(individual x gene) and gene names, returns fitness vector.
+            decode (bool, optional): True, gene matrix is decoded into physical units by gene schema before callback. Defaults to False.
+
+        Returns:
+            BatchEvaluator: new evaluator object.
+        """
+        self._batch_funct = batch_funct
+        self._decode = decode
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        if self._decode:
+            genes = plasm.schema.decode(genes)
+        return self._batch_funct(genes, list(plasm._gene_names))
+
+
+class PatchEvaluator(Evaluator):
+    """
+    evaluator binds express() and evaluate() of individual to `this` instance, instead of monkey patch on Individual class.
+    """
+
+    def __init__(self, evaluate_funct: Callable[[Individual], None],
+                 express_funct: Union[Callable[[Individual], None], None] = None) -> PatchEvaluator:
+        """create patch evaluator.
+
+        Args:
+            evaluate_funct (Callable[[Individual], None]): callback takes individual and updates its `_fitness`, same as monkey patch of Individual.evaluate.
+            express_funct (Union[Callable[[Individual], None], None], optional): callback takes individual before evaluate_funct, same as monkey patch of Individual.express. Defaults to None(no expression).
+
+        Returns:
+            PatchEvaluator: new evaluator object.
+        """
+        self._evaluate_funct = evaluate_funct
+        self._express_funct = express_funct
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        rlt = []
+        for row in genes:
+            person = Individual(plasm)
+            person._plasm._gene_values[:] = row
+            if self._express_funct is not None:
+                self._express_funct(person)
+            self._evaluate_funct(person)
+            rlt.append(person.fitness)
+        return rlt
+
+
+class FunctionEvaluator(Evaluator):
+    """
+    evaluator calls fitness function once per pending individual with its chromosome.
+    """
+
+    def __init__(self, fit_funct: Callable[[Chromosome], float]) -> FunctionEvaluator:
+        """create function evaluator.
+
+        Args:
+            fit_funct (Callable[[Chromosome], float]): callback takes chromosome of individual, returns fitness.
+
+        Returns:
+            FunctionEvaluator: new evaluator object.
+        """
+        self._fit_funct = fit_funct
+
+    @staticmethod
+    def _plasms(genes: np.ndarray, plasm: Chromosome) -> Iterator[Chromosome]:
+        """create chromosome of each row in gene matrix.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+            plasm (Chromosome): chromosome describes gene columns.
+
+        Yields:
+            Iterator[Chromosome]: chromosome carries gene values of the row.
+        """
+        for row in genes:
+            twin = plasm.copy()
+            twin._gene_values[:] = row
+            yield twin
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        return [self._fit_funct(twin) for twin in self._plasms(genes, plasm)]
+
+
+class PoolEvaluator(FunctionEvaluator):
+    """
+    evaluator spreads fitness function calls of pending individuals across worker processes.
+    fitness function must be picklable, e.g. defined at module level. results keep order of individuals.
+    """
+
+    def __init__(self, fit_funct: Callable[[Chromosome], float], max_workers: Union[int, None] = None,
+                 chunksize: int = 1) -> PoolEvaluator:
+        """create process pool evaluator. pool starts at first evaluation and is reused until shutdown().
+
+        Args:
+            fit_funct (Callable[[Chromosome], float]): picklable callback takes chromosome of individual, returns fitness.
+            max_workers (Union[int, None], optional): number of worker processes. Defaults to None(number of processors).
+            chunksize (int, optional): number of individuals sent to a worker at once. Defaults to 1.
+
+        Raises:
+            ValueError: error message of `invalid chunksize.`, when chunksize less than 1.
+
+        Returns:
+            PoolEvaluator: new evaluator object.
+        """
+        if chunksize < 1:
+            raise ValueError('invalid chunksize. Must >= 1, got %d' % chunksize)
+        super().__init__(fit_funct)
+        self._max_workers = max_workers
+        self._chunksize = chunksize
+        self._executor = None
+
+    def __enter__(self) -> PoolEvaluator:
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+
+    def shutdown(self):
+        """stop worker processes, pool will restart at next evaluation.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._max_workers)
+        rlt = self._executor.map(self._fit_funct, self._plasms(genes, plasm),
+                                 chunksize=self._chunksize)
+        return list(rlt)
+
+
+class AsyncEvaluator(FunctionEvaluator):
+    """
+    evaluator awaits coroutine fitness function of pending individuals concurrently, under a concurrency limit.
+    """
+
+    def __init__(self, fit_funct: Callable[[Chromosome], Awaitable[float]], concurrency: int = 8) -> AsyncEvaluator:
+        """create asyncio evaluator.
+
+        Args:
+            fit_funct (Callable[[Chromosome], Awaitable[float]]): coroutine function takes chromosome of individual, returns fitness.
+            concurrency (int, optional): max number of fitness calls awaited at the same time. Defaults to 8.
+
+        Raises:
+            ValueError: error message of `invalid concurrency.`, when concurrency less than 1.
+
+        Returns:
+            AsyncEvaluator: new evaluator object.
+        """
+        if concurrency < 1:
+            raise ValueError(
+                'invalid concurrency. Must >= 1, got %d' % concurrency)
+        super().__init__(fit_funct)
+        self._concurrency = concurrency
+
+    async def _score_async(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def limited(twin: Chromosome) -> float:
+            async with semaphore:
+                return await self._fit_funct(twin)
+
+        tasks = [limited(twin) for twin in self._plasms(genes, plasm)]
+        return await asyncio.gather(*tasks)
+
+    def _score(self, genes: np.ndarray, plasm: Chromosome) -> np.ndarray:
+        return asyncio.run(self._score_async(genes, plasm))
@@ -3,45 +3,300 @@ genetic algorithm entry
 """
 # Copyright (c) 2015-2021 Neal Nie. All rights reserved.
 
+from __future__ import annotations
 import logging
+import time
+import numpy as np
 import pandas as pd
-from typing import Dict, Union, Callable
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Tuple, Union, Callable
 from .population import Population
+from .array_population import ArrayPopulation
 from .individual import Individual
-from .chromosome import Chromosome
+from .schema import get_schema
+from .chromosome import Chromosome, GENE_PRECISION
+from .permutation import PermutationChromosome
+from .utils import RandomStream
+from .cache import FitnessCache
+from .store import FitnessStore
+from .recorder import Recorder
+from .stats import GenerationStats
+from .checkpoint import save_checkpoint, load_checkpoint, split_arrays
+from .evaluator import Evaluator, BatchEvaluator, PatchEvaluator, PoolEvaluator, AsyncEvaluator
 
 logger = logging.getLogger('openGA')
 
+STOP_REASONS = ('gen_max', 'stall', 'target', 'max_evals', 'timeout')
+
+
+class _StopRule(object):
+    """
+    stopping criteria of one run, checked between generations on generation counter, best fitness, evaluation counter and clock.
+    """
+
+    def __init__(self, gen_max: int = 40, stall_gen: Union[int, None] = None, tol: float = 0.0,
+                 target: Union[float, None] = None, max_evals: Union[int, None] = None,
+                 timeout: Union[float, None] = None, evals: int = 0):
+        if stall_gen is not None and stall_gen < 1:
+            raise ValueError('invalid stall_gen. Must >= 1, got %d' % stall_gen)
+        self._gen_max = gen_max
+        self._stall_gen = stall_gen
+        self._tol = tol
+        self._target = target
+        self._max_evals = max_evals
+        self._timeout = timeout
+        self._start = time.monotonic()
+        self._evals = evals
+        self._gens = 0
+        self._best = -np.inf
+        self._stall = 0
+
+    @property
+    def remaining(self) -> int:
+        """get number of generations left before gen_max.
+
+        Returns:
+            int: generations left.
+        """
+        return max(self._gen_max - self._gens, 0)
+
+    def check(self, best: float, evals: int) -> Union[str, None]:
+        """count a generation and check criteria after it, gen_max is left to caller.
+
+        Args:
+            best (float): best fitness of generation.
+            evals (int): evaluation counter of evaluator.
+
+        Returns:
+            Union[str, None]: reason in STOP_REASONS, None to continue.
+        """
+        self._gens += 1
+        if best > self._best + self._tol:
+            self._best = best
+            self._stall = 0
+        else:
+            self._stall += 1
+        if self._target is not None and best >= self._target:
+            return 'target'
+        if self._stall_gen is not None and self._stall >= self._stall_gen:
+            return 'stall'
+        if self._max_evals is not None and evals - self._evals >= self._max_evals:
+            return 'max_evals'
+        if self._timeout is not None and time.monotonic() - self._start >= self._timeout:
+            return 'timeout'
+        return None
+
+    def get_state(self, evals: int) -> Dict[str, Any]:
+        """get progress of run against criteria.
+
+        Args:
+            evals (int): evaluation counter of evaluator.
+
+        Returns:
+            Dict[str, Any]: generations, best fitness, stall counter, evaluations and seconds used by run.
+        """
+        return {'gens': self._gens, 'best': None if np.isinf(self._best) else float(self._best),
+                'stall': self._stall, 'evals': evals - self._evals, 'elapsed': time.monotonic() - self._start}
+
+    def set_state(self, state: Dict[str, Any], evals: int):
+        """restore progress of get_state(), evaluations and seconds used count against budget of run.
+
+        Args:
+            state (Dict[str, Any]): progress of run.
+            evals (int): evaluation counter of evaluator.
+        """
+        self._gens = state['gens']
+        self._best = -np.inf if state['best'] is None else state['best']
+        self._stall = state['stall']
+        self._evals = evals - state['evals']
+        self._start = time.monotonic() - state['elapsed']
+
+
+class _SaveRule(object):
+    """
+    checkpoint schedule of one run, due every `every` generations or `interval` seconds.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, every: Union[int, None] = None,
+                 interval: Union[float, None] = None):
+        if every is not None and every < 1:
+            raise ValueError('invalid checkpoint_every. Must >= 1, got %d' % every)
+        if path is not None and every is None and interval is None:
+            every = 1
+        self._path = path
+        self._every = every
+        self._interval = interval
+        self._gens = 0
+        self._last = time.monotonic()
+
+    @property
+    def path(self) -> Union[str, Path, None]:
+        """get path of checkpoint file.
+
+        Returns:
+            Union[str, Path, None]: checkpoint path, None without checkpoint.
+        """
+        return self._path
+
+    def due(self) -> bool:
+        """count a generation and check schedule, schedule restarts when due.
+
+        Returns:
+            bool: True, checkpoint should be written now.
+        """
+        if self._path is None:
+            return False
+        self._gens += 1
+        now = time.monotonic()
+        if ((self._every is not None and self._gens >= self._every) or
+                (self._interval is not None and now - self._last >= self._interval)):
+            self._gens = 0
+            self._last = now
+            return True
+        return False
+
+
+class _Run(object):
+    """
+    arguments and progress of one run, kept in checkpoint to continue the run after resume.
+    """
+
+    def __init__(self, args: Dict[str, Any], evals: int, state: Union[Dict[str, Any], None] = None):
+        self._args = args
+        self.rule = _StopRule(args['gen_max'], args['stall_gen'], args['tol'], args['target'],
+                              args['max_evals'], args['timeout'], evals)
+        self.saver = _SaveRule(args['checkpoint'], args['checkpoint_every'], args['checkpoint_interval'])
+        self.finished = False
+        if state is not None:
+            self.rule.set_state(state['rule'], evals)
+            self.finished = state['finished']
+
+    @property
+    def evolve_args(self) -> Dict[str, Any]:
+        """get keyword arguments of evolve() of population.
+
+        Returns:
+            Dict[str, Any]: arguments by name.
+        """
+        return {'pool_size': self._args['pool_size'], 'tour_size': self._args['tour_size'],
+                'cross_prob': self._args['p_crossover'], 'gene_prob': self._args['gene_prob'],
+                'replace': self._args['replace'], 'survival': self._args['survival']}
+
+    def get_state(self, evals: int) -> Dict[str, Any]:
+        """get arguments and progress of run.
+
+        Args:
+            evals (int): evaluation counter of evaluator.
+
+        Returns:
+            Dict[str, Any]: json serializable arguments, progress of stopping criteria and finished flag.
+        """
+        return {'args': self._args, 'rule': self.rule.get_state(evals), 'finished': self.finished}
+
+
+def _assign_solution(plasm: Chromosome, solution: Dict[str, float]):
+    """assign solution into chromosome, value is encoded by gene schema, or taken as initial position for permutation.
+    """
+    if isinstance(plasm, PermutationChromosome):
+        plasm.order = np.argsort(list(solution.values()), kind='stable')
+    else:
+        genes = plasm.schema.encode(list(solution.values()))
+        for i, gene in enumerate(genes):
+            plasm.update(float(gene), i)
+
 
 class GeneticAlgorithm(object):
     """
     genetic algortihm framework to seach optimal control variables combination to get max fitness.
     """
 
-    def __init__(self, solution: Dict[str, float], capacity: int = 20):
+    def __init__(self, solution: Dict[str, float], capacity: int = 20, vectorize: bool = False,
+                 seed: Union[int, None] = None, cache_size: Union[int, None] = None,
+                 store: Union[FitnessStore, None] = None, precision: Union[int, None] = GENE_PRECISION,
+                 dtype: Union[str, type, np.dtype] = np.float64,
+                 bounds: Union[Dict[str, Tuple[float, float]], None] = None,
+                 log_scale: Union[List[str], None] = None, gene_types: Union[Dict[str, str], None] = None,
+                 categories: Union[Dict[str, List[Any]], None] = None, permutation: Union[bool, str] = False,
+                 recorder: Union[Recorder, bool, None] = None, stats_size: Union[int, None] = None,
+                 sample_size: int = 0):
         """create genetic algorithm instance.
 
         Args:
-            solution (Dict[str, float]): initial combination of control variable name and its value in [0, 1].
+            solution (Dict[str, float]): initial combination of control variable name and its value in [0, 1], or in physical units for gene with bounds.
             capacity (int, optional): max number of solution in each iteration. Defaults to 20.
+            vectorize (bool, optional): True, keep population in gene array(ArrayPopulation) for large capacity. False, keep list of individuals(Population). Defaults to False.
+            seed (Union[int, None], optional): seed of random stream of `this` ga, same seed replays same run. Defaults to None(fresh entropy).
+            cache_size (Union[int, None], optional): max number of genotype in fitness cache, evaluated genotype is not evaluated again while cached. Defaults to None(no cache).
+            store (Union[FitnessStore, None], optional): persistent fitness store shared across runs, consulted behind cache. Defaults to None(no store).
+            precision (Union[int, None], optional): decimals of gene values rounded in genetic operation. Defaults to GENE_PRECISION, None for full precision without rounding.
+            dtype (Union[str, type, np.dtype], optional): float type to keep gene values, np.float32 halves memory of genes. Defaults to np.float64.
+            bounds (Union[Dict[str, Tuple[float, float]], None], optional): physical (lower, upper) bounds of control variable name. Defaults to None(all in [0, 1]).
+            log_scale (Union[List[str], None], optional): name of control variables searched in log scale. Defaults to None(all in linear scale).
+            gene_types (Union[Dict[str, str], None], optional): type of control variable name in 'real', 'int', 'category' and 'binary'. Defaults to None(all 'real').
+            categories (Union[Dict[str, List[Any]], None], optional): labels of 'category' control variable, its value in solution is label index. Defaults to None(no category).
+            permutation (Union[bool, str], optional): True or cross-over operator('ox', 'pmx'), search visiting order of items in solution, value of item in solution is its initial position. Defaults to False.
+            recorder (Union[Recorder, bool, None], optional): recorder to keep every generation of run, in memory and/or sink file, False for no record. Defaults to None(in-memory recorder).
+            stats_size (Union[int, None], optional): number of latest generations kept in generation statistics. Defaults to None(no statistics).
+            sample_size (int, optional): number of individuals of all generations kept in statistics by reservoir sampling. Defaults to 0(no sample).
+
+        Raises:
+            ValueError: error message of `invalid permutation.`, when permutation combined with bounds, log_scale, gene_types or categories.
         """
+        self._rng = RandomStream(seed)
+        self._store = store
         # create chromosome of ancient
-        ancient_plasm = Chromosome(list(solution.keys()))
-        for i, gene_name in enumerate(solution):
-            ancient_plasm.update(solution[gene_name], i)
-        ancestors = [Individual(ancient_plasm)]
-        for i in range(1, capacity):
-            ancestors.append(Individual(ancient_plasm.random()))
-        self._people = Population(0, ancestors, capacity)
+        if permutation:
+            if bounds or log_scale or gene_types or categories:
+                raise ValueError(
+                    'invalid permutation. Must not combine with bounds, log_scale, gene_types or categories')
+            crossover = permutation if isinstance(permutation, str) else 'ox'
+            ancient_plasm = PermutationChromosome(
+                list(solution.keys()), crossover=crossover, dtype=dtype)
+        else:
+            ancient_plasm = Chromosome(list(solution.keys()), precision=precision, dtype=dtype,
+                                       bounds=bounds, log_scale=log_scale, gene_types=gene_types,
+                                       categories=categories)
+        _assign_solution(ancient_plasm, solution)
+        self._cache = None if cache_size is None else FitnessCache(
+            cache_size, ancient_plasm.schema.precision)
+        if vectorize:
+            genes = np.empty((capacity, ancient_plasm.size()),
+                             dtype=ancient_plasm.schema.dtype)
+            genes[0] = ancient_plasm.gene_values
+            genes[1:] = ancient_plasm._random_rows(capacity - 1, self._rng)
+            self._people = ArrayPopulation(
+                0, genes, ancient_plasm, capacity, rng=self._rng, copy=False)
+        else:
+            ancestors = [Individual(ancient_plasm)]
+            for i in range(1, capacity):
+                ancestors.append(Individual(
+                    ancient_plasm.random(rng=self._rng)))
+            self._people = Population(0, ancestors, capacity, self._rng)
         self._patched = False
-        self._record = pd.DataFrame()
+        self._stop_reason = None
+        self._evals_base = 0
+        self._run = None
+        self._recorded = None
+        if recorder is None or recorder is True:
+            recorder = Recorder()
+        self._recorder = None if recorder is False else recorder
+        # reservoir sampling draws from its own stream, independent of evolution
+        self._stats = None if stats_size is None else GenerationStats(
+            list(solution.keys()), stats_size, sample_size,
+            None if seed is None else np.random.SeedSequence(seed).spawn(1)[0])
+
+    def __enter__(self) -> GeneticAlgorithm:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     @property
-    def people(self) -> Population:
+    def people(self) -> Union[Population, ArrayPopulation]:
         """get current evolution status of ga.
 
         Returns:
-            Population: people of genetic algorithm.
+            Union[Population, ArrayPopulation]: people of genetic algorithm.
         """
         return self._people
 
@@ -58,44 +313,163 @@ class GeneticAlgorithm(object):
     def patched(self, flag: bool):
         self._patched = flag
 
+    @property
+    def evals(self) -> int:
+        """get number of objective evaluations of ga, cache and store hits are not counted.
+
+        Returns:
+            int: evaluation counter, 0 if fitness is not updated by evaluator.
+        """
+        evaluator = self._people.evaluator
+        return self._evals_base + (0 if evaluator is None else evaluator.evals)
+
+    @property
+    def stop_reason(self) -> Union[str, None]:
+        """get why last run stopped.
+
+        Returns:
+            Union[str, None]: reason in STOP_REASONS, None before run.
+        """
+        return self._stop_reason
+
+    @property
+    def cache(self) -> Union[FitnessCache, None]:
+        """get fitness cache of ga, with hit/miss counters.
+
+        Returns:
+            Union[FitnessCache, None]: fitness cache, None if cache_size not given.
+        """
+        return self._cache
+
+    @property
+    def store(self) -> Union[FitnessStore, None]:
+        """get persistent fitness store of ga.
+
+        Returns:
+            Union[FitnessStore, None]: fitness store, None if not given.
+        """
+        return self._store
+
+    @property
+    def recorder(self) -> Union[Recorder, None]:
+        """get recorder of ga evolution process.
+
+        Returns:
+            Union[Recorder, None]: evolution recorder, None if recorder is False.
+        """
+        return self._recorder
+
     @property
     def record(self) -> pd.DataFrame:
-        """get ga evolution process record in data frame.
+        """get ga evolution process record in data frame, concatenated from recorder on demand.
+        """
+        if self._recorder is None:
+            return pd.DataFrame()
+        return self._recorder.to_df()
+
+    @property
+    def stats(self) -> Union[GenerationStats, None]:
+        """get statistics of generations after elimination.
+
+        Returns:
+            Union[GenerationStats, None]: generation statistics, None if stats_size not given.
         """
-        return self._record
+        return self._stats
 
     def add_patch(self, fit_funct: Callable[[], float]):
-        """add callback function as monkey patch of ga.
+        """add callback function as patch of ga. patch is bound to `this` ga only, Individual class is left untouched.
 
         Args:
             fit_funct (Callable[[], float]): callback to get fitness with no input args.
         """
 
-        # add monkey patch
-        def express(self):
-            pass
+        def evaluate(person: Individual):
+            person._fitness = fit_funct()
+
+        self._set_evaluator(PatchEvaluator(evaluate))
+
+    def add_individual_patch(self, evaluate_funct: Callable[[Individual], None],
+                             express_funct: Union[Callable[[Individual], None], None] = None):
+        """add express and evaluate callbacks of individual as patch of ga, in place of monkey patch on Individual class.
+
+        Args:
+            evaluate_funct (Callable[[Individual], None]): callback takes individual and updates its `_fitness`.
+            express_funct (Union[Callable[[Individual], None], None], optional): callback takes individual before evaluate_funct. Defaults to None(no expression).
+        """
+        self._set_evaluator(PatchEvaluator(evaluate_funct, express_funct))
+
+    def add_batch_patch(self, batch_funct: Callable[[np.ndarray, List[str]], np.ndarray], decode: bool = False):
+        """add vectorized fitness function of ga, called once with genes of all pending individuals.
+
+        Args:
+            batch_funct (Callable[[np.ndarray, List[str]], np.ndarray]): callback takes gene matrix(individual x gene) and gene names, returns fitness vector.
+            decode (bool, optional): True, callback takes gene matrix in physical units by bounds of ga. Defaults to False.
+        """
+        self._set_evaluator(BatchEvaluator(batch_funct, decode))
 
-        def evaluate(self):
-            self._fitness = fit_funct()
+    def add_pool_patch(self, fit_funct: Callable[[Chromosome], float], max_workers: Union[int, None] = None,
+                       chunksize: int = 1):
+        """add fitness function of ga, evaluated on pool of worker processes.
+
+        Args:
+            fit_funct (Callable[[Chromosome], float]): picklable callback takes chromosome of individual, returns fitness.
+            max_workers (Union[int, None], optional): number of worker processes. Defaults to None(number of processors).
+            chunksize (int, optional): number of individuals sent to a worker at once. Defaults to 1.
+        """
+        self._set_evaluator(PoolEvaluator(fit_funct, max_workers, chunksize))
 
-        Individual.express = express
-        Individual.evaluate = evaluate
+    def add_async_patch(self, fit_funct: Callable[[Chromosome], Awaitable[float]], concurrency: int = 8):
+        """add coroutine fitness function of ga, pending individuals are awaited concurrently.
+
+        Args:
+            fit_funct (Callable[[Chromosome], Awaitable[float]]): coroutine function takes chromosome of individual, returns fitness.
+            concurrency (int, optional): max number of fitness calls awaited at the same time. Defaults to 8.
+        """
+        self._set_evaluator(AsyncEvaluator(fit_funct, concurrency))
+
+    def _set_evaluator(self, evaluator: Evaluator):
+        """bind evaluator to population of `this` ga, with fitness cache and store of ga attached. previous evaluator is shut down.
+
+        Args:
+            evaluator (Evaluator): evaluator to update fitness.
+        """
+        previous = self._people.evaluator
+        if previous is not None and previous is not evaluator:
+            previous.shutdown()
+        evaluator.cache = self._cache
+        evaluator.store = self._store
+        self._people.evaluator = evaluator
         self._patched = True
 
     def append(self, solution: Dict[str, float]):
-        """append solution choice into ga.
+        """append solution choice into ga, encoded by chromosome settings of ga as initial solution.
 
         Args:
-            solution (Dict[str, float]): combination of control variable name and its value in [0, 1].
+            solution (Dict[str, float]): combination of control variable name and its value, in same form as initial solution.
         """
-        ancient_plasm = Chromosome(list(solution.keys()))
-        for i, gene_name in enumerate(solution):
-            ancient_plasm.update(solution[gene_name], i)
+        ancient_plasm = self._template()._blank()
+        _assign_solution(ancient_plasm, solution)
         ancestor = Individual(ancient_plasm)
         self._people.append_newcomer(ancestor)
+        # generation with newcomer is recorded again
+        self._recorded = None
+
+    def _template(self) -> Chromosome:
+        """get chromosome of current generation, which carries schema and settings of all individuals.
+
+        Returns:
+            Chromosome: chromosome of an individual, not to be modified.
+        """
+        if isinstance(self._people, ArrayPopulation):
+            return self._people._plasm
+        return self._people._curr_gen[0]._plasm
 
     def run(self, gen_max: int = 40, p_crossover: float = 0.9,
-            pool_size: Union[int, None] = None, tour_size: int = 2):
+            pool_size: Union[int, None] = None, tour_size: int = 2, gene_prob: float = 1.0,
+            replace: bool = False, survival: str = 'plus', stall_gen: Union[int, None] = None,
+            tol: float = 0.0, target: Union[float, None] = None, max_evals: Union[int, None] = None,
+            timeout: Union[float, None] = None, checkpoint: Union[str, Path, None] = None,
+            checkpoint_every: Union[int, None] = None, checkpoint_interval: Union[float, None] = None) -> str:
         """run ga. to seach optimal solution.
 
         Args:
@@ -103,20 +477,324 @@ class GeneticAlgorithm(object):
             p_crossover (float, optional): cross-over probability. Defaults to 0.9.
             pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
             tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+            replace (bool, optional): True, an individual could be selected as parent more than once in a generation. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
+            stall_gen (Union[int, None], optional): stop after best fitness not improved more than tol for stall_gen generations. Defaults to None(no stall check).
+            tol (float, optional): min improvement of best fitness to reset stall counter. Defaults to 0.0.
+            target (Union[float, None], optional): stop once best fitness reaches target. Defaults to None(no target).
+            max_evals (Union[int, None], optional): stop once objective evaluations of `this` run reach max_evals, checked between generations. Defaults to None(no budget).
+            timeout (Union[float, None], optional): stop once run lasts timeout seconds, checked between generations. Defaults to None(no deadline).
+            checkpoint (Union[str, Path, None], optional): path of checkpoint file written by checkpoint() during run and at its end. Defaults to None(no checkpoint).
+            checkpoint_every (Union[int, None], optional): write checkpoint every checkpoint_every generations. Defaults to None(every generation if checkpoint_interval not given).
+            checkpoint_interval (Union[float, None], optional): write checkpoint once checkpoint_interval seconds passed since last one. Defaults to None(no interval).
+
+        Raises:
+            MemoryError: error message of `fitness function not loaded.`, if ga not patched.
+            ValueError: error message of `invalid stall_gen.`, when stall_gen less than 1.
+            ValueError: error message of `invalid checkpoint_every.`, when checkpoint_every less than 1.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped.
+        """
+        if not self._patched:
+            raise MemoryError('fitness function not loaded.')
+        run = _Run({'gen_max': gen_max, 'p_crossover': p_crossover, 'pool_size': pool_size, 'tour_size': tour_size,
+                    'gene_prob': gene_prob, 'replace': replace, 'survival': survival, 'stall_gen': stall_gen,
+                    'tol': tol, 'target': target, 'max_evals': max_evals, 'timeout': timeout,
+                    'checkpoint': None if checkpoint is None else str(checkpoint),
+                    'checkpoint_every': checkpoint_every, 'checkpoint_interval': checkpoint_interval}, self.evals)
+        return self._execute(run)
+
+    async def run_async(self, gen_max: int = 40, p_crossover: float = 0.9,
+                        pool_size: Union[int, None] = None, tour_size: int = 2, gene_prob: float = 1.0,
+                        replace: bool = False, survival: str = 'plus', stall_gen: Union[int, None] = None,
+                        tol: float = 0.0, target: Union[float, None] = None, max_evals: Union[int, None] = None,
+                        timeout: Union[float, None] = None, checkpoint: Union[str, Path, None] = None,
+                        checkpoint_every: Union[int, None] = None, checkpoint_interval: Union[float, None] = None) -> str:
+        """Coroutine. run ga. to seach optimal solution as run(), individuals of each generation are evaluated concurrently.
+
+        Args:
+            gen_max (int, optional): max number of iteration. Defaults to 40.
+            p_crossover (float, optional): cross-over probability. Defaults to 0.9.
+            pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
+            tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            gene_prob (float, optional): mutation probability of each gene. Defaults to 1.0(all genes mutate).
+            replace (bool, optional): True, an individual could be selected as parent more than once in a generation. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
+            stall_gen (Union[int, None], optional): stop after best fitness not improved more than tol for stall_gen generations. Defaults to None(no stall check).
+            tol (float, optional): min improvement of best fitness to reset stall counter. Defaults to 0.0.
+            target (Union[float, None], optional): stop once best fitness reaches target. Defaults to None(no target).
+            max_evals (Union[int, None], optional): stop once objective evaluations of `this` run reach max_evals, checked between generations. Defaults to None(no budget).
+            timeout (Union[float, None], optional): stop once run lasts timeout seconds, checked between generations. Defaults to None(no deadline).
+            checkpoint (Union[str, Path, None], optional): path of checkpoint file written by checkpoint() during run and at its end. Defaults to None(no checkpoint).
+            checkpoint_every (Union[int, None], optional): write checkpoint every checkpoint_every generations. Defaults to None(every generation if checkpoint_interval not given).
+            checkpoint_interval (Union[float, None], optional): write checkpoint once checkpoint_interval seconds passed since last one. Defaults to None(no interval).
 
         Raises:
             MemoryError: error message of `fitness function not loaded.`, if ga not patched.
+            ValueError: error message of `invalid stall_gen.`, when stall_gen less than 1.
+            ValueError: error message of `invalid checkpoint_every.`, when checkpoint_every less than 1.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped.
         """
         if not self._patched:
             raise MemoryError('fitness function not loaded.')
+        run = _Run({'gen_max': gen_max, 'p_crossover': p_crossover, 'pool_size': pool_size, 'tour_size': tour_size,
+                    'gene_prob': gene_prob, 'replace': replace, 'survival': survival, 'stall_gen': stall_gen,
+                    'tol': tol, 'target': target, 'max_evals': max_evals, 'timeout': timeout,
+                    'checkpoint': None if checkpoint is None else str(checkpoint),
+                    'checkpoint_every': checkpoint_every, 'checkpoint_interval': checkpoint_interval}, self.evals)
+        return await self._execute_async(run)
+
+    def continue_run(self) -> str:
+        """continue run of ga resumed from checkpoint, with arguments and progress of run kept in checkpoint. budget of generations, evaluations and time is shared with part of run before checkpoint.
+
+        Raises:
+            MemoryError: error message of `fitness function not loaded.`, if ga not patched.
+            ValueError: error message of `invalid run.`, when ga has no run to continue.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped, run finished before checkpoint is not continued.
+        """
+        if not self._patched:
+            raise MemoryError('fitness function not loaded.')
+        if self._run is None:
+            raise ValueError('invalid run. Must resume from checkpoint written by run()')
+        if self._run.finished:
+            return self._stop_reason
+        return self._execute(self._run)
+
+    async def continue_run_async(self) -> str:
+        """Coroutine. continue run of ga resumed from checkpoint as continue_run(), individuals of each generation are evaluated concurrently.
+
+        Raises:
+            MemoryError: error message of `fitness function not loaded.`, if ga not patched.
+            ValueError: error message of `invalid run.`, when ga has no run to continue.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped, run finished before checkpoint is not continued.
+        """
+        if not self._patched:
+            raise MemoryError('fitness function not loaded.')
+        if self._run is None:
+            raise ValueError('invalid run. Must resume from checkpoint written by run()')
+        if self._run.finished:
+            return self._stop_reason
+        return await self._execute_async(self._run)
+
+    def _execute(self, run: _Run) -> str:
+        """evolve population for generations left of run.
+
+        Args:
+            run (_Run): arguments and progress of run.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped.
+        """
+        self._run = run
+        self._stop_reason = 'gen_max'
         # population evolution
-        for _ in range(gen_max):
-            new_people = self._people.evolve(pool_size, tour_size, p_crossover)
-            self._record = self._record.append(
-                self._people.to_df(), ignore_index=True)
+        for _ in range(run.rule.remaining):
+            new_people = self._people.evolve(**run.evolve_args)
+            self._append_record()
             self._people = new_people
-        self._record = self._record.append(
-            self._people.to_df(), ignore_index=True)
+            self._update_stats()
+            if self._end_generation(run):
+                break
+        return self._finish(run)
+
+    async def _execute_async(self, run: _Run) -> str:
+        """Coroutine. evolve population for generations left of run as _execute(), individuals are evaluated concurrently.
+
+        Args:
+            run (_Run): arguments and progress of run.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped.
+        """
+        self._run = run
+        self._stop_reason = 'gen_max'
+        # population evolution
+        for _ in range(run.rule.remaining):
+            new_people = await self._people.evolve_async(**run.evolve_args)
+            self._append_record()
+            self._people = new_people
+            self._update_stats()
+            if self._end_generation(run):
+                break
+        return self._finish(run)
+
+    def _finish(self, run: _Run) -> str:
+        """record last generation, write final checkpoint of run and shut down evaluator.
+
+        Args:
+            run (_Run): arguments and progress of run.
+
+        Returns:
+            str: reason in STOP_REASONS why run stopped.
+        """
+        self._append_record()
+        if self._recorder is not None:
+            self._recorder.flush()
+        run.finished = True
+        if run.saver.path is not None:
+            self.checkpoint(run.saver.path)
+        self._shutdown_evaluator()
+        logger.info('ga stopped by %s at generation %d' % (self._stop_reason, self._people.gen_id))
+        return self._stop_reason
+
+    def _shutdown_evaluator(self):
+        """shut down evaluator of `this` ga, worker pool restarts at next evaluation.
+        """
+        if self._people.evaluator is not None:
+            self._people.evaluator.shutdown()
+
+    def close(self):
+        """release resources of ga, e.g. worker processes of pool evaluator.
+        """
+        self._shutdown_evaluator()
+
+    def _end_generation(self, run: _Run) -> bool:
+        """check stopping criteria and checkpoint schedule after a generation.
+
+        Args:
+            run (_Run): arguments and progress of run.
+
+        Returns:
+            bool: True, run should stop.
+        """
+        reason = run.rule.check(np.nanmax(self._people.fitness), self.evals)
+        if reason is not None:
+            self._stop_reason = reason
+            return True
+        if run.saver.due():
+            self.checkpoint(run.saver.path)
+        return False
+
+    def _append_record(self):
+        """append current generation into evolution record, generation recorded already is skipped.
+        """
+        if self._recorder is not None and self._recorded != self._people.gen_id:
+            self._recorder.append(self._people.to_columns())
+            self._recorded = self._people.gen_id
+
+    def _update_stats(self):
+        """collect statistics of current generation, survivors of last elimination.
+        """
+        if self._stats is not None:
+            self._stats.update(self._people.gen_id,
+                               self._people.fitness, self._people.genes)
+
+    def checkpoint(self, path: Union[str, Path]):
+        """write state of ga between generations into compact npz file atomically. genes packed by gene schema, fitness and ids of current generation, random stream, arguments and progress of current run, recorder and statistics are kept, fitness function, cache content and store are not.
+        recorder keeps its settings, sink mark and unflushed buffer only, in-memory record is appended into sidecar `{stem}.record.npz` next to checkpoint file.
+
+        Args:
+            path (Union[str, Path]): path of checkpoint file, replaced if exist.
+        """
+        people = self._people
+        vectorize = isinstance(people, ArrayPopulation)
+        plasm = self._template()
+        if vectorize:
+            gen_ids = people._gen_ids[:people._size]
+            idv_ids = people._idv_ids[:people._size]
+        else:
+            gen_ids = np.array([p._gen_id for p in people._curr_gen], dtype=int)
+            idv_ids = np.array([p._idv_id for p in people._curr_gen], dtype=int)
+        rng_state = self._rng.state
+        meta = {
+            'schema': list(plasm.schema.__reduce__()[1]),
+            'permutation': [plasm._crossover, plasm._mutation] if isinstance(plasm, PermutationChromosome) else None,
+            'check': plasm.check,
+            'vectorize': vectorize,
+            'capacity': people._capacity,
+            'gen_id': people.gen_id,
+            'rng': {'bit_generator': rng_state['bit_generator'], 'pos': rng_state['pos']},
+            'cache': None if self._cache is None else [self._cache.maxsize, self._cache._precision],
+            'evals': self.evals,
+            'stop_reason': self._stop_reason,
+            'run': None if self._run is None else self._run.get_state(self.evals),
+            'recorded': self._recorded,
+            'recorder': None,
+            'stats': None
+        }
+        arrays = {'fitness': people.fitness, 'gen_ids': gen_ids, 'idv_ids': idv_ids,
+                  'rng_buffer': rng_state['buffer']}
+        genes = people._genes[:people._size] if vectorize else people.genes
+        for key, value in plasm.schema.pack(genes).items():
+            arrays['genes/' + key] = value
+        states = {}
+        if self._recorder is not None:
+            # in-memory record is appended into sidecar file, not rewritten into checkpoint
+            states['recorder'] = self._recorder.get_state(
+                Path(path).with_suffix('.record.npz'))
+        if self._stats is not None:
+            states['stats'] = self._stats.get_state()
+        for name, (part_meta, part_arrays) in states.items():
+            meta[name] = part_meta
+            for key, value in part_arrays.items():
+                arrays[f'{name}/{key}'] = value
+        save_checkpoint(path, meta, arrays)
+
+    @classmethod
+    def resume(cls, path: Union[str, Path], store: Union[FitnessStore, None] = None) -> GeneticAlgorithm:
+        """create ga from checkpoint file of checkpoint(), continue it by patch and continue_run() for checkpoint written during run(), or start a new run().
+        recorder with sink file, or with sidecar of in-memory record, is reopened at position of checkpoint, rows written after it are dropped.
+
+        Args:
+            path (Union[str, Path]): path of checkpoint file.
+            store (Union[FitnessStore, None], optional): persistent fitness store consulted behind cache. Defaults to None(no store).
+
+        Raises:
+            ValueError: error message of `invalid checkpoint.`, when file is not checkpoint of supported version.
+
+        Returns:
+            GeneticAlgorithm: ga in state of checkpoint, not patched.
+        """
+        meta, arrays = load_checkpoint(path)
+        schema = get_schema(*meta['schema'])
+        if meta['permutation'] is None:
+            plasm = Chromosome(schema, meta['check'])
+        else:
+            plasm = PermutationChromosome(
+                schema, meta['check'], *meta['permutation'])
+        ga = cls.__new__(cls)
+        ga._rng = RandomStream()
+        ga._rng.state = dict(meta['rng'], buffer=arrays['rng_buffer'])
+        ga._store = store
+        ga._cache = None if meta['cache'] is None else FitnessCache(*meta['cache'])
+        genes, fitness = schema.unpack(split_arrays(arrays, 'genes/')), arrays['fitness']
+        if meta['vectorize']:
+            people = ArrayPopulation(meta['gen_id'], genes, plasm, meta['capacity'], fitness,
+                                     meta['check'], ga._rng, copy=False)
+            people._gen_ids = arrays['gen_ids']
+            people._idv_ids = arrays['idv_ids']
+        else:
+            persons = []
+            for row, fit in zip(genes, fitness):
+                person = Individual(plasm._blank(), copy=False)
+                person._plasm._gene_values[:] = row
+                person._fitness = None if np.isnan(fit) else float(fit)
+                persons.append(person)
+            people = Population(
+                meta['gen_id'], persons, meta['capacity'], ga._rng, copy=False)
+            for person, gen_id, idv_id in zip(persons, arrays['gen_ids'], arrays['idv_ids']):
+                person._gen_id = int(gen_id)
+                person._idv_id = int(idv_id)
+        ga._people = people
+        ga._patched = False
+        ga._stop_reason = meta['stop_reason']
+        ga._evals_base = meta['evals']
+        ga._run = None if meta['run'] is None else _Run(
+            meta['run']['args'], ga.evals, meta['run'])
+        ga._recorded = meta['recorded']
+        ga._recorder = None if meta['recorder'] is None else Recorder.from_state(
+            meta['recorder'], split_arrays(arrays, 'recorder/'))
+        ga._stats = None if meta['stats'] is None else GenerationStats.from_state(
+            meta['stats'], split_arrays(arrays, 'stats/'))
+        return ga
 
     def result(self) -> Individual:
         """get optimal solution of ga.
@@ -5,9 +5,11 @@ individual for genetic algorithm
 
 from __future__ import annotations
 import logging
+import sys
 import numpy as np
 from typing import Dict, List, Tuple, Union
 from .chromosome import Chromosome
+from .utils import get_stream, RandomStream
 
 logger = logging.getLogger('openGA')
 
@@ -15,13 +17,17 @@ logger = logging.getLogger('openGA')
 class Individual(object):
     """
     individual to carry chromosomes, express feature and show fitness.
+    slotted without instance dict, takes about 80 bytes besides plasm on 64-bit CPython. express() could keep feature in `_trait`.
     """
 
-    def __init__(self, plasm: Chromosome) -> Individual:
+    __slots__ = ('_gen_id', '_idv_id', '_fitness', '_plasm', '_check', '_trait')
+
+    def __init__(self, plasm: Chromosome, copy: bool = True) -> Individual:
         """create individual.
 
         Args:
             plasm (Chromosome): chromosome carried by individual.
+            copy (bool, optional): True, individual carries deep copy of plasm. False, individual takes ownership of plasm. Defaults to True.
 
         Returns:
             Individual: new individual object.
@@ -29,7 +35,8 @@ class Individual(object):
         self._gen_id = -1
         self._idv_id = -1
         self._fitness = None
-        self._plasm = plasm.copy()
+        self._trait = None
+        self._plasm = plasm.copy() if copy else plasm
         self._check = self._plasm.check
 
     def to_dict(self, default_fit: float = np.nan) -> Dict[str, float]:
@@ -102,6 +109,15 @@ class Individual(object):
         """
         return not self._fitness is None
 
+    @property
+    def nbytes(self) -> int:
+        """get memory footprint of `this` individual, shared gene schema excluded.
+
+        Returns:
+            int: bytes of individual object and its plasm.
+        """
+        return sys.getsizeof(self) + self._plasm.nbytes
+
     @property
     def plasm(self) -> Chromosome:
         """get a deep copy of plasm of `this` individual.
@@ -117,8 +133,24 @@ class Individual(object):
             if not self._plasm.is_couple(info):
                 raise ValueError(
                     'can not extract info for mismatch chromosome')
-        for i in range(self._plasm._gene_num):
-            self._plasm.update(info.gene_values[i], i)
+        self._plasm.gene_values = info._gene_values[:self._plasm._gene_num]
+
+    @property
+    def gene_values(self) -> np.ndarray:
+        """get a read-only view of gene value of plasm, without copy of chromosome.
+
+        Returns:
+            np.ndarray: gene value array, non-writeable.
+        """
+        return self._plasm.gene_values
+
+    def decode(self) -> np.ndarray:
+        """map gene values of plasm into physical units by bounds of gene schema.
+
+        Returns:
+            np.ndarray: physical values in gene order.
+        """
+        return self._plasm.decode()
 
     def express(self):
         """express individual's plasm into feature. Need monkey path in prior to be called.
@@ -139,45 +171,63 @@ class Individual(object):
             Individual: clone of `this` individual.
         """
         clone = Individual(self._plasm)
-        for i in range(self._plasm._gene_num):
-            clone._plasm.update(self._plasm.gene_values[i], i)
         clone.gen_id = self._gen_id
         clone.idv_id = self._idv_id
         return clone
 
-    def sexual_reproduce(self, couple: Individual, p_mutation: float = 0.05) -> Tuple[Individual, Individual]:
+    def sexual_reproduce(self, couple: Individual, p_mutation: float = 0.05, gene_prob: float = 1.0,
+                         rng: Union[RandomStream, None] = None) -> Tuple[Individual, Individual]:
         """generate offspring individual with the other individual by cross-over and mutation.
 
         Args:
             couple (Individual): the other individual for mating.
             p_mutation (float, optional): probability of mutation. Defaults to 0.05.
+            gene_prob (float, optional): mutation probability of each gene once mutation happens. Defaults to 1.0.
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
 
         Returns:
             Tuple[Individual, Individual]: offspring individuals.
         """
-        offspring_0 = self.copy()
-        offspring_1 = couple.copy()
-        plasm_0, plasm_1 = self._plasm.crossover(couple._plasm)
-        if np.random.uniform() < p_mutation:
-            plasm_0 = plasm_0.mutate()
-        if np.random.uniform() < p_mutation:
-            plasm_1 = plasm_1.mutate()
-        offspring_0.plasm = plasm_0
-        offspring_1.plasm = plasm_1
+        rng = get_stream(rng)
+        plasm_0, plasm_1 = self._plasm.crossover(couple._plasm, rng=rng)
+        if rng.random() < p_mutation:
+            plasm_0 = plasm_0.mutate(gene_prob=gene_prob, rng=rng)
+        if rng.random() < p_mutation:
+            plasm_1 = plasm_1.mutate(gene_prob=gene_prob, rng=rng)
+        # offspring own newly created plasm, no clone needed
+        offspring_0 = self._beget(plasm_0)
+        offspring_1 = couple._beget(plasm_1)
 
         return offspring_0, offspring_1
 
-    def asexual_reproduce(self, p_mutation: float = 0.1) -> Individual:
+    def asexual_reproduce(self, p_mutation: float = 0.1, gene_prob: float = 1.0,
+                          rng: Union[RandomStream, None] = None) -> Individual:
         """generate offspring individual by `this` individual itself with clone and mutation.
 
         Args:
             p_mutation (float, optional): probability of mutation. Defaults to 0.1.
+            gene_prob (float, optional): mutation probability of each gene once mutation happens. Defaults to 1.0.
+            rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+        Returns:
+            Individual: offspring individual.
+        """
+        rng = get_stream(rng)
+        if rng.random() < p_mutation:
+            return self._beget(self._plasm.mutate(gene_prob=gene_prob, rng=rng))
+        return self.copy()
+
+    def _beget(self, plasm: Chromosome) -> Individual:
+        """create offspring taking ownership of plasm, ids are inherited from `this` individual.
+
+        Args:
+            plasm (Chromosome): chromosome of offspring, taken without clone and never modified in place.
 
         Returns:
             Individual: offspring individual.
         """
-        offspring = self.copy()
-        if np.random.uniform() < p_mutation:
-            plasm = self._plasm.mutate()
-            offspring.plasm = plasm
+        offspring = Individual(plasm, copy=False)
+        offspring._check = self._check
+        offspring.gen_id = self._gen_id
+        offspring.idv_id = self._idv_id
         return offspring
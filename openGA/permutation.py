@@ -0,0 +1,258 @@
+"""
+permutation chromosome for sequencing and routing problems
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import numpy as np
+from typing import List, Tuple, Union
+from .chromosome import Chromosome
+from .schema import GeneSchema, get_schema
+from .utils import get_stream, RandomStream, GENE_MIN, GENE_MAX
+
+logger = logging.getLogger('openGA')
+
+CROSSOVERS = ('ox', 'pmx')
+MUTATIONS = ('inversion', 'swap')
+
+
+def genes_to_order(genes: np.ndarray) -> np.ndarray:
+    """convert gene values of permutation chromosome into visiting order.
+
+    Args:
+        genes (np.ndarray): scaled position of each item. 1D for one chromosome, 2D(chromosome x item) for many.
+
+    Returns:
+        np.ndarray: item index at each position, same shape as genes.
+    """
+    return np.argsort(genes, axis=-1, kind='stable')
+
+
+def order_to_genes(orders: np.ndarray) -> np.ndarray:
+    """convert visiting order into gene values of permutation chromosome, inverse of genes_to_order().
+
+    Args:
+        orders (np.ndarray): item index at each position. 1D for one chromosome, 2D(chromosome x item) for many.
+
+    Returns:
+        np.ndarray: position of each item scaled into [GENE_MIN, GENE_MAX].
+    """
+    orders = np.asarray(orders)
+    n = orders.shape[-1]
+    ranks = np.empty_like(orders)
+    np.put_along_axis(ranks, orders, np.broadcast_to(
+        np.arange(n), orders.shape), axis=-1)
+    return GENE_MIN + ranks / (n - 1) * (GENE_MAX - GENE_MIN)
+
+
+def _segments(m: int, n: int, rng: RandomStream) -> Tuple[np.ndarray, np.ndarray]:
+    """draw non-empty segment [a, b) of each row.
+    """
+    cuts = np.sort(rng.integers(0, n, 2 * m).reshape(m, 2), axis=1)
+    return cuts[:, 0], cuts[:, 1] + 1
+
+
+def _ox(donor: np.ndarray, filler: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """order cross-over, child keeps segment of donor, the others are filled in order of filler from end of segment.
+    """
+    m, n = donor.shape
+    rows = np.arange(m)[:, None]
+    pos = np.arange(n)
+    in_seg = (pos >= a[:, None]) & (pos < b[:, None])
+    taken = np.zeros((m, n), dtype=bool)
+    taken[rows, donor] = in_seg
+    # positions and filler items both start from end of segment
+    rot = (b[:, None] + pos) % n
+    filler_rot = filler[rows, rot]
+    free = ~in_seg[rows, rot]
+    child = np.where(in_seg, donor, 0)
+    child[np.nonzero(free)[0], rot[free]] = filler_rot[~taken[rows, filler_rot]]
+    return child
+
+
+def _pmx(donor: np.ndarray, filler: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """partially mapped cross-over, child keeps segment of donor, conflicts outside segment follow mapping of segment.
+    """
+    m, n = donor.shape
+    rows = np.arange(m)[:, None]
+    pos = np.arange(n)
+    in_seg = (pos >= a[:, None]) & (pos < b[:, None])
+    taken = np.zeros((m, n), dtype=bool)
+    taken[rows, donor] = in_seg
+    where_donor = np.argsort(donor, axis=1)
+    child = np.where(in_seg, donor, filler)
+    # follow mapping chains of conflicting entries only
+    r, c = np.nonzero(~in_seg & taken[rows, child])
+    while len(r):
+        child[r, c] = filler[r, where_donor[r, child[r, c]]]
+        still = taken[r, child[r, c]]
+        r, c = r[still], c[still]
+    return child
+
+
+def ox_kernel(p0_orders: np.ndarray, p1_orders: np.ndarray,
+              rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """order cross-over(OX) on whole order arrays, one segment drawn per couple.
+
+    Args:
+        p0_orders (np.ndarray): orders of parent 0 in shape of (couple, item).
+        p1_orders (np.ndarray): orders of parent 1, same shape as p0_orders.
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: orders of offspring.
+    """
+    a, b = _segments(*p0_orders.shape, get_stream(rng))
+    return _ox(p0_orders, p1_orders, a, b), _ox(p1_orders, p0_orders, a, b)
+
+
+def pmx_kernel(p0_orders: np.ndarray, p1_orders: np.ndarray,
+               rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """partially mapped cross-over(PMX) on whole order arrays, one segment drawn per couple.
+
+    Args:
+        p0_orders (np.ndarray): orders of parent 0 in shape of (couple, item).
+        p1_orders (np.ndarray): orders of parent 1, same shape as p0_orders.
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: orders of offspring.
+    """
+    a, b = _segments(*p0_orders.shape, get_stream(rng))
+    return _pmx(p0_orders, p1_orders, a, b), _pmx(p1_orders, p0_orders, a, b)
+
+
+def swap_kernel(orders: np.ndarray, rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """swap mutation, items at two distinct positions of each row exchange.
+
+    Args:
+        orders (np.ndarray): orders in shape of (chromosome, item).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        np.ndarray: mutated orders.
+    """
+    rng = get_stream(rng)
+    m, n = orders.shape
+    i = rng.integers(0, n, m)[:, None]
+    j = (i + rng.integers(1, n, m)[:, None]) % n
+    pos = np.arange(n)
+    src = np.where(pos == i, j, np.where(pos == j, i, pos))
+    return orders[np.arange(m)[:, None], src]
+
+
+def inversion_kernel(orders: np.ndarray, rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """inversion mutation, items between two distinct positions of each row are reversed.
+
+    Args:
+        orders (np.ndarray): orders in shape of (chromosome, item).
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Returns:
+        np.ndarray: mutated orders.
+    """
+    rng = get_stream(rng)
+    m, n = orders.shape
+    i = rng.integers(0, n, m)
+    j = (i + rng.integers(1, n, m)) % n
+    low = np.minimum(i, j)[:, None]
+    high = np.maximum(i, j)[:, None]
+    pos = np.arange(n)
+    src = np.where((pos >= low) & (pos <= high), low + high - pos, pos)
+    return orders[np.arange(m)[:, None], src]
+
+
+def permutation_schema(items: List[str], dtype: Union[str, type, np.dtype] = np.float64) -> GeneSchema:
+    """get gene schema of permutation over items, each gene is 'int' position of item without rounding.
+
+    Args:
+        items (List[str]): name of items to be ordered, at least two.
+        dtype (Union[str, type, np.dtype], optional): float type of gene array. Defaults to np.float64.
+
+    Returns:
+        GeneSchema: interned gene schema.
+    """
+    n = len(items)
+    return get_schema(items, None, dtype, {name: (0, n - 1) for name in items}, None,
+                      {name: 'int' for name in items})
+
+
+class PermutationChromosome(Chromosome):
+    """
+    chromosome of visiting order of items for sequencing and routing problems.
+    gene value of each item is its position in order scaled into [GENE_MIN, GENE_MAX], so populations, evaluators and caches handle it as other chromosomes. decode() gives position of each item, `order` gives item at each position.
+    """
+
+    __slots__ = ('_crossover', '_mutation')
+
+    def __init__(self, items: Union[List[str], GeneSchema], check: bool = True, crossover: str = 'ox',
+                 mutation: str = 'inversion', dtype: Union[str, type, np.dtype] = np.float64) -> PermutationChromosome:
+        """create permutation chromosome in order of items.
+
+        Args:
+            items (Union[List[str], GeneSchema]): name of items to be ordered, or gene schema from permutation_schema().
+            check (bool, optional): True, check genes couple or not in genetic operation. False, on the contrary. Defaults to True.
+            crossover (str, optional): cross-over operator in CROSSOVERS, 'ox' for order cross-over, 'pmx' for partially mapped cross-over. Defaults to 'ox'.
+            mutation (str, optional): mutation operator in MUTATIONS, 'inversion' reverses a segment, 'swap' exchanges two items. Defaults to 'inversion'.
+            dtype (Union[str, type, np.dtype], optional): float type of gene array, ignored for gene schema. Defaults to np.float64.
+
+        Raises:
+            ValueError: error message of `invalid crossover.`, when crossover not in CROSSOVERS.
+            ValueError: error message of `invalid mutation.`, when mutation not in MUTATIONS.
+
+        Returns:
+            PermutationChromosome: new chromosome object.
+        """
+        if crossover not in CROSSOVERS:
+            raise ValueError('invalid crossover. Must in %s, got %s' %
+                             (CROSSOVERS, crossover))
+        if mutation not in MUTATIONS:
+            raise ValueError('invalid mutation. Must in %s, got %s' %
+                             (MUTATIONS, mutation))
+        if not isinstance(items, GeneSchema):
+            items = permutation_schema(items, dtype)
+        super().__init__(items, check)
+        self._crossover = crossover
+        self._mutation = mutation
+        self._gene_values[:] = order_to_genes(np.arange(self._gene_num))
+
+    @property
+    def order(self) -> np.ndarray:
+        """get item index at each position.
+
+        Returns:
+            np.ndarray: visiting order.
+        """
+        return genes_to_order(self._gene_values)
+
+    @order.setter
+    def order(self, order: np.ndarray):
+        order = np.asarray(order, dtype=int)
+        if order.shape != (self._gene_num,) or np.any(np.sort(order) != np.arange(self._gene_num)):
+            raise ValueError('invalid order. Must permutation of [0, %d), got %s' %
+                             (self._gene_num, order))
+        self._gene_values[:] = order_to_genes(order)
+
+    def _blank(self) -> PermutationChromosome:
+        return PermutationChromosome(self._schema, self._check, self._crossover, self._mutation)
+
+    def _random_rows(self, size: Union[int, None] = None, rng: Union[RandomStream, None] = None) -> np.ndarray:
+        shape = (self._gene_num,) if size is None else (size, self._gene_num)
+        return order_to_genes(np.argsort(get_stream(rng).random(shape), axis=-1))
+
+    def _cross_rows(self, p0_genes: np.ndarray, p1_genes: np.ndarray, eta: Union[int, float] = 20,
+                    rng: Union[RandomStream, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # eta is for real genes only
+        shape = np.shape(p0_genes)
+        kernel = ox_kernel if self._crossover == 'ox' else pmx_kernel
+        c0, c1 = kernel(genes_to_order(np.atleast_2d(p0_genes)),
+                        genes_to_order(np.atleast_2d(p1_genes)), rng)
+        return order_to_genes(c0).reshape(shape), order_to_genes(c1).reshape(shape)
+
+    def _mutate_rows(self, genes: np.ndarray, eta: Union[int, float] = 20, gene_prob: float = 1.0,
+                     rng: Union[RandomStream, None] = None) -> np.ndarray:
+        # each chromosome mutates once, eta and gene_prob are for real genes only
+        kernel = inversion_kernel if self._mutation == 'inversion' else swap_kernel
+        orders = kernel(genes_to_order(np.atleast_2d(genes)), rng)
+        return order_to_genes(orders).reshape(np.shape(genes))
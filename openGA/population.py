@@ -7,9 +7,11 @@ from __future__ import annotations
 import logging
 import numpy as np
 import pandas as pd
-from typing import List, Union
+from typing import Dict, List, Union
 from copy import deepcopy
 from .individual import Individual
+from .utils import get_stream, tournament, survive, RandomStream
+from .evaluator import Evaluator
 
 logger = logging.getLogger('openGA')
 
@@ -19,21 +21,28 @@ class Population(object):
     population contains individuals of current generation(includes adults, children) and next generation.
     """
 
-    def __init__(self, gen_id: int, curr_gen: List[Individual], capacity: int = 20) -> Population:
+    def __init__(self, gen_id: int, curr_gen: List[Individual], capacity: int = 20,
+                 rng: Union[RandomStream, None] = None, evaluator: Union[Evaluator, None] = None,
+                 copy: bool = True) -> Population:
         """create population.
 
         Args:
             gen_id (int): generate id of current generation.
             curr_gen (List[Individual]): list of individual of current generation.
             capacity (int, optional): max individual could live in environment. Defaults to 20.
+            rng (Union[RandomStream, None], optional): random stream for genetic operation. Defaults to None(module shared stream).
+            evaluator (Union[Evaluator, None], optional): evaluator to update fitness. Defaults to None(monkey patch of Individual).
+            copy (bool, optional): True, population keeps deep copy of curr_gen. False, population takes individuals of curr_gen as they are. Defaults to True.
 
         Returns:
             Population: new population object.
         """
         self._capacity = capacity
+        self._rng = get_stream(rng)
+        self._evaluator = evaluator
         self._gen_id = gen_id
         self._size = len(curr_gen)
-        self._curr_gen = deepcopy(curr_gen)
+        self._curr_gen = deepcopy(curr_gen) if copy else list(curr_gen)
         self._parents = []
         self._children = []
         self._next_gen = []
@@ -42,7 +51,7 @@ class Population(object):
             self._curr_gen[i].idv_id = i
 
     def to_df(self, default_fit: float = np.nan) -> pd.DataFrame:
-        """convert population into dataframe with row of each individual of current generation.
+        """convert population into dataframe with row of each individual of current generation, built from columns of to_columns().
 
         Args:
             default_fit (float, optional): default value for fitness when individual not grow-up. Defaults to np.nan.
@@ -50,10 +59,27 @@ class Population(object):
         Returns:
             pd.DataFrame: population in dataframe format.
         """
-        l = []
-        for p in self._curr_gen:
-            l.append(p.to_dict(default_fit=default_fit))
-        rlt = pd.DataFrame(l)
+        return pd.DataFrame(self.to_columns(default_fit))
+
+    def to_columns(self, default_fit: float = np.nan) -> Dict[str, np.ndarray]:
+        """convert current generation into columns of `gen_id`, `idv_id`, `fitness` and ${gene_names} of plasm.
+
+        Args:
+            default_fit (float, optional): default value for fitness when individual not grow-up. Defaults to np.nan.
+
+        Returns:
+            Dict[str, np.ndarray]: column name and its values, row of each individual.
+        """
+        rlt = {
+            'gen_id': np.array([p._gen_id for p in self._curr_gen], dtype=int),
+            'idv_id': np.array([p._idv_id for p in self._curr_gen], dtype=int),
+            'fitness': np.array([default_fit if p._fitness is None else p._fitness
+                                 for p in self._curr_gen], dtype=float)
+        }
+        if self._curr_gen:
+            genes = np.array([p._plasm._gene_values for p in self._curr_gen])
+            for i, name in enumerate(self._curr_gen[0]._plasm._gene_names):
+                rlt[name] = genes[:, i]
         return rlt
 
     def __str__(self) -> str:
@@ -84,6 +110,49 @@ class Population(object):
         """
         return self._gen_id
 
+    @property
+    def genes(self) -> np.ndarray:
+        """get gene array of current generation stacked from individuals.
+
+        Returns:
+            np.ndarray: gene array in shape of (individual, gene).
+        """
+        if not self._curr_gen:
+            return np.zeros((0, 0))
+        return np.array([p._plasm._gene_values for p in self._curr_gen])
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """get fitness of current generation, NaN for not grow-up individual.
+
+        Returns:
+            np.ndarray: fitness array.
+        """
+        return np.array([np.nan if p._fitness is None else p._fitness for p in self._curr_gen], dtype=float)
+
+    def decode(self) -> np.ndarray:
+        """map gene values of current generation into physical units by bounds of gene schema in one call.
+
+        Returns:
+            np.ndarray: physical values in shape of (individual, gene).
+        """
+        if not self._curr_gen:
+            return np.zeros((0, 0))
+        return self._curr_gen[0]._plasm.schema.decode(self.genes)
+
+    @property
+    def evaluator(self) -> Union[Evaluator, None]:
+        """get evaluator of `this` population.
+
+        Returns:
+            Union[Evaluator, None]: evaluator, None for monkey patch of Individual.
+        """
+        return self._evaluator
+
+    @evaluator.setter
+    def evaluator(self, evaluator: Union[Evaluator, None]):
+        self._evaluator = evaluator
+
     @property
     def curr_gen(self) -> List[Individual]:
         """get shallow copy of individuals in current generation.
@@ -138,17 +207,34 @@ class Population(object):
         return self._next_gen.copy()
 
     @staticmethod
-    def evaluate(group: List[Individual]):
+    def evaluate(group: List[Individual], evaluator: Union[Evaluator, None] = None):
         """Static Method. evaluate performance of individuals to update fitness.
 
         Args:
             group (List[Individual]): individuals for evalutation.
+            evaluator (Union[Evaluator, None], optional): evaluator to update fitness. Defaults to None(monkey patch of Individual).
         """
+        if evaluator is not None:
+            evaluator.evaluate(group)
+            return
         for person in group:
             if not person.is_growup():
                 person.express()
                 person.evaluate()
 
+    @staticmethod
+    async def evaluate_async(group: List[Individual], evaluator: Union[Evaluator, None] = None):
+        """Static Method. Coroutine. evaluate performance of individuals to update fitness without blocking event loop.
+
+        Args:
+            group (List[Individual]): individuals for evalutation.
+            evaluator (Union[Evaluator, None], optional): evaluator to update fitness. Defaults to None(monkey patch of Individual, blocking).
+        """
+        if evaluator is not None:
+            await evaluator.evaluate_async(group)
+            return
+        Population.evaluate(group)
+
     def size(self) -> int:
         """get number of individuals in current generation.
         """
@@ -167,29 +253,30 @@ class Population(object):
         person.gen_id = self._gen_id
         person.idv_id = self._size
         if self._curr_gen:
-            if not person.plasm.is_couple(self._curr_gen[0].plasm):
+            if not person._plasm.is_couple(self._curr_gen[0]._plasm):
                 raise ValueError('invalid newcomer as reproduction isolation')
         self._curr_gen.append(person)
         self._size += 1
 
     def _append_newborn(self, newborn: Individual):
-        """add new individual into current generation as child.
+        """add new individual into current generation as child, population takes ownership of newborn.
 
         Args:
-            newborn (Individual): new individual to be added.
+            newborn (Individual): new individual to be added, not shared with others.
         """
-        person = newborn.copy()
+        person = newborn
         person.gen_id = self._gen_id
         person.idv_id = self._size
         self._children.append(person)
         self._size += 1
 
-    def select(self, pool_size: Union[int, None] = None, tour_size: int = 2) -> List[Individual]:
+    def select(self, pool_size: Union[int, None] = None, tour_size: int = 2, replace: bool = False) -> List[Individual]:
         """select indvidual from current generation as parents for reproduce.
 
         Args:
             pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
             tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            replace (bool, optional): True, an individual could be selected as parent more than once. False, each parent is unique. Defaults to False.
 
         Returns:
             List[Individual]: shallow copy of list of parent individuals.
@@ -197,35 +284,22 @@ class Population(object):
         if pool_size is None:
             pool_size = int(self._size/2)
         # evaluate parents
-        self.evaluate(self._curr_gen)
-        parents_idx_list = []
-        for _ in range(pool_size):
-            # select candidates
-            candidate_idx_set = set()
-            for j in range(tour_size):
-                while not len(candidate_idx_set) > j:
-                    rnd_idx = np.random.randint(0, self._size)
-                    if rnd_idx not in parents_idx_list:
-                        candidate_idx_set.add(rnd_idx)
-            # candidates compete
-            parent_idx = None
-            for candidate_idx in candidate_idx_set:
-                if parent_idx is None:
-                    parent_idx = candidate_idx
-                    continue
-                if self._curr_gen[parent_idx].fitness < self._curr_gen[candidate_idx].fitness:
-                    parent_idx = candidate_idx
-            parents_idx_list.append(parent_idx)
+        self.evaluate(self._curr_gen, self._evaluator)
+        # candidates compete
+        fitness = np.array([person.fitness for person in self._curr_gen])
+        parents_idx_list = tournament(
+            fitness, pool_size, tour_size, replace, self._rng)
         self._parents = []
         for i in parents_idx_list:
             self._parents.append(self._curr_gen[i])
         return self._parents.copy()
 
-    def reproduce(self, cross_prob: float = 0.9) -> List[Individual]:
+    def reproduce(self, cross_prob: float = 0.9, gene_prob: float = 1.0) -> List[Individual]:
         """generate child individuals from parent by sexual reproduction.
 
         Args:
             cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
 
         Raises:
             ValueError: error message of `invalid cross_prob.`, when cross_prob not in [0, 1].
@@ -233,69 +307,118 @@ class Population(object):
         Returns:
             List[Individual]: shallow copy of list of child indivudals.
         """
+        self._breed(cross_prob, gene_prob)
+        # evaluate children
+        self.evaluate(self._children, self._evaluator)
+        return self._children.copy()
+
+    def _breed(self, cross_prob: float, gene_prob: float):
+        """generate child individuals from parent without evaluation.
+
+        Args:
+            cross_prob (float): cross-over probability.
+            gene_prob (float): mutation probability of each gene in asexual reproduction.
+
+        Raises:
+            ValueError: error message of `invalid cross_prob.`, when cross_prob not in [0, 1].
+        """
         if not 0 <= cross_prob <= 1:
             raise ValueError(
                 'invalid cross_prob. Must in [0,1], got %6.4f' % cross_prob)
         self._children = []
         n_parents = len(self._parents)
         for _ in range(n_parents):
-            if np.random.uniform(0, 1) < cross_prob:
+            if self._rng.random() < cross_prob:
                 # select parents
-                p0_idx = np.random.randint(0, n_parents)
+                p0_idx = self._rng.integers(0, n_parents)
                 p1_idx = p0_idx
                 while p1_idx == p0_idx:
-                    p1_idx = np.random.randint(0, n_parents)
+                    p1_idx = self._rng.integers(0, n_parents)
                 # sexual produce
                 c0, c1 = self._parents[int(p0_idx)].sexual_reproduce(
-                    self._parents[int(p1_idx)], p_mutation=0)
+                    self._parents[int(p1_idx)], p_mutation=0, rng=self._rng)
                 self._append_newborn(c0)
                 self._append_newborn(c1)
             else:
                 # asexual produce mutation
-                p_idx = np.random.randint(0, n_parents)
-                c = self._parents[int(p_idx)].asexual_reproduce(p_mutation=1)
+                p_idx = self._rng.integers(0, n_parents)
+                c = self._parents[int(p_idx)].asexual_reproduce(
+                    p_mutation=1, gene_prob=gene_prob, rng=self._rng)
                 c.idv_id = len(self._children) + self._size
                 self._append_newborn(c)
-        # evaluate children
-        self.evaluate(self._children)
-        return self._children.copy()
 
-    def eliminate(self) -> List[Individual]:
+    def eliminate(self, survival: str = 'plus', copy: bool = True) -> List[Individual]:
         """generate individuals in next generation by eliminating individuals with lower fitness in current generation and children group.
 
+        Args:
+            survival (str, optional): 'plus' for (mu+lambda), current generation and children compete together. 'comma' for (mu,lambda), only children survive. Defaults to 'plus'.
+            copy (bool, optional): True, survivors are deep copies. False, survivors are new individuals sharing chromosome with individuals of `this` population, which are left as they are. Defaults to True.
+
         Returns:
-            List[Individual]: survivors in next generation with number of capacity.
+            List[Individual]: survivors in next generation with number of capacity, sorted on fitness from high to low.
         """
         self._combine = self._curr_gen.copy()
         self._combine.extend(self._children)
-        combine_fit_list = [idv.fitness for idv in self._combine]
-        combine_idx_list = list(range(len(self._combine)))
-        joint_raw = zip(combine_fit_list, combine_idx_list)
-        # sort individual on fitness from high to low
-        joint_sort = sorted(joint_raw, reverse=True)
-        # get the top size
+        parent_fit = np.array([idv.fitness for idv in self._curr_gen])
+        child_fit = np.array([idv.fitness for idv in self._children])
+        # get the top size, only survivors are copied
         self._next_gen = []
-        for i in range(self._capacity):
-            next_idv = deepcopy(self._combine[joint_sort[i][1]])
+        for i, idx in enumerate(survive(parent_fit, child_fit, self._capacity, survival)):
+            # chromosome is never modified in place, so survivor shares it instead of clone
+            source = self._combine[idx]
+            next_idv = source.copy() if copy else source._beget(source._plasm)
+            next_idv._fitness = source._fitness
             next_idv.idv_id = i
             next_idv.gen_id = self._gen_id + 1
             self._next_gen.append(next_idv)
         return self._next_gen.copy()
 
-    def evolve(self, pool_size: Union[int, None] = None, tour_size: int = 2, cross_prob: float = 0.9) -> Population:
-        """`this` population evolve into new population by select(), reproduce() and eliminate().
+    def evolve(self, pool_size: Union[int, None] = None, tour_size: int = 2, cross_prob: float = 0.9,
+               gene_prob: float = 1.0, replace: bool = False, survival: str = 'plus') -> Population:
+        """`this` population evolve into new population by select(), reproduce() and eliminate(). survivors share chromosome with `this` population instead of clone, individuals of `this` population keep their ids.
+
+        Args:
+            pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
+            tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
+            cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
+            replace (bool, optional): True, an individual could be selected as parent more than once. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
+
+        Returns:
+            Population: new population after evolution.
+        """
+        self.select(pool_size, tour_size, replace)
+        self.reproduce(cross_prob, gene_prob)
+        # hand over survivors to next generation without clone
+        survivors = self.eliminate(survival, copy=False)
+        next_gen_id = self._gen_id + 1
+        next_population = Population(
+            next_gen_id, survivors, self._capacity, self._rng, self._evaluator, copy=False)
+        return next_population
+
+    async def evolve_async(self, pool_size: Union[int, None] = None, tour_size: int = 2, cross_prob: float = 0.9,
+                           gene_prob: float = 1.0, replace: bool = False, survival: str = 'plus') -> Population:
+        """Coroutine. `this` population evolve into new population as evolve(), individuals are evaluated by evaluate_async().
 
         Args:
             pool_size (Union[int, None], optional): number of parents. Defaults to None(1/2 of current generate individuals).
             tour_size (int, optional): number of individual for tournament to be parents. Defaults to 2.
             cross_prob (float, optional): cross-over probability. Defaults to 0.9.
+            gene_prob (float, optional): mutation probability of each gene in asexual reproduction. Defaults to 1.0.
+            replace (bool, optional): True, an individual could be selected as parent more than once. Defaults to False.
+            survival (str, optional): 'plus' for (mu+lambda), 'comma' for (mu,lambda) replacement. Defaults to 'plus'.
 
         Returns:
             Population: new population after evolution.
         """
-        self.select(pool_size, tour_size)
-        self.reproduce(cross_prob)
-        survivors = self.eliminate()
+        await self.evaluate_async(self._curr_gen, self._evaluator)
+        self.select(pool_size, tour_size, replace)
+        self._breed(cross_prob, gene_prob)
+        await self.evaluate_async(self._children, self._evaluator)
+        # hand over survivors to next generation without clone
+        survivors = self.eliminate(survival, copy=False)
         next_gen_id = self._gen_id + 1
-        next_population = Population(next_gen_id, survivors, self._capacity)
+        next_population = Population(
+            next_gen_id, survivors, self._capacity, self._rng, self._evaluator, copy=False)
         return next_population
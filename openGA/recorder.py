@@ -0,0 +1,364 @@
+"""
+streaming evolution recorder for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+logger = logging.getLogger('openGA')
+
+SINK_FORMATS = ('csv', 'npz', 'parquet')
+
+
+def _sink_format(path: Path, fmt: Union[str, None]) -> str:
+    """get sink format from fmt, or from suffix of path when fmt not given.
+    """
+    fmt = path.suffix.lstrip('.').lower() if fmt is None else fmt
+    if fmt not in SINK_FORMATS:
+        raise ValueError('invalid fmt. Must in %s, got %s' %
+                         (SINK_FORMATS, fmt))
+    return fmt
+
+
+class CsvSink(object):
+    """
+    append-only csv file, header is written with first chunk. mark is file size in bytes.
+    """
+
+    def __init__(self, path: Union[str, Path], mark: Union[int, None] = None) -> CsvSink:
+        self._path = Path(path)
+        if mark is None:
+            self._path.write_text('')
+            mark = 0
+        else:
+            with self._path.open('r+b') as f:
+                f.truncate(mark)
+        self._header = mark == 0
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(self._path, mode='a', header=self._header, index=False)
+        self._header = False
+
+    def mark(self) -> int:
+        return self._path.stat().st_size
+
+    def close(self):
+        pass
+
+
+class NpzSink(object):
+    """
+    append-only npz archive, column of chunk i is kept as array `{i:06d}/{column}`. mark is number of chunks.
+    """
+
+    def __init__(self, path: Union[str, Path], mark: Union[int, None] = None) -> NpzSink:
+        self._path = Path(path)
+        if mark is None:
+            zipfile.ZipFile(self._path, 'w').close()
+            mark = 0
+        else:
+            self._truncate(mark)
+        self._chunk_id = mark
+
+    def _truncate(self, mark: int):
+        """drop chunks from mark on, archive is rewritten only if there is any.
+        """
+        with zipfile.ZipFile(self._path, 'r') as zf:
+            infos = zf.infolist()
+            kept = [info for info in infos if int(info.filename.split('/', 1)[0]) < mark]
+            if len(kept) == len(infos):
+                return
+            tmp = self._path.with_name(self._path.name + '.tmp')
+            with zipfile.ZipFile(tmp, 'w') as out:
+                for info in kept:
+                    out.writestr(info, zf.read(info))
+        os.replace(tmp, self._path)
+
+    def write(self, chunk: pd.DataFrame):
+        with zipfile.ZipFile(self._path, 'a') as zf:
+            for name in chunk.columns:
+                with zf.open(f'{self._chunk_id:06d}/{name}.npy', 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, chunk[name].to_numpy())
+        self._chunk_id += 1
+
+    def mark(self) -> int:
+        return self._chunk_id
+
+    def close(self):
+        pass
+
+
+class ParquetSink(object):
+    """
+    directory of parquet files, chunk i is kept as `{i:06d}.parquet`, pyarrow required. mark is number of chunks.
+    """
+
+    def __init__(self, path: Union[str, Path], mark: Union[int, None] = None) -> ParquetSink:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                'parquet sink requires pyarrow, install it by `pip install pyarrow`') from e
+        self._path = Path(path)
+        self._chunk_id = 0 if mark is None else mark
+        self._path.mkdir(parents=True, exist_ok=True)
+        for part in self._path.glob('*.parquet'):
+            if int(part.stem) >= self._chunk_id:
+                part.unlink()
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_parquet(self._path / f'{self._chunk_id:06d}.parquet',
+                         engine='pyarrow', index=False)
+        self._chunk_id += 1
+
+    def mark(self) -> int:
+        return self._chunk_id
+
+    def close(self):
+        pass
+
+
+_SINKS = {'csv': CsvSink, 'npz': NpzSink, 'parquet': ParquetSink}
+
+
+def read_record(path: Union[str, Path], fmt: Union[str, None] = None) -> pd.DataFrame:
+    """read evolution record written by Recorder.
+
+    Args:
+        path (Union[str, Path]): path of record file, or directory for 'parquet'.
+        fmt (Union[str, None], optional): format in SINK_FORMATS. Defaults to None(suffix of path).
+
+    Raises:
+        ValueError: error message of `invalid fmt.`, when fmt not in SINK_FORMATS.
+
+    Returns:
+        pd.DataFrame: evolution record, one row of each individual of each recorded generation.
+    """
+    path = Path(path)
+    fmt = _sink_format(path, fmt)
+    if fmt == 'csv':
+        if path.stat().st_size == 0:
+            return pd.DataFrame()
+        return pd.read_csv(path)
+    if fmt == 'parquet':
+        parts = sorted(path.glob('*.parquet'))
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat([pd.read_parquet(p, engine='pyarrow') for p in parts], ignore_index=True)
+    chunks = {}
+    with np.load(path) as data:
+        for key in data.files:
+            chunk_id, name = key.split('/', 1)
+            chunks.setdefault(chunk_id, {})[name] = data[key]
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat([pd.DataFrame(chunks[k]) for k in sorted(chunks)], ignore_index=True)
+
+
+class Recorder(object):
+    """
+    evolution record buffered in columnar arrays of each generation, flushed in chunks into memory and/or append-only sink.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None, fmt: Union[str, None] = None,
+                 chunk_size: int = 65536, keep: Union[bool, None] = None, mark: Union[int, None] = None) -> Recorder:
+        """create recorder.
+
+        Args:
+            path (Union[str, Path, None], optional): path of sink file, or directory for 'parquet', overwritten if exist. Defaults to None(no sink).
+            fmt (Union[str, None], optional): sink format in SINK_FORMATS, 'parquet' requires pyarrow. Defaults to None(suffix of path).
+            chunk_size (int, optional): number of buffered rows flushed at once. Defaults to 65536.
+            keep (Union[bool, None], optional): True, keep flushed chunks in memory for record. False, record is read back from sink. Defaults to None(keep without sink only).
+            mark (Union[int, None], optional): position of existing sink to append from, content after it is dropped. Defaults to None(new sink).
+
+        Raises:
+            ValueError: error message of `invalid chunk_size.`, when chunk_size less than 1.
+            ValueError: error message of `invalid fmt.`, when fmt not in SINK_FORMATS.
+            ValueError: error message of `invalid keep.`, when keep is False without sink.
+
+        Returns:
+            Recorder: new recorder object.
+        """
+        if chunk_size < 1:
+            raise ValueError(
+                'invalid chunk_size. Must >= 1, got %d' % chunk_size)
+        if keep is None:
+            keep = path is None
+        if not keep and path is None:
+            raise ValueError('invalid keep. Must be True without path')
+        self._path = None if path is None else Path(path)
+        self._fmt = None if path is None else _sink_format(self._path, fmt)
+        self._sink = None if path is None else _SINKS[self._fmt](
+            self._path, mark)
+        self._chunk_size = chunk_size
+        self._keep = keep
+        self._buffer = []
+        self._buffer_rows = 0
+        self._chunks = []
+        self._rows = 0
+        self._view = None
+        # sidecar of in-memory record for checkpoint, and number of kept rows written into it
+        self._spill = None
+        self._spilled = 0
+
+    def __enter__(self) -> Recorder:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __str__(self) -> str:
+        sink = 'memory' if self._sink is None else f"{self._fmt}:{self._path}"
+        return f"recorder({sink}): {self._rows:d} rows, {self._buffer_rows:d} buffered"
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def path(self) -> Union[Path, None]:
+        """get path of sink file.
+
+        Returns:
+            Union[Path, None]: sink path, None without sink.
+        """
+        return self._path
+
+    def append(self, columns: Dict[str, np.ndarray]):
+        """append columns of one generation into buffer, buffer is flushed when it reaches chunk_size rows.
+
+        Args:
+            columns (Dict[str, np.ndarray]): column name and its values, all in same length.
+        """
+        rows = len(next(iter(columns.values()))) if columns else 0
+        if rows == 0:
+            return
+        self._buffer.append(columns)
+        self._buffer_rows += rows
+        self._rows += rows
+        self._view = None
+        if self._buffer_rows >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        """concatenate buffered generations into one chunk, and write it into memory and sink.
+        """
+        if not self._buffer:
+            return
+        names = list(self._buffer[0].keys())
+        chunk = pd.DataFrame({name: np.concatenate([b[name] for b in self._buffer])
+                              for name in names}, columns=names)
+        self._buffer = []
+        self._buffer_rows = 0
+        if self._keep:
+            self._chunks.append(chunk)
+        if self._sink is not None:
+            self._sink.write(chunk)
+
+    def to_df(self) -> pd.DataFrame:
+        """get whole record in data frame, concatenated on demand and reused until next append.
+
+        Returns:
+            pd.DataFrame: evolution record.
+        """
+        if self._view is None:
+            if self._keep:
+                self.flush()
+                if not self._chunks:
+                    self._view = pd.DataFrame()
+                elif len(self._chunks) == 1:
+                    self._view = self._chunks[0]
+                else:
+                    # merge chunks, later views concatenate one chunk only
+                    self._chunks = [pd.concat(self._chunks, ignore_index=True)]
+                    self._view = self._chunks[0]
+            else:
+                self.flush()
+                self._view = read_record(self._path, self._fmt)
+        return self._view
+
+    def get_state(self, spill: Union[str, Path, None] = None) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """get state of `this` recorder without flushing buffer, sink is described by its mark. kept record without sink is appended into npz sidecar spill, only rows not spilled yet are written.
+
+        Args:
+            spill (Union[str, Path, None], optional): path of sidecar npz file for kept record without sink, restarted when path changes. Defaults to None(kept record not saved).
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, np.ndarray]]: settings and counters, columns of buffer(`buffer/` prefix).
+        """
+        meta = {'path': None if self._path is None else str(self._path), 'fmt': self._fmt,
+                'chunk_size': self._chunk_size, 'keep': self._keep, 'rows': self._rows,
+                'mark': None if self._sink is None else self._sink.mark(), 'spill': None}
+        if self._sink is None and spill is not None:
+            if self._spill is None or self._spill._path != Path(spill):
+                self._spill = NpzSink(spill)
+                self._spilled = 0
+            for chunk in self._unspilled():
+                self._spill.write(chunk)
+                self._spilled += len(chunk)
+            meta['spill'] = [str(spill), self._spill.mark()]
+        arrays = {}
+        if self._buffer:
+            for name in self._buffer[0]:
+                arrays['buffer/' + name] = np.concatenate(
+                    [b[name] for b in self._buffer])
+        return meta, arrays
+
+    def _unspilled(self) -> List[pd.DataFrame]:
+        """get kept rows not written into sidecar yet, from latest chunks.
+        """
+        pending = self._rows - self._buffer_rows - self._spilled
+        tail = []
+        for chunk in reversed(self._chunks):
+            if pending <= 0:
+                break
+            tail.append(chunk.iloc[max(len(chunk) - pending, 0):])
+            pending -= len(chunk)
+        return tail[::-1]
+
+    @classmethod
+    def from_state(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> Recorder:
+        """create recorder from state of get_state(), sink and sidecar are reopened at their marks, and kept record is read back from them.
+
+        Args:
+            meta (Dict[str, Any]): settings and counters.
+            arrays (Dict[str, np.ndarray]): columns of buffer.
+
+        Returns:
+            Recorder: recorder to continue recording.
+        """
+        rlt = cls(meta['path'], meta['fmt'], meta['chunk_size'],
+                  meta['keep'], meta['mark'])
+        if meta['spill'] is not None:
+            spill, mark = meta['spill']
+            rlt._spill = NpzSink(spill, mark)
+            kept = read_record(spill, 'npz')
+            rlt._spilled = len(kept)
+        elif rlt._keep and rlt._sink is not None:
+            kept = read_record(rlt._path, rlt._fmt)
+        else:
+            kept = pd.DataFrame()
+        if len(kept):
+            rlt._chunks.append(kept)
+        buffer = {k[7:]: v for k, v in arrays.items() if k.startswith('buffer/')}
+        if buffer:
+            rlt._buffer.append(buffer)
+            rlt._buffer_rows = len(next(iter(buffer.values())))
+        rlt._rows = meta['rows']
+        return rlt
+
+    def close(self):
+        """flush buffer and release sink, once recording is done. run() of ga flushes record at its end but leaves sink open.
+        """
+        self.flush()
+        if self._sink is not None:
+            self._sink.close()
@@ -0,0 +1,408 @@
+"""
+gene schema shared by chromosomes for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import weakref
+import numpy as np
+from typing import Any, Dict, Iterator, List, Tuple, Union
+from .utils import GENE_PRECISION, GENE_MIN, GENE_MAX
+
+logger = logging.getLogger('openGA')
+
+GENE_TYPES = ('real', 'int', 'category', 'binary')
+
+
+class GeneSchema(object):
+    """
+    immutable gene names of chromosome with name-to-index lookup, rounding precision and storage dtype of gene values, physical bounds and type of each gene.
+    genes are kept in [GENE_MIN, GENE_MAX] for genetic operation, decode() maps them into physical units linearly or in log scale.
+    'int', 'category' and 'binary' genes are snapped onto evenly spaced levels in [GENE_MIN, GENE_MAX], so equivalent genotypes share one gene value.
+    schemas are interned by get_schema(), so chromosomes with same settings share one schema and compatibility is an identity check.
+    """
+
+    __slots__ = ('_names', '_index', '_precision', '_dtype', '_lower', '_upper', '_log',
+                 '_log_lower', '_log_upper', '_types', '_categories', '_discrete', '_nominal', '_steps',
+                 '_key', '_hash', '__weakref__')
+
+    def __init__(self, gene_names: Union[List[str], Tuple[str, ...]], precision: Union[int, None] = GENE_PRECISION,
+                 dtype: Union[str, type, np.dtype] = np.float64,
+                 bounds: Union[Dict[str, Tuple[float, float]], None] = None,
+                 log_scale: Union[List[str], None] = None,
+                 gene_types: Union[Dict[str, str], None] = None,
+                 categories: Union[Dict[str, List[Any]], None] = None) -> GeneSchema:
+        """create gene schema, use get_schema() to get the shared one.
+
+        Args:
+            gene_names (Union[List[str], Tuple[str, ...]]): list of gene name.
+            precision (Union[int, None], optional): decimals of gene values rounded on each write. Defaults to GENE_PRECISION, None for full precision without rounding.
+            dtype (Union[str, type, np.dtype], optional): float type of gene array. Defaults to np.float64.
+            bounds (Union[Dict[str, Tuple[float, float]], None], optional): physical (lower, upper) bounds of gene name. Defaults to None(all genes in [GENE_MIN, GENE_MAX]).
+            log_scale (Union[List[str], None], optional): name of genes decoded in log scale, lower bound must be positive. Defaults to None(all in linear scale).
+            gene_types (Union[Dict[str, str], None], optional): type in GENE_TYPES of gene name, 'int' gene takes integer bounds, 'binary' gene is in {0, 1}. Defaults to None(all 'real').
+            categories (Union[Dict[str, List[Any]], None], optional): labels of 'category' gene name, decoded into label index. Defaults to None(no category gene).
+
+        Raises:
+            ValueError: error message of `invalid gene names.`, when gene name duplicated.
+            ValueError: error message of `invalid precision.`, when precision is negative, or too coarse for levels of discrete gene(more than 10**precision intervals).
+            ValueError: error message of `invalid dtype.`, when dtype is not float type.
+            ValueError: error message of `invalid bounds.`, when upper bound not above lower bound, or lower bound of log scale gene not positive.
+            ValueError: error message of `invalid gene type.`, when type not in GENE_TYPES, or settings conflict with type.
+
+        Returns:
+            GeneSchema: new schema object.
+        """
+        self._names = tuple(gene_names)
+        self._index = {name: i for i, name in enumerate(self._names)}
+        if len(self._index) != len(self._names):
+            raise ValueError(
+                'invalid gene names. Must be unique, got %s' % (self._names,))
+        if precision is not None and precision < 0:
+            raise ValueError(
+                'invalid precision. Must >= 0 or None, got %d' % precision)
+        self._precision = None if precision is None else int(precision)
+        self._dtype = np.dtype(dtype)
+        if self._dtype.kind != 'f':
+            raise ValueError(
+                'invalid dtype. Must be float type, got %s' % self._dtype)
+        self._lower = np.full(len(self._names), GENE_MIN, dtype=float)
+        self._upper = np.full(len(self._names), GENE_MAX, dtype=float)
+        self._log = np.zeros(len(self._names), dtype=bool)
+        for name, (low, up) in (bounds or {}).items():
+            self._lower[self.index(name)] = low
+            self._upper[self.index(name)] = up
+        for name in (log_scale or []):
+            self._log[self.index(name)] = True
+        types = ['real'] * len(self._names)
+        for name, gene_type in (gene_types or {}).items():
+            if gene_type not in GENE_TYPES:
+                raise ValueError('invalid gene type. Must in %s, got %s' %
+                                 (GENE_TYPES, gene_type))
+            types[self.index(name)] = gene_type
+        self._categories = {}
+        for name, labels in (categories or {}).items():
+            if types[self.index(name)] not in ('real', 'category') or len(labels) < 2:
+                raise ValueError('invalid gene type. Must category with >= 2 labels, got %s' % name)
+            types[self.index(name)] = 'category'
+            self._categories[name] = tuple(labels)
+        self._types = tuple(types)
+        for i, gene_type in enumerate(self._types):
+            # bounds of discrete genes span their levels
+            if gene_type == 'category':
+                if self._names[i] not in self._categories:
+                    raise ValueError('invalid gene type. Must give labels of category %s' %
+                                     self._names[i])
+                self._lower[i], self._upper[i] = 0, len(self._categories[self._names[i]]) - 1
+            elif gene_type == 'binary':
+                self._lower[i], self._upper[i] = 0, 1
+        self._discrete = np.array([t != 'real' for t in self._types], dtype=bool)
+        self._nominal = np.array([t in ('category', 'binary') for t in self._types], dtype=bool)
+        if np.any(self._log & self._discrete):
+            raise ValueError('invalid gene type. Must real in log scale, got %s' %
+                             [n for n, f in zip(self._names, self._log & self._discrete) if f])
+        fractional = (np.floor(self._lower) != self._lower) | (
+            np.floor(self._upper) != self._upper)
+        if np.any(self._discrete & fractional):
+            raise ValueError('invalid bounds. Must integer for int gene, got %s' %
+                             self._bound_dict())
+        if np.any(self._upper <= self._lower):
+            raise ValueError('invalid bounds. Must upper > lower, got %s' %
+                             self._bound_dict())
+        if np.any(self._lower[self._log] <= 0):
+            raise ValueError('invalid bounds. Must lower > 0 in log scale, got %s' %
+                             self._bound_dict())
+        # log of bounds kept once for decode, zero for linear genes
+        self._log_lower = np.log(self._lower, where=self._log,
+                                 out=np.zeros_like(self._lower))
+        self._log_upper = np.log(self._upper, where=self._log,
+                                 out=np.zeros_like(self._upper))
+        # number of intervals between levels of discrete genes, zero for real genes
+        self._steps = np.where(self._discrete, self._upper - self._lower, 0).astype(int)
+        # levels closer than precision would merge on rounding
+        if self._precision is not None and np.any(self._steps > 10 ** self._precision):
+            raise ValueError('invalid precision. Must resolve levels of discrete genes, got %d for %s' %
+                             (self._precision, [n for n, k in zip(self._names, self._steps)
+                                                if k > 10 ** self._precision]))
+        for arr in (self._lower, self._upper, self._log, self._discrete, self._nominal, self._steps):
+            arr.flags.writeable = False
+        self._key = (self._names, self._precision, self._dtype.str,
+                     tuple(self._lower), tuple(self._upper), tuple(self._log),
+                     self._types, tuple(sorted(self._categories.items())))
+        self._hash = hash(self._key)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __getitem__(self, index: int) -> str:
+        return self._names[index]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, o: object) -> bool:
+        if self is o:
+            return True
+        if not isinstance(o, GeneSchema):
+            return NotImplemented
+        return self._hash == o._hash and self._key == o._key
+
+    def __reduce__(self):
+        # unpickled schema is interned again in receiving process
+        log_scale = [name for name, log in zip(self._names, self._log) if log]
+        gene_types = dict(zip(self._names, self._types))
+        return get_schema, (self._names, self._precision, self._dtype.str, self._bound_dict(), log_scale,
+                            gene_types, self._categories)
+
+    def _bound_dict(self) -> Dict[str, Tuple[float, float]]:
+        return {name: (float(low), float(up)) for name, low, up in zip(self._names, self._lower, self._upper)}
+
+    def __str__(self) -> str:
+        return f"schema{self._names}: precision {self._precision}, {self._dtype}"
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """get gene names in gene order.
+
+        Returns:
+            Tuple[str, ...]: gene names.
+        """
+        return self._names
+
+    @property
+    def precision(self) -> Union[int, None]:
+        """get decimals of gene values rounded on each write.
+
+        Returns:
+            Union[int, None]: decimals, None for no rounding.
+        """
+        return self._precision
+
+    @property
+    def dtype(self) -> np.dtype:
+        """get float type of gene array.
+
+        Returns:
+            np.dtype: storage type.
+        """
+        return self._dtype
+
+    @property
+    def lower(self) -> np.ndarray:
+        """get physical lower bound of each gene.
+
+        Returns:
+            np.ndarray: read-only lower bounds in gene order.
+        """
+        return self._lower
+
+    @property
+    def upper(self) -> np.ndarray:
+        """get physical upper bound of each gene.
+
+        Returns:
+            np.ndarray: read-only upper bounds in gene order.
+        """
+        return self._upper
+
+    @property
+    def log_scale(self) -> np.ndarray:
+        """get log scale flag of each gene.
+
+        Returns:
+            np.ndarray: read-only flags in gene order, True for log scale.
+        """
+        return self._log
+
+    def decode(self, genes: np.ndarray) -> np.ndarray:
+        """map gene values in [GENE_MIN, GENE_MAX] into physical units, gene on last axis.
+
+        Args:
+            genes (np.ndarray): gene values of one chromosome(gene), or population(individual x gene).
+
+        Returns:
+            np.ndarray: physical values in float64 with same shape.
+        """
+        ratio = (np.asarray(genes, dtype=float) - GENE_MIN) / (GENE_MAX - GENE_MIN)
+        rlt = self._lower + ratio * (self._upper - self._lower)
+        if self._log.any():
+            rlt = np.where(self._log, np.exp(
+                self._log_lower + ratio * (self._log_upper - self._log_lower)), rlt)
+        if self._discrete.any():
+            rlt = np.where(self._discrete, np.round(rlt), rlt)
+        return rlt
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        """map physical values into gene values in [GENE_MIN, GENE_MAX], inverse of decode().
+
+        Args:
+            values (np.ndarray): physical values of one chromosome(gene), or population(individual x gene).
+
+        Returns:
+            np.ndarray: gene values in float64 with same shape, out of bounds ones are not limited.
+        """
+        values = np.asarray(values, dtype=float)
+        ratio = (values - self._lower) / (self._upper - self._lower)
+        if self._log.any():
+            log_values = np.log(np.where(self._log, values, 1.0))
+            ratio = np.where(self._log, (log_values - self._log_lower) /
+                             np.where(self._log, self._log_upper - self._log_lower, 1.0), ratio)
+        return GENE_MIN + ratio * (GENE_MAX - GENE_MIN)
+
+    @property
+    def gene_types(self) -> Tuple[str, ...]:
+        """get type of each gene.
+
+        Returns:
+            Tuple[str, ...]: type in GENE_TYPES in gene order.
+        """
+        return self._types
+
+    @property
+    def categories(self) -> Dict[str, Tuple[Any, ...]]:
+        """get labels of category genes, decode() gives label index.
+
+        Returns:
+            Dict[str, Tuple[Any, ...]]: labels of gene name.
+        """
+        return self._categories.copy()
+
+    def snap(self, values: Union[float, np.ndarray], index: Union[int, None] = None) -> Union[float, np.ndarray]:
+        """snap gene values of discrete genes onto their nearest level, real genes are left as they are.
+
+        Args:
+            values (Union[float, np.ndarray]): gene values with gene on last axis, or value of one gene.
+            index (Union[int, None], optional): index of gene when values is value of one gene. Defaults to None.
+
+        Returns:
+            Union[float, np.ndarray]: snapped values.
+        """
+        if index is not None:
+            steps = self._steps[index]
+            if not steps:
+                return values
+            return GENE_MIN + round((values - GENE_MIN) / (GENE_MAX - GENE_MIN) * steps) / steps * (GENE_MAX - GENE_MIN)
+        if not self._discrete.any():
+            return values
+        steps = np.where(self._discrete, self._steps, 1)
+        ratio = (np.asarray(values, dtype=float) - GENE_MIN) / (GENE_MAX - GENE_MIN)
+        snapped = GENE_MIN + np.round(ratio * steps) / steps * (GENE_MAX - GENE_MIN)
+        return np.where(self._discrete, snapped, values)
+
+    def pack(self, genes: np.ndarray) -> Dict[str, np.ndarray]:
+        """pack gene matrix into compact arrays, 'real' genes in gene dtype, 'int' and 'category' genes as smallest unsigned level codes, 'binary' genes as bits by np.packbits.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+
+        Returns:
+            Dict[str, np.ndarray]: packed arrays with keys 'real', 'code' and 'bits', rows follow individuals.
+        """
+        genes = np.asarray(genes)
+        ratio = (genes.astype(float) - GENE_MIN) / (GENE_MAX - GENE_MIN)
+        codes = np.round(ratio * self._steps)
+        coded = self._discrete & ~(self._nominal & (self._steps == 1))
+        code_type = np.min_scalar_type(int(self._steps.max()))
+        bits = self._discrete & ~coded
+        return {'real': genes[:, ~self._discrete].astype(self._dtype),
+                'code': codes[:, coded].astype(code_type),
+                'bits': np.packbits(codes[:, bits].astype(np.uint8), axis=1)}
+
+    def unpack(self, packed: Dict[str, np.ndarray]) -> np.ndarray:
+        """unpack arrays from pack() into gene matrix.
+
+        Args:
+            packed (Dict[str, np.ndarray]): packed arrays with keys 'real', 'code' and 'bits'.
+
+        Returns:
+            np.ndarray: gene values in shape of (individual, gene) in gene dtype.
+        """
+        n_rows = packed['real'].shape[0]
+        coded = self._discrete & ~(self._nominal & (self._steps == 1))
+        bits = self._discrete & ~coded
+        codes = np.zeros((n_rows, len(self._names)))
+        codes[:, coded] = packed['code']
+        codes[:, bits] = np.unpackbits(
+            packed['bits'], axis=1, count=int(bits.sum()))
+        steps = np.where(self._discrete, self._steps, 1)
+        genes = GENE_MIN + codes / steps * (GENE_MAX - GENE_MIN)
+        genes[:, ~self._discrete] = packed['real']
+        return self.round(genes).astype(self._dtype)
+
+    def round(self, values: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """round gene values to precision of schema, values are returned as they are without precision.
+
+        Args:
+            values (Union[float, np.ndarray]): gene value or array.
+
+        Returns:
+            Union[float, np.ndarray]: rounded values.
+        """
+        if self._precision is None:
+            return values
+        if isinstance(values, float):
+            return round(values, self._precision)
+        return np.round(values, self._precision)
+
+    def index(self, name: str) -> int:
+        """get index of gene name.
+
+        Args:
+            name (str): gene name.
+
+        Raises:
+            ValueError: error message of `invalid gene name.`, when name not in schema.
+
+        Returns:
+            int: index of gene, started from ZERO.
+        """
+        try:
+            return self._index[name]
+        except KeyError:
+            raise ValueError('invalid gene name. Must in %s, got %s' %
+                             (self._names, name)) from None
+
+
+_SCHEMAS = weakref.WeakValueDictionary()
+
+
+def get_schema(gene_names: Union[List[str], Tuple[str, ...], GeneSchema], precision: Union[int, None] = GENE_PRECISION,
+               dtype: Union[str, type, np.dtype] = np.float64,
+               bounds: Union[Dict[str, Tuple[float, float]], None] = None,
+               log_scale: Union[List[str], None] = None,
+               gene_types: Union[Dict[str, str], None] = None,
+               categories: Union[Dict[str, List[Any]], None] = None) -> GeneSchema:
+    """get interned schema of gene names and settings, schema is created at first request.
+
+    Args:
+        gene_names (Union[List[str], Tuple[str, ...], GeneSchema]): list of gene name, or schema whose settings override the others.
+        precision (Union[int, None], optional): decimals of gene values rounded on each write. Defaults to GENE_PRECISION, None for full precision without rounding.
+        dtype (Union[str, type, np.dtype], optional): float type of gene array. Defaults to np.float64.
+        bounds (Union[Dict[str, Tuple[float, float]], None], optional): physical (lower, upper) bounds of gene name. Defaults to None(all genes in [GENE_MIN, GENE_MAX]).
+        log_scale (Union[List[str], None], optional): name of genes decoded in log scale. Defaults to None(all in linear scale).
+        gene_types (Union[Dict[str, str], None], optional): type in GENE_TYPES of gene name. Defaults to None(all 'real').
+        categories (Union[Dict[str, List[Any]], None], optional): labels of 'category' gene name. Defaults to None(no category gene).
+
+    Returns:
+        GeneSchema: schema shared by all requests of same gene names and settings.
+    """
+    if isinstance(gene_names, GeneSchema):
+        candidate = gene_names
+    else:
+        candidate = GeneSchema(gene_names, precision, dtype,
+                               bounds, log_scale, gene_types, categories)
+    schema = _SCHEMAS.get(candidate._key)
+    if schema is None:
+        schema = candidate
+        _SCHEMAS[candidate._key] = schema
+    return schema
@@ -0,0 +1,199 @@
+"""
+generation statistics of genetic algorithm in bounded memory
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple, Union
+from .utils import RandomStream
+
+logger = logging.getLogger('openGA')
+
+STATS_FIELDS = ('best', 'mean', 'median', 'std', 'diversity')
+
+
+class GenerationStats(object):
+    """
+    fitness statistics and gene diversity of each generation kept in preallocated ring buffer, with optional reservoir sample of individuals over all generations. memory does not grow with number of generations.
+    """
+
+    def __init__(self, gene_names: List[str], size: int = 1024, sample_size: int = 0,
+                 seed: Union[int, np.random.SeedSequence, None] = None) -> GenerationStats:
+        """create generation statistics.
+
+        Args:
+            gene_names (List[str]): name of genes of individuals.
+            size (int, optional): number of latest generations kept, older ones are overwritten. Defaults to 1024.
+            sample_size (int, optional): number of individuals kept by reservoir sampling over all generations. Defaults to 0(no sample).
+            seed (Union[int, np.random.SeedSequence, None], optional): seed of random stream of reservoir sampling. Defaults to None(fresh entropy).
+
+        Raises:
+            ValueError: error message of `invalid size.`, when size less than 1.
+            ValueError: error message of `invalid sample_size.`, when sample_size less than 0.
+
+        Returns:
+            GenerationStats: new statistics object.
+        """
+        if size < 1:
+            raise ValueError('invalid size. Must >= 1, got %d' % size)
+        if sample_size < 0:
+            raise ValueError(
+                'invalid sample_size. Must >= 0, got %d' % sample_size)
+        self._gene_names = list(gene_names)
+        self._size = size
+        self._count = 0
+        self._gen_ids = np.zeros(size, dtype=int)
+        self._values = np.full((size, len(STATS_FIELDS)), np.nan)
+        self._rng = RandomStream(seed)
+        self._sample_size = sample_size
+        self._seen = 0
+        self._sample_gen_ids = np.zeros(sample_size, dtype=int)
+        self._sample_fitness = np.full(sample_size, np.nan)
+        self._sample_genes = np.zeros((sample_size, len(self._gene_names)))
+
+    def __len__(self) -> int:
+        return min(self._count, self._size)
+
+    def __str__(self) -> str:
+        return f"stats({len(self):d}/{self._size:d}): {self._count:d} generations, {min(self._seen, self._sample_size):d} sampled"
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def size(self) -> int:
+        """get number of latest generations kept.
+
+        Returns:
+            int: ring buffer size.
+        """
+        return self._size
+
+    @property
+    def count(self) -> int:
+        """get number of generations collected so far, include overwritten ones.
+
+        Returns:
+            int: generation counter.
+        """
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """get memory footprint of preallocated arrays, constant over generations.
+
+        Returns:
+            int: bytes of ring buffer and reservoir arrays.
+        """
+        return (self._gen_ids.nbytes + self._values.nbytes + self._sample_gen_ids.nbytes +
+                self._sample_fitness.nbytes + self._sample_genes.nbytes)
+
+    def update(self, gen_id: int, fitness: np.ndarray, genes: np.ndarray):
+        """collect statistics of one generation by vectorized reductions, and offer its individuals to reservoir.
+
+        Args:
+            gen_id (int): generate id of generation.
+            fitness (np.ndarray): fitness of individuals, NaN for not grow-up individual is ignored.
+            genes (np.ndarray): gene values in shape of (individual, gene).
+        """
+        fitness = np.asarray(fitness, dtype=float)
+        genes = np.asarray(genes)
+        slot = self._count % self._size
+        self._gen_ids[slot] = gen_id
+        grown = fitness[~np.isnan(fitness)]
+        if len(grown):
+            self._values[slot, :4] = (grown.max(), grown.mean(),
+                                      np.median(grown), grown.std())
+        else:
+            self._values[slot, :4] = np.nan
+        # mean of standard deviation of each gene
+        self._values[slot, 4] = genes.std(
+            axis=0).mean() if genes.size else np.nan
+        self._count += 1
+        if self._sample_size:
+            self._offer(gen_id, fitness, genes)
+
+    def _offer(self, gen_id: int, fitness: np.ndarray, genes: np.ndarray):
+        """reservoir sampling(algorithm R) of individuals of one generation.
+        """
+        n = len(fitness)
+        seq = self._seen + np.arange(n)
+        # slot of each individual, out of reservoir once seen more than sample_size
+        slots = np.where(seq < self._sample_size, seq,
+                         np.floor(self._rng.random(n) * (seq + 1)).astype(int))
+        taken = slots < self._sample_size
+        slots = slots[taken]
+        self._sample_gen_ids[slots] = gen_id
+        self._sample_fitness[slots] = fitness[taken]
+        self._sample_genes[slots] = genes[taken]
+        self._seen += n
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """get kept generations from oldest to latest in columns of `gen_id` and STATS_FIELDS.
+
+        Returns:
+            Dict[str, np.ndarray]: column name and its values, row of each generation.
+        """
+        n = len(self)
+        order = (self._count - n + np.arange(n)) % self._size
+        rlt = {'gen_id': self._gen_ids[order]}
+        for i, name in enumerate(STATS_FIELDS):
+            rlt[name] = self._values[order, i]
+        return rlt
+
+    def to_df(self) -> pd.DataFrame:
+        """get kept generations from oldest to latest in data frame.
+
+        Returns:
+            pd.DataFrame: statistics with row of each generation.
+        """
+        return pd.DataFrame(self.to_columns())
+
+    def sample(self) -> pd.DataFrame:
+        """get individuals kept in reservoir, each individual of all generations is kept in equal probability.
+
+        Returns:
+            pd.DataFrame: sampled individuals with `gen_id`, `fitness` and ${gene_names} as columns.
+        """
+        n = min(self._seen, self._sample_size)
+        rlt = pd.DataFrame(self._sample_genes[:n], columns=self._gene_names)
+        rlt.insert(0, 'fitness', self._sample_fitness[:n])
+        rlt.insert(0, 'gen_id', self._sample_gen_ids[:n])
+        return rlt
+
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """get state of `this` statistics.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, np.ndarray]]: settings and counters, ring buffer and reservoir arrays.
+        """
+        rng_state = self._rng.state
+        meta = {'gene_names': self._gene_names, 'size': self._size, 'sample_size': self._sample_size,
+                'count': self._count, 'seen': self._seen,
+                'rng': {'bit_generator': rng_state['bit_generator'], 'pos': rng_state['pos']}}
+        arrays = {'gen_ids': self._gen_ids, 'values': self._values, 'sample_gen_ids': self._sample_gen_ids,
+                  'sample_fitness': self._sample_fitness, 'sample_genes': self._sample_genes,
+                  'rng_buffer': rng_state['buffer']}
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> GenerationStats:
+        """create statistics from state of get_state().
+
+        Args:
+            meta (Dict[str, Any]): settings and counters.
+            arrays (Dict[str, np.ndarray]): ring buffer and reservoir arrays.
+
+        Returns:
+            GenerationStats: statistics to continue collecting.
+        """
+        rlt = cls(meta['gene_names'], meta['size'], meta['sample_size'])
+        rlt._count = meta['count']
+        rlt._seen = meta['seen']
+        for name in ('gen_ids', 'values', 'sample_gen_ids', 'sample_fitness', 'sample_genes'):
+            getattr(rlt, '_' + name)[...] = arrays[name]
+        rlt._rng.state = dict(meta['rng'], buffer=arrays['rng_buffer'])
+        return rlt
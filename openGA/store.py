@@ -0,0 +1,140 @@
+"""
+persistent fitness store for genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+from __future__ import annotations
+import logging
+import sqlite3
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Union
+from .chromosome import GENE_PRECISION
+from .cache import gene_keys
+
+logger = logging.getLogger('openGA')
+
+# keep each query below default variable limit of sqlite
+_QUERY_SIZE = 500
+
+
+class FitnessStore(object):
+    """
+    fitness kept in sqlite file across runs, keyed on problem id and gene values rounded to gene precision.
+    """
+
+    def __init__(self, path: Union[str, Path], problem_id: str, precision: Union[int, None] = GENE_PRECISION) -> FitnessStore:
+        """open fitness store, file is created if not exist.
+
+        Args:
+            path (Union[str, Path]): path of sqlite file.
+            problem_id (str): identifier of objective, fitness of other problems in same file is not visible.
+            precision (Union[int, None], optional): decimals of gene values rounded into key. Defaults to GENE_PRECISION, None for exact values.
+
+        Returns:
+            FitnessStore: new store object.
+        """
+        self._path = Path(path)
+        self._problem_id = problem_id
+        self._precision = precision
+        self._hits = 0
+        self._misses = 0
+        self._conn = sqlite3.connect(str(self._path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS fitness ('
+            'problem TEXT NOT NULL, genes BLOB NOT NULL, value REAL, '
+            'PRIMARY KEY (problem, genes))')
+        self._conn.commit()
+
+    def __enter__(self) -> FitnessStore:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        rlt = self._conn.execute(
+            'SELECT COUNT(*) FROM fitness WHERE problem = ?', (self._problem_id,)).fetchone()
+        return rlt[0]
+
+    def __str__(self) -> str:
+        return f"store({self._path}, {self._problem_id}): hits {self._hits:d}, misses {self._misses:d}"
+
+    def __format__(self, format_spec: str) -> str:
+        return str(self)
+
+    @property
+    def problem_id(self) -> str:
+        """get identifier of objective.
+
+        Returns:
+            str: problem id.
+        """
+        return self._problem_id
+
+    @property
+    def hits(self) -> int:
+        """get number of lookups served by store.
+
+        Returns:
+            int: hit counter.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """get number of lookups not found in store.
+
+        Returns:
+            int: miss counter.
+        """
+        return self._misses
+
+    def keys(self, genes: np.ndarray) -> List[bytes]:
+        """convert each row of gene matrix into store key.
+
+        Args:
+            genes (np.ndarray): gene values in shape of (individual, gene).
+
+        Returns:
+            List[bytes]: key of each row.
+        """
+        return gene_keys(genes, self._precision)
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, float]:
+        """look up fitness of keys in batched queries.
+
+        Args:
+            keys (List[bytes]): genotype keys.
+
+        Returns:
+            Dict[bytes, float]: fitness of keys found in store.
+        """
+        rlt = {}
+        for i in range(0, len(keys), _QUERY_SIZE):
+            chunk = keys[i:i + _QUERY_SIZE]
+            marks = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f'SELECT genes, value FROM fitness WHERE problem = ? AND genes IN ({marks})',
+                [self._problem_id] + chunk)
+            for key, value in rows:
+                rlt[bytes(key)] = np.nan if value is None else value
+        self._hits += len(rlt)
+        self._misses += len(set(keys)) - len(rlt)
+        return rlt
+
+    def put_many(self, items: Dict[bytes, float]):
+        """save fitness of keys in one transaction.
+
+        Args:
+            items (Dict[bytes, float]): fitness of genotype keys.
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO fitness (problem, genes, value) VALUES (?, ?, ?)',
+                [(self._problem_id, key, float(fit)) for key, fit in items.items()])
+
+    def close(self):
+        """close sqlite connection.
+        """
+        self._conn.close()
@@ -3,11 +3,13 @@ define common used components
 """
 # Copyright (c) 2015-2021 Neal Nie. All rights reserved.
 
+from __future__ import annotations
 import numpy as np
-from typing import Union
+from typing import Any, Dict, Tuple, Union
 
 GENE_MAX = 1
 GENE_MIN = 0
+GENE_PRECISION = 4
 
 
 def limit(x: Union[int, float], up: Union[int, float] = GENE_MAX, low: Union[int, float] = GENE_MIN) -> Union[int, float]:
@@ -24,18 +26,255 @@ def limit(x: Union[int, float], up: Union[int, float] = GENE_MAX, low: Union[int
     return max(low, min(x, up))
 
 
-def uniform_open(low: float = 0.0, high: float = 1.0) -> float:
+def uniform_open(low: float = 0.0, high: float = 1.0, size: Union[int, Tuple[int, ...], None] = None) -> Union[float, np.ndarray]:
     """generate a random float in open interval (low, high) and obey uniform distribution.
 
     Args:
         low (float, optional): lower boundary, exclusive. Defaults to 0.0.
         high (float, optional): higher boundary, exclusive. Defaults to 1.0.
+        size (Union[int, Tuple[int, ...], None], optional): shape of values drawn in one call. Defaults to None(single float).
 
     Returns:
-        float: random value in (low, high).
+        Union[float, np.ndarray]: random value in (low, high), array of `size` values if size given.
     """
     mid = (low + high) / 2
-    right = np.random.uniform(mid, high)
+    right = np.random.uniform(mid, high, size)
     left = 2 * mid - right
-    rlt = np.random.choice([right, left])
+    if size is None:
+        return np.random.choice([right, left])
+    return np.where(np.random.uniform(size=size) < 0.5, right, left)
+
+
+class RandomStream(object):
+    """
+    seedable random stream on `numpy.random.Generator`, draws are served from a preallocated buffer filled in bulk.
+    """
+
+    def __init__(self, seed: Union[int, None] = None, buffer_size: int = 4096) -> RandomStream:
+        """create random stream.
+
+        Args:
+            seed (Union[int, None], optional): seed of generator, same seed replays same draws. Defaults to None(fresh entropy).
+            buffer_size (int, optional): number of uniform values filled into buffer at once. Defaults to 4096.
+
+        Returns:
+            RandomStream: new random stream object.
+        """
+        self._generator = np.random.default_rng(seed)
+        self._buffer = np.empty(buffer_size)
+        self._pos = buffer_size
+
+    @property
+    def generator(self) -> np.random.Generator:
+        """get generator under `this` stream.
+
+        Returns:
+            np.random.Generator: bit generator wrapper.
+        """
+        return self._generator
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """get state of `this` stream, with bit generator state, copy of buffer and position in buffer.
+
+        Returns:
+            Dict[str, Any]: stream state, restored by setter to replay following draws.
+        """
+        return {'bit_generator': self._generator.bit_generator.state,
+                'buffer': self._buffer.copy(), 'pos': self._pos}
+
+    @state.setter
+    def state(self, state: Dict[str, Any]):
+        self._generator.bit_generator.state = state['bit_generator']
+        self._buffer = np.array(state['buffer'], dtype=float)
+        self._pos = int(state['pos'])
+
+    def _fill(self):
+        """refill buffer in one generator call.
+        """
+        self._generator.random(out=self._buffer)
+        self._pos = 0
+
+    def _take(self, n: int) -> np.ndarray:
+        """take `n` uniform values in [0, 1) from buffer.
+
+        Args:
+            n (int): number of values.
+
+        Returns:
+            np.ndarray: uniform values.
+        """
+        rlt = np.empty(n)
+        filled = 0
+        while filled < n:
+            if self._pos == self._buffer.size:
+                self._fill()
+            k = min(n - filled, self._buffer.size - self._pos)
+            rlt[filled:filled + k] = self._buffer[self._pos:self._pos + k]
+            self._pos += k
+            filled += k
+        return rlt
+
+    def random(self, size: Union[int, Tuple[int, ...], None] = None) -> Union[float, np.ndarray]:
+        """generate random float in [0, 1) and obey uniform distribution.
+
+        Args:
+            size (Union[int, Tuple[int, ...], None], optional): shape of values. Defaults to None(single float).
+
+        Returns:
+            Union[float, np.ndarray]: random value, array of `size` values if size given.
+        """
+        if size is None:
+            return float(self._take(1)[0])
+        return self._take(int(np.prod(size))).reshape(size)
+
+    def uniform_open(self, low: float = 0.0, high: float = 1.0,
+                     size: Union[int, Tuple[int, ...], None] = None) -> Union[float, np.ndarray]:
+        """generate random float in open interval (low, high) and obey uniform distribution.
+
+        Args:
+            low (float, optional): lower boundary, exclusive. Defaults to 0.0.
+            high (float, optional): higher boundary, exclusive. Defaults to 1.0.
+            size (Union[int, Tuple[int, ...], None], optional): shape of values. Defaults to None(single float).
+
+        Returns:
+            Union[float, np.ndarray]: random value in (low, high), array of `size` values if size given.
+        """
+        n = 1 if size is None else int(np.prod(size))
+        u = self._take(n)
+        zero = u == 0
+        while np.any(zero):
+            u[zero] = self._take(int(np.count_nonzero(zero)))
+            zero = u == 0
+        rlt = low + (high - low) * u
+        if size is None:
+            return float(rlt[0])
+        return rlt.reshape(size)
+
+    def integers(self, low: int, high: int, size: Union[int, Tuple[int, ...], None] = None) -> Union[int, np.ndarray]:
+        """generate random integer in [low, high).
+
+        Args:
+            low (int): lower boundary, inclusive.
+            high (int): higher boundary, exclusive.
+            size (Union[int, Tuple[int, ...], None], optional): shape of values. Defaults to None(single int).
+
+        Returns:
+            Union[int, np.ndarray]: random integer, array of `size` values if size given.
+        """
+        u = self.random(size)
+        rlt = np.minimum(low + np.floor(u * (high - low)), high - 1).astype(int)
+        if size is None:
+            return int(rlt)
+        return rlt
+
+
+_DEFAULT_STREAM = RandomStream()
+
+
+def get_stream(rng: Union[RandomStream, None] = None) -> RandomStream:
+    """get random stream to draw from.
+
+    Args:
+        rng (Union[RandomStream, None], optional): injected stream. Defaults to None(module shared stream).
+
+    Returns:
+        RandomStream: `rng` itself, or module shared stream if None.
+    """
+    return _DEFAULT_STREAM if rng is None else rng
+
+
+def _distinct(rng: RandomStream, rows: int, n: int, k: int) -> np.ndarray:
+    """draw min(k, n) distinct indices in [0, n) for each row, by ranking uniform keys of row.
+    """
+    return np.argsort(rng.random((rows, n)), axis=1)[:, :min(k, n)]
+
+
+def tournament(fitness: np.ndarray, pool_size: int, tour_size: int = 2, replace: bool = False,
+               rng: Union[RandomStream, None] = None) -> np.ndarray:
+    """select winners by tournament, all tournaments of a round are drawn as one (pool_size x tour_size) index matrix, candidates of a tournament are distinct.
+
+    Args:
+        fitness (np.ndarray): fitness of each competitor.
+        pool_size (int): number of winners.
+        tour_size (int, optional): number of competitors in each tournament. Defaults to 2.
+        replace (bool, optional): True, a competitor could win more than once. False, each winner is unique and leaves later tournaments. Defaults to False.
+        rng (Union[RandomStream, None], optional): random stream to draw from. Defaults to None(module shared stream).
+
+    Raises:
+        ValueError: error message of `invalid pool_size.`, when unique winners more than competitors.
+
+    Returns:
+        np.ndarray: index of winners.
+    """
+    rng = get_stream(rng)
+    n = len(fitness)
+    if replace:
+        candidates = _distinct(rng, pool_size, n, tour_size)
+        winner = np.argmax(fitness[candidates], axis=1)
+        return candidates[np.arange(pool_size), winner]
+    if pool_size > n:
+        raise ValueError(
+            'invalid pool_size. Must <= %d without replacement, got %d' % (n, pool_size))
+    rlt = np.zeros(0, dtype=int)
+    available = np.ones(n, dtype=bool)
+    # winners drawn twice in one round are kept once, rest slots go into next round
+    while len(rlt) < pool_size:
+        pool = np.flatnonzero(available)
+        n_slot = pool_size - len(rlt)
+        candidates = pool[_distinct(rng, n_slot, len(pool), tour_size)]
+        winner = candidates[np.arange(n_slot), np.argmax(
+            fitness[candidates], axis=1)]
+        _, first = np.unique(winner, return_index=True)
+        winner = winner[np.sort(first)]
+        available[winner] = False
+        rlt = np.concatenate([rlt, winner])
     return rlt
+
+
+def top_k(fitness: np.ndarray, k: int) -> np.ndarray:
+    """get index of `k` highest fitness by partition, only winners are sorted.
+
+    Args:
+        fitness (np.ndarray): fitness of each competitor.
+        k (int): number of winners, capped by number of competitors.
+
+    Returns:
+        np.ndarray: index of winners sorted on fitness from high to low.
+    """
+    k = min(k, len(fitness))
+    if k <= 0:
+        return np.zeros(0, dtype=int)
+    rlt = np.sort(np.argpartition(-fitness, k - 1)[:k])
+    return rlt[np.argsort(-fitness[rlt], kind='stable')]
+
+
+SURVIVAL_MODES = ('plus', 'comma')
+
+
+def survive(parent_fit: np.ndarray, child_fit: np.ndarray, capacity: int, mode: str = 'plus') -> np.ndarray:
+    """select survivors of next generation from parents and children.
+
+    Args:
+        parent_fit (np.ndarray): fitness of individuals in current generation.
+        child_fit (np.ndarray): fitness of children.
+        capacity (int): number of survivors.
+        mode (str, optional): 'plus' for (mu+lambda), parents and children compete together. 'comma' for (mu,lambda), only children survive, best parents fill up if children not enough. Defaults to 'plus'.
+
+    Raises:
+        ValueError: error message of `invalid survival mode.`, when mode not in SURVIVAL_MODES.
+
+    Returns:
+        np.ndarray: index of survivors in parents followed by children, sorted on fitness from high to low.
+    """
+    combine_fit = np.concatenate([parent_fit, child_fit])
+    if mode == 'plus':
+        return top_k(combine_fit, capacity)
+    if mode != 'comma':
+        raise ValueError('invalid survival mode. Must in %s, got %s' %
+                         (SURVIVAL_MODES, mode))
+    rlt = top_k(child_fit, capacity) + len(parent_fit)
+    if len(rlt) < capacity:
+        rlt = np.concatenate(
+            [rlt, top_k(parent_fit, capacity - len(rlt))])
+    return rlt[np.argsort(-combine_fit[rlt], kind='stable')]
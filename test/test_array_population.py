@@ -0,0 +1,138 @@
+"""
+test case for array-backed population
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from openGA import ArrayPopulation, Individual, Chromosome
+
+
+def express(self):
+    self._fitness = 0
+
+
+def evaluate(self):
+    self._fitness += self.plasm.gene_values.sum()
+
+
+class TestArrayPopulation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.names = ['a', 'b', 'c', 'd']
+        genes = np.round(np.random.uniform(size=(10, 4)), 4)
+        self.people_test = ArrayPopulation(
+            3, genes, self.names, capacity=10, fitness=np.arange(10) * 2.0)
+        self.raw_express = Individual.express
+        self.raw_evaluate = Individual.evaluate
+
+    def tearDown(self) -> None:
+        Individual.express = self.raw_express
+        Individual.evaluate = self.raw_evaluate
+
+    def test_init(self):
+        self.assertEqual(self.people_test.gen_id, 3)
+        self.assertEqual(self.people_test.size(), 10)
+        with self.assertRaises(ValueError):
+            self.people_test.parents
+        with self.assertRaises(ValueError):
+            ArrayPopulation(0, np.zeros((2, 3)), self.names)
+
+    def test_from_individuals(self):
+        plasm = Chromosome(self.names)
+        group = [Individual(plasm.random()) for _ in range(5)]
+        group[0]._fitness = 1.5
+        people = ArrayPopulation.from_individuals(2, group, capacity=5)
+        self.assertEqual(people.size(), 5)
+        self.assertEqual(people.fitness[0], 1.5)
+        self.assertTrue(np.isnan(people.fitness[1]))
+        self.assertTrue(np.all(people.genes[3] == group[3].plasm.gene_values))
+
+    def test_nbytes(self):
+        self.assertEqual(self.people_test.nbytes, 10 * 8 * (4 + 3))
+
+    def test_individual(self):
+        person = self.people_test.individual(4)
+        self.assertEqual(person.gen_id, 3)
+        self.assertEqual(person.idv_id, 4)
+        self.assertEqual(person.fitness, 8)
+        self.assertTrue(
+            np.all(person.plasm.gene_values == self.people_test.genes[4]))
+        self.assertEqual(len(self.people_test.curr_gen), 10)
+
+    def test_to_df(self):
+        df = self.people_test.to_df()
+        self.assertListEqual(list(df.columns), [
+                             'gen_id', 'idv_id', 'fitness'] + self.names)
+        self.assertEqual(len(df), 10)
+        columns = self.people_test.to_columns()
+        self.assertTrue(np.all(columns['b'] == self.people_test.genes[:, 1]))
+        self.assertTrue(df.equals(pd.DataFrame(
+            [p.to_dict() for p in self.people_test.curr_gen])))
+
+    def test_evaluate(self):
+        people = ArrayPopulation(0, np.full((3, 4), 0.25), self.names)
+        with self.assertRaises(NotImplementedError):
+            people.evaluate(np.arange(3))
+        Individual.express = express
+        Individual.evaluate = evaluate
+        people.evaluate(np.arange(3))
+        self.assertTrue(np.allclose(people.fitness, 1))
+
+    def test_select(self):
+        parents = self.people_test.select(6, 3)
+        self.assertEqual(len(parents), 6)
+        self.assertTrue(np.all((0 <= parents) & (parents < 10)))
+        self.assertEqual(len(self.people_test.parents), 6)
+
+    def test_reproduce(self):
+        Individual.express = express
+        Individual.evaluate = evaluate
+        self.people_test.select()
+        children = self.people_test.reproduce()
+        self.assertTrue(0 < len(children) <= 2 * self.people_test.size())
+        self.assertTrue(np.all(children >= self.people_test.size()))
+        for c in self.people_test.children:
+            self.assertTrue(c.is_growup())
+
+    def test_eliminate(self):
+        Individual.express = express
+        Individual.evaluate = evaluate
+        self.people_test.select()
+        self.people_test.reproduce()
+        survivors = self.people_test.eliminate()
+        self.assertEqual(len(survivors), 10)
+        fitness = [p.fitness for p in self.people_test.next_gen]
+        self.assertListEqual(fitness, sorted(fitness, reverse=True))
+
+    def test_eliminate_comma(self):
+        Individual.express = express
+        Individual.evaluate = evaluate
+        self.people_test.select()
+        children = self.people_test.reproduce()
+        survivors = self.people_test.eliminate('comma')
+        size = self.people_test.size()
+        self.assertEqual(np.sum(survivors >= size), min(len(children), 10))
+
+    def test_evolve(self):
+        Individual.express = express
+        Individual.evaluate = evaluate
+        next_generation = self.people_test.evolve()
+        self.assertEqual(next_generation.gen_id, 4)
+        self.assertEqual(next_generation.size(), 10)
+        self.assertFalse(np.any(np.isnan(next_generation.fitness)))
+
+    def test_append_newcomer(self):
+        self.people_test.append_newcomer(
+            Individual(Chromosome(self.names).random()))
+        self.assertEqual(self.people_test.size(), 11)
+        self.assertEqual(self.people_test.individual(10).idv_id, 10)
+        with self.assertRaises(ValueError):
+            self.people_test.append_newcomer(
+                Individual(Chromosome(['a', 'x'])))
+
+
+if __name__ == "__main__":
+    unittest.main()
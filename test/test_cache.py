@@ -0,0 +1,74 @@
+"""
+test case for fitness cache
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import unittest
+import numpy as np
+
+from openGA import FitnessCache, BatchEvaluator, GeneticAlgorithm, Individual, Chromosome
+
+
+class TestFitnessCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache = FitnessCache(maxsize=2)
+
+    def test_init(self):
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.maxsize, 2)
+        with self.assertRaises(ValueError):
+            FitnessCache(0)
+
+    def test_keys(self):
+        genes = np.array([[0.12341, 0.5], [0.12339, 0.5], [0.1, -0.0]])
+        keys = self.cache.keys(genes)
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(keys[2], self.cache.keys(np.array([[0.1, 0.0]]))[0])
+
+    def test_lru(self):
+        k0, k1, k2 = self.cache.keys(np.array([[0.1], [0.2], [0.3]]))
+        self.cache.put(k0, 1)
+        self.cache.put(k1, 2)
+        self.assertEqual(self.cache.get(k0), 1)
+        self.cache.put(k2, 3)
+        self.assertIsNone(self.cache.get(k1))
+        self.assertEqual(self.cache.get(k2), 3)
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.misses, 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_evaluator(self):
+        calls = []
+
+        def funct(genes, names):
+            calls.append(len(genes))
+            return genes.sum(axis=1)
+        evaluator = BatchEvaluator(funct)
+        evaluator.cache = FitnessCache()
+        plasm = Chromosome(['a', 'b']).random()
+        group = [Individual(plasm) for _ in range(3)]
+        evaluator.evaluate(group)
+        self.assertListEqual(calls, [1])
+        clone = [Individual(plasm)]
+        evaluator.evaluate(clone)
+        self.assertListEqual(calls, [1])
+        self.assertAlmostEqual(clone[0].fitness, plasm.gene_values.sum())
+        self.assertEqual(evaluator.cache.hits, 1)
+        self.assertEqual(evaluator.cache.misses, 1)
+        # only scored genotype counts as evaluation
+        self.assertEqual(evaluator.evals, 1)
+
+    def test_ga(self):
+        ga = GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 10, cache_size=100)
+        ga.add_batch_patch(lambda genes, names: genes.sum(axis=1))
+        self.assertIs(ga.people.evaluator.cache, ga.cache)
+        ga.run(gen_max=5)
+        self.assertGreater(ga.cache.misses, 0)
+        self.assertLessEqual(len(ga.cache), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
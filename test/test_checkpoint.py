@@ -0,0 +1,152 @@
+"""
+test case for checkpoint and resume of genetic algorithm
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+
+from openGA import GeneticAlgorithm, Recorder, read_record
+
+
+class Preempted(Exception):
+    pass
+
+
+def batch_fitness(genes, names):
+    return -np.sum((genes - 0.3) ** 2, axis=1)
+
+
+def preempt_after(calls):
+    count = [0]
+
+    def funct(genes, names):
+        count[0] += 1
+        if count[0] > calls:
+            raise Preempted()
+        return batch_fitness(genes, names)
+    return funct
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+        self.path = self.dir / 'ga.npz'
+        self.solution = {'a': 0.5, 'b': 0.7, 'c': 0.1, 'd': 0.9}
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _create(self, vectorize, **kwargs):
+        return GeneticAlgorithm(self.solution, capacity=12, vectorize=vectorize, seed=7,
+                                stats_size=4, sample_size=6, **kwargs)
+
+    def test_resume(self):
+        for vectorize in (False, True):
+            full = self._create(vectorize)
+            full.add_batch_patch(batch_fitness)
+            full.run(gen_max=10)
+            # worker is preempted in generation 8, last checkpoint is of generation 6
+            ga = self._create(vectorize)
+            ga.add_batch_patch(preempt_after(8))
+            with self.assertRaises(Preempted):
+                ga.run(gen_max=10, checkpoint=self.path, checkpoint_every=3)
+            # in-memory record is kept in sidecar, checkpoint holds unflushed rows only
+            self.assertTrue(self.dir.joinpath('ga.record.npz').exists())
+            with np.load(self.path) as data:
+                self.assertFalse(any(key.startswith('recorder/kept') for key in data.files))
+            ga = GeneticAlgorithm.resume(self.path)
+            self.assertEqual(ga.people.gen_id, 6)
+            self.assertFalse(ga.patched)
+            ga.add_batch_patch(batch_fitness)
+            self.assertEqual(ga.continue_run(), 'gen_max')
+            self.assertEqual(ga.people.gen_id, 10)
+            self.assertTrue(ga.people.to_df().equals(full.people.to_df()))
+            self.assertTrue(ga.record.equals(full.record))
+            self.assertTrue(ga.stats.to_df().equals(full.stats.to_df()))
+            self.assertTrue(ga.stats.sample().equals(full.stats.sample()))
+            self.assertEqual(ga.evals, full.evals)
+
+    def test_sink(self):
+        sink = self.dir / 'record.csv'
+        full = self._create(True, recorder=Recorder(self.dir / 'full.csv', chunk_size=30))
+        full.add_batch_patch(batch_fitness)
+        full.run(gen_max=10)
+        ga = self._create(True, recorder=Recorder(sink, chunk_size=30))
+        ga.add_batch_patch(preempt_after(8))
+        with self.assertRaises(Preempted):
+            ga.run(gen_max=10, checkpoint=self.path, checkpoint_every=3)
+        ga = GeneticAlgorithm.resume(self.path)
+        ga.add_batch_patch(batch_fitness)
+        ga.continue_run()
+        # rows written after checkpoint are dropped from sink
+        self.assertTrue(read_record(sink).equals(read_record(self.dir / 'full.csv')))
+
+    def test_continue(self):
+        full = self._create(True)
+        full.add_batch_patch(batch_fitness)
+        self.assertEqual(full.run(gen_max=50, max_evals=60, stall_gen=20), 'max_evals')
+        ga = self._create(True)
+        ga.add_batch_patch(preempt_after(4))
+        with self.assertRaises(Preempted):
+            ga.run(gen_max=50, max_evals=60, stall_gen=20, checkpoint=self.path, checkpoint_every=2)
+        ga = GeneticAlgorithm.resume(self.path)
+        ga.add_batch_patch(batch_fitness)
+        # budget of evaluations is shared with part of run before checkpoint
+        self.assertEqual(ga.continue_run(), 'max_evals')
+        self.assertEqual(ga.people.gen_id, full.people.gen_id)
+        self.assertEqual(ga.evals, full.evals)
+        self.assertTrue(ga.record.equals(full.record))
+        # run finished at final checkpoint is not continued, nor its last generation recorded again
+        ga = GeneticAlgorithm.resume(self.path)
+        ga.add_batch_patch(batch_fitness)
+        self.assertEqual(ga.continue_run(), 'max_evals')
+        self.assertTrue(ga.record.equals(full.record))
+        ga.run(gen_max=2)
+        self.assertFalse(ga.record[['gen_id', 'idv_id']].duplicated().any())
+        fresh = self._create(True)
+        fresh.add_batch_patch(batch_fitness)
+        with self.assertRaises(ValueError):
+            fresh.continue_run()
+
+    def test_permutation(self):
+        def tour(genes, names):
+            return -np.abs(np.argsort(genes, axis=1) - np.arange(genes.shape[1])).sum(axis=1)
+        ga = GeneticAlgorithm(self.solution, capacity=8, vectorize=True, seed=3,
+                              permutation='pmx', cache_size=64)
+        ga.add_batch_patch(tour)
+        ga.run(gen_max=3, checkpoint=self.path)
+        resumed = GeneticAlgorithm.resume(self.path)
+        self.assertEqual(resumed.people.gen_id, 3)
+        self.assertTrue(resumed.people.to_df().equals(ga.people.to_df()))
+        self.assertEqual(resumed.cache.maxsize, 64)
+        resumed.add_batch_patch(tour)
+        ga.run(gen_max=2)
+        resumed.run(gen_max=2)
+        self.assertTrue(resumed.people.to_df().equals(ga.people.to_df()))
+
+    def test_gene_types(self):
+        ga = GeneticAlgorithm({'n': 3, 'c': 1, 'b': 1, 'r': 0.25}, capacity=8, vectorize=True, seed=5,
+                              bounds={'n': (0, 300)}, gene_types={'n': 'int', 'b': 'binary'},
+                              categories={'c': ['x', 'y', 'z']}, dtype=np.float32)
+        ga.add_batch_patch(batch_fitness)
+        ga.run(gen_max=2, checkpoint=self.path)
+        with np.load(self.path) as data:
+            self.assertEqual(data['genes/code'].dtype, np.uint16)
+            self.assertEqual(data['genes/bits'].dtype, np.uint8)
+        resumed = GeneticAlgorithm.resume(self.path)
+        self.assertTrue(np.array_equal(resumed.people.genes, ga.people.genes))
+        self.assertEqual(resumed.people.genes.dtype, np.float32)
+
+    def test_invalid(self):
+        np.savez(self.path, genes=np.zeros(3))
+        with self.assertRaises(ValueError):
+            GeneticAlgorithm.resume(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
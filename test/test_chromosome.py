@@ -7,7 +7,9 @@ import unittest
 import numpy as np
 
 from openGA import Chromosome
-from openGA.chromosome import get_crossover_coef, get_mutation_coef, dist_crossover, dist_mutation
+from openGA.chromosome import get_crossover_coef, get_mutation_coef, dist_crossover, dist_mutation, sbx_kernel, pm_kernel, \
+    crossover_kernel, mutation_kernel, random_kernel
+from openGA.schema import get_schema
 
 
 class TestChromosome(unittest.TestCase):
@@ -39,7 +41,7 @@ class TestChromosome(unittest.TestCase):
 
     def test_gene_name(self):
         self.assertListEqual(TestChromosome.names,
-                             TestChromosome.plasm._gene_names)
+                             list(TestChromosome.plasm._gene_names))
 
     def test_init_genes(self):
         self.assertTrue(np.all(self.plasm.gene_values == 0))
@@ -53,6 +55,18 @@ class TestChromosome(unittest.TestCase):
         self.plasm.update(2, 1)
         self.assertEqual(self.plasm.gene_values[1], 1)
 
+    def test_gene_values_view(self):
+        view = self.plasm.gene_values
+        with self.assertRaises(ValueError):
+            view[0] = 0.5
+        self.plasm.gene_values = [0.25, 0.75]
+        self.assertListEqual(view.tolist(), [0.25, 0.75])
+        self.plasm.check = True
+        self.plasm.gene_values = [-1, 0.123456]
+        self.assertListEqual(self.plasm.gene_values.tolist(), [0, 0.1235])
+        with self.assertRaises(ValueError):
+            self.plasm.gene_values = [0.5]
+
     def test_not_couple(self):
         self.assertFalse(self.plasm.is_couple(TestChromosome.plasm))
         test_plasm = Chromosome(['a', 'c'])
@@ -70,7 +84,7 @@ class TestChromosome(unittest.TestCase):
         self.assertFalse(self.plasm._gene_values is test_plasm._gene_values)
 
     def test_random(self):
-        origin_genes = self.plasm.gene_values
+        origin_genes = self.plasm.gene_values.copy()
         print(f'\norigin chromosome: {self.plasm}')
         mock = self.plasm.random()
         print(f'randomized chromosome: {mock}')
@@ -105,6 +119,16 @@ class TestChromosome(unittest.TestCase):
         print(f'\norigin chromosome: {self.plasm}')
         print(f'mutate chromosome: {test_plasm}')
 
+    def test_mutate_gene_prob(self):
+        plasm = Chromosome([f'g-{i}' for i in range(200)])
+        plasm.random(inplace=True)
+        self.assertEqual(plasm.mutate(gene_prob=0), plasm)
+        mutant = plasm.mutate(gene_prob=0.1)
+        changed = np.count_nonzero(mutant.gene_values != plasm.gene_values)
+        self.assertTrue(0 < changed < 60, f'changed genes: {changed}')
+        with self.assertRaises(ValueError):
+            plasm.mutate(gene_prob=1.5)
+
     def test_size(self):
         names = ['a', 'b']
         test_plasm = Chromosome(names)
@@ -122,6 +146,60 @@ class TestChromosome(unittest.TestCase):
             theta = get_mutation_coef()
             self.assertTrue(-1 <= theta <= 1, f'eta is {theta:6.4f}')
 
+    def test_crossover_coef_array(self):
+        beta = get_crossover_coef(size=(50, 4))
+        self.assertTupleEqual(beta.shape, (50, 4))
+        self.assertTrue(np.all(beta > 0))
+        r = np.array([0.1, 0.5, 0.9])
+        for i, v in enumerate(dist_crossover(r)):
+            self.assertAlmostEqual(v, dist_crossover(r[i]))
+
+    def test_mutation_coef_array(self):
+        theta = get_mutation_coef(size=100)
+        self.assertEqual(theta.size, 100)
+        self.assertTrue(np.all((-1 <= theta) & (theta <= 1)))
+        r = np.array([0.1, 0.5, 0.9])
+        for i, v in enumerate(dist_mutation(r)):
+            self.assertAlmostEqual(v, dist_mutation(r[i]))
+
+    def test_sbx_kernel(self):
+        p0 = np.full((2000, 3), 0.3)
+        p1 = np.full((2000, 3), 0.6)
+        c0, c1 = sbx_kernel(p0, p1)
+        self.assertTupleEqual(c0.shape, p0.shape)
+        self.assertTrue(np.all((0 <= c0) & (c0 <= 1)))
+        # sbx keeps the mean of the couple, each child spreads around one parent
+        self.assertTrue(np.allclose((c0 + c1) / 2, 0.45))
+        self.assertAlmostEqual(c0.mean(), 0.6, delta=0.01)
+        self.assertAlmostEqual(c1.mean(), 0.3, delta=0.01)
+
+    def test_pm_kernel(self):
+        genes = np.full((500, 4), 0.5)
+        mutant = pm_kernel(genes)
+        self.assertTupleEqual(mutant.shape, genes.shape)
+        self.assertTrue(np.all((0 <= mutant) & (mutant <= 1)))
+        self.assertAlmostEqual(mutant.mean(), 0.5, delta=0.01)
+        self.assertTrue(np.all(pm_kernel(genes, gene_prob=0) == genes))
+
+    def test_typed_kernels(self):
+        schema = get_schema(['r', 'c', 'b'], gene_types={'b': 'binary'},
+                            categories={'c': ['x', 'y', 'z']})
+        genes = random_kernel(schema, 3000)
+        self.assertTrue(np.allclose(np.bincount(schema.decode(genes)[:, 1].astype(int)) / 3000,
+                                    1 / 3, atol=0.05))
+        mutant = mutation_kernel(genes, schema)
+        self.assertTrue(np.all(mutant[:, 2] == 1 - genes[:, 2]))
+        self.assertTrue(np.all(mutant[:, 1] != genes[:, 1]))
+        self.assertTrue(np.all(schema.snap(mutant) == mutant))
+        c0, c1 = crossover_kernel(genes[:1500], genes[1500:], schema)
+        for col in (1, 2):
+            self.assertTrue(np.all((c0[:, col] == genes[:1500, col]) | (c0[:, col] == genes[1500:, col])))
+            self.assertTrue(np.all(c0[:, col] + c1[:, col] == genes[:1500, col] + genes[1500:, col]))
+        plasm = Chromosome(schema)
+        self.assertIn(plasm.random().decode()[2], (0, 1))
+        child, _ = plasm.random().crossover(plasm.random())
+        self.assertTrue(np.array_equal(schema.round(schema.snap(child.gene_values)), child.gene_values))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,179 @@
+"""
+test case for evaluator
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import asyncio
+import unittest
+import numpy as np
+
+from openGA import Evaluator, BatchEvaluator, FunctionEvaluator, PoolEvaluator, AsyncEvaluator, PatchEvaluator, Population, ArrayPopulation, Individual, Chromosome, GeneticAlgorithm
+
+
+def batch_fit(genes, names):
+    return genes[:, names.index('a')] + 2 * genes[:, names.index('b')]
+
+
+def plasm_fit(plasm):
+    genes = plasm.to_dict()
+    return genes['a'] + 2 * genes['b']
+
+
+class Server(object):
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def fit(self, plasm):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return plasm_fit(plasm)
+
+
+class TestEvaluator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.plasm = Chromosome(['a', 'b'])
+        self.group = [Individual(self.plasm.random()) for _ in range(5)]
+
+    def test_base(self):
+        with self.assertRaises(NotImplementedError):
+            Evaluator().evaluate(self.group)
+
+    def test_batch(self):
+        self.group[0]._fitness = -1
+        calls = []
+
+        def funct(genes, names):
+            calls.append(genes.shape)
+            return batch_fit(genes, names)
+        n = BatchEvaluator(funct).evaluate(self.group)
+        self.assertEqual(n, 4)
+        self.assertListEqual(calls, [(4, 2)])
+        self.assertEqual(self.group[0].fitness, -1)
+        for p in self.group[1:]:
+            a, b = p.plasm.gene_values
+            self.assertAlmostEqual(p.fitness, a + 2 * b)
+        self.assertEqual(BatchEvaluator(funct).evaluate(self.group), 0)
+
+    def test_batch_unmatch(self):
+        evaluator = BatchEvaluator(lambda genes, names: np.zeros(1))
+        with self.assertRaises(ValueError):
+            evaluator.evaluate(self.group)
+
+    def test_patch(self):
+        def express(person):
+            person._fitness = 1
+
+        def evaluate(person):
+            person._fitness += person.plasm.gene_values.sum()
+        self.assertEqual(PatchEvaluator(evaluate, express).evaluate(self.group), 5)
+        for p in self.group:
+            self.assertAlmostEqual(p.fitness, 1 + p.plasm.gene_values.sum())
+        with self.assertRaises(NotImplementedError):
+            Individual(self.plasm).evaluate()
+
+    def test_function(self):
+        n = FunctionEvaluator(plasm_fit).evaluate(self.group)
+        self.assertEqual(n, 5)
+        for p in self.group:
+            a, b = p.plasm.gene_values
+            self.assertAlmostEqual(p.fitness, a + 2 * b)
+
+    def test_pool(self):
+        group = [Individual(self.plasm.random()) for _ in range(40)]
+        with PoolEvaluator(plasm_fit, max_workers=2, chunksize=4) as evaluator:
+            self.assertEqual(evaluator.evaluate(group), 40)
+            people = Population(0, group[:10], 10, evaluator=evaluator)
+            people.evolve()
+        for p in group:
+            a, b = p.plasm.gene_values
+            self.assertAlmostEqual(p.fitness, a + 2 * b)
+        self.assertIsNone(evaluator._executor)
+        with self.assertRaises(ValueError):
+            PoolEvaluator(plasm_fit, chunksize=0)
+
+    def test_async(self):
+        server = Server()
+        evaluator = AsyncEvaluator(server.fit, concurrency=3)
+        group = [Individual(self.plasm.random()) for _ in range(12)]
+        self.assertEqual(asyncio.run(evaluator.evaluate_async(group[:6])), 6)
+        self.assertEqual(server.peak, 3)
+        # blocking call runs own event loop
+        self.assertEqual(evaluator.evaluate(group), 6)
+        for p in group:
+            a, b = p.plasm.gene_values
+            self.assertAlmostEqual(p.fitness, a + 2 * b)
+        with self.assertRaises(ValueError):
+            AsyncEvaluator(server.fit, concurrency=0)
+
+    def test_evolve_async(self):
+        evaluator = AsyncEvaluator(Server().fit)
+        people = Population(0, self.group, 5, evaluator=evaluator)
+        next_people = asyncio.run(people.evolve_async())
+        self.assertEqual(next_people.gen_id, 1)
+        for p in next_people.curr_gen:
+            self.assertTrue(p.is_growup())
+        people = ArrayPopulation.from_individuals(0, self.group, 5, evaluator=evaluator)
+        next_people = asyncio.run(people.evolve_async())
+        self.assertFalse(np.any(np.isnan(next_people.fitness)))
+
+    def test_ga_async(self):
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 6, vectorize)
+            ga.add_async_patch(Server().fit, concurrency=4)
+            asyncio.run(ga.run_async(gen_max=3))
+            self.assertEqual(ga.people.gen_id, 3)
+            self.assertEqual(len(ga.record), 4 * 6)
+
+    def test_population(self):
+        people = Population(0, self.group, 5, evaluator=BatchEvaluator(batch_fit))
+        next_people = people.evolve()
+        self.assertIs(next_people.evaluator, people.evaluator)
+        for p in next_people.curr_gen:
+            self.assertTrue(p.is_growup())
+
+    def test_array_population(self):
+        people = ArrayPopulation.from_individuals(
+            0, self.group, 5, evaluator=BatchEvaluator(batch_fit))
+        next_people = people.evolve()
+        genes = next_people.genes
+        self.assertTrue(np.allclose(next_people.fitness,
+                        genes[:, 0] + 2 * genes[:, 1]))
+
+    def test_ga_pool(self):
+        ga = GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 10)
+        ga.add_pool_patch(plasm_fit, max_workers=2)
+        self.assertIsInstance(ga.people.evaluator, PoolEvaluator)
+        people = ga.people.evolve()
+        ga.people.evaluator.shutdown()
+        self.assertFalse(np.any(np.isnan(people.to_df()['fitness'])))
+        # pool is shut down at end of run, and when replaced by another evaluator
+        pool = ga.people.evaluator
+        ga.run(gen_max=2)
+        self.assertIsNone(pool._executor)
+        pool._score(np.full((1, 2), 0.5), ga.people.curr_gen[0].plasm)
+        self.assertIsNotNone(pool._executor)
+        ga.add_patch(lambda: 1.0)
+        self.assertIsNone(pool._executor)
+        with GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 10) as ga:
+            ga.add_pool_patch(plasm_fit, max_workers=2)
+            pool = ga.people.evaluator
+            ga.people.evolve()
+            self.assertIsNotNone(pool._executor)
+        self.assertIsNone(pool._executor)
+
+    def test_ga(self):
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 10, vectorize)
+            ga.add_batch_patch(batch_fit)
+            self.assertTrue(ga.patched)
+            people = ga.people.evolve()
+            self.assertFalse(np.any(np.isnan(people.to_df()['fitness'])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ from unittest.case import skip
 import numpy as np
 
 from openGA import GeneticAlgorithm
-from openGA import Individual
+from openGA import Individual, ArrayPopulation
 
 
 def get_fitness():
@@ -41,6 +41,66 @@ class TestGeneticAlgorithm(unittest.TestCase):
         self.assertFalse(self.ga.patched)
         print(self.ga.people)
 
+    def test_init_vectorize(self):
+        ga = GeneticAlgorithm({'a': 0.5, 'b': 0.7}, capacity=50, vectorize=True)
+        self.assertIsInstance(ga.people, ArrayPopulation)
+        self.assertEqual(ga.people.size(), 50)
+        self.assertDictEqual(ga.people.individual(0).plasm.to_dict(), {
+                             'a': 0.5, 'b': 0.7})
+
+    def test_seed(self):
+        def evaluate(self):
+            self._fitness = self._plasm.gene_values.sum()
+        Individual.express = lambda self: None
+        Individual.evaluate = evaluate
+        records = []
+        for vectorize in (False, True):
+            for _ in range(2):
+                ga = GeneticAlgorithm({'a': 0.5, 'b': 0.7}, 10, vectorize, seed=3)
+                people = ga.people.evolve().evolve()
+                records.append(people.to_df())
+        self.assertTrue(records[0].equals(records[1]))
+        self.assertTrue(records[2].equals(records[3]))
+
+    def test_precision_dtype(self):
+        def batch(genes, names):
+            return genes.sum(axis=1)
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0.123456, 'b': 0.7}, 10, vectorize, seed=1,
+                                  precision=None, dtype=np.float32)
+            ga.add_batch_patch(batch)
+            ga.run(3)
+            best = ga.result()
+            self.assertEqual(best.gene_values.dtype, np.float32)
+            self.assertTrue(ga.people.curr_gen[0]._plasm.schema.precision is None)
+        self.assertTrue(np.any(ga.people.genes * 1e4 % 1 != 0))
+
+    def test_bounds(self):
+        def batch(values, names):
+            self.assertTrue(np.all((-5 <= values[:, 0]) & (values[:, 0] <= 5)))
+            return -np.abs(values[:, 0] - 2) - np.abs(np.log10(values[:, 1]) - 1)
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0, 'b': 100}, 20, vectorize, seed=7,
+                                  bounds={'a': (-5, 5), 'b': (1, 1e4)}, log_scale=['b'])
+            self.assertTrue(np.allclose(ga.result().decode(), [0, 100]))
+            ga.add_batch_patch(batch, decode=True)
+            ga.run(20)
+            self.assertTrue(np.allclose(ga.result().decode(), [2, 10], rtol=0.2, atol=0.2))
+            self.assertEqual(ga.people.decode().shape, (20, 2))
+
+    def test_gene_types(self):
+        def batch(values, names):
+            return -np.abs(values[:, 0] - 7) - np.abs(values[:, 1] - 2) + values[:, 2] - values[:, 3]
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'n': 0, 'c': 0, 'b': 0, 'r': 0.5}, 20, vectorize, seed=5,
+                                  bounds={'n': (0, 10)}, gene_types={'n': 'int', 'b': 'binary'},
+                                  categories={'c': ['x', 'y', 'z']}, cache_size=1000)
+            ga.add_batch_patch(batch, decode=True)
+            ga.run(30)
+            values = ga.result().decode()
+            self.assertListEqual(values[:3].tolist(), [7, 2, 1])
+            self.assertGreater(ga.cache.hits, 0)
+
     def test_run(self):
         self.ga.add_patch(get_fitness)
         self.assertTrue(self.ga.patched)
@@ -55,6 +115,39 @@ class TestGeneticAlgorithm(unittest.TestCase):
         print("evolution result:")
         print(f"{self.ga.result()}")
 
+    def test_patch_isolated(self):
+        ga_0 = GeneticAlgorithm({'a': 0.5, 'b': 0.7}, 6)
+        ga_1 = GeneticAlgorithm({'a': 0.5, 'b': 0.7}, 6)
+        ga_0.add_patch(lambda: 1.0)
+        ga_1.add_patch(lambda: 2.0)
+        people_0 = ga_0.people.evolve()
+        people_1 = ga_1.people.evolve()
+        self.assertTrue(np.all(people_0.to_df()['fitness'] == 1))
+        self.assertTrue(np.all(people_1.to_df()['fitness'] == 2))
+        with self.assertRaises(NotImplementedError):
+            Individual(people_0.curr_gen[0].plasm).evaluate()
+
+    def test_stop(self):
+        def batch(genes, names):
+            return -np.sum((genes - 0.3) ** 2, axis=1)
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0.5, 'b': 0.7}, 10, vectorize, seed=4)
+            ga.add_batch_patch(batch)
+            self.assertIsNone(ga.stop_reason)
+            self.assertEqual(ga.run(gen_max=3), 'gen_max')
+            self.assertEqual(ga.people.gen_id, 3)
+            # fitness is bounded by 0, so best stalls before gen_max
+            self.assertEqual(ga.run(gen_max=500, stall_gen=5), 'stall')
+            self.assertLess(ga.people.gen_id, 503)
+            self.assertEqual(ga.run(gen_max=50, target=-1.0), 'target')
+            self.assertEqual(ga.stop_reason, 'target')
+            evals = ga.evals
+            self.assertEqual(ga.run(gen_max=50, max_evals=12), 'max_evals')
+            self.assertGreaterEqual(ga.evals - evals, 12)
+            self.assertEqual(ga.run(gen_max=50, timeout=0), 'timeout')
+            with self.assertRaises(ValueError):
+                ga.run(stall_gen=0)
+
     def test_append(self):
         origin_size = self.ga.people.size()
         base_gene = {
@@ -71,6 +164,20 @@ class TestGeneticAlgorithm(unittest.TestCase):
         self.assertIsNot(
             base_gene, self.ga.people.curr_gen[-1].plasm.to_dict())
 
+    def test_append_settings(self):
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({'a': 0, 'b': 100}, 6, vectorize, seed=2, precision=3,
+                                  bounds={'a': (-5, 5), 'b': (1, 1e4)}, log_scale=['b'])
+            ga.append({'a': 2, 'b': 10})
+            newcomer = ga.people.curr_gen[-1].plasm
+            self.assertTrue(newcomer.schema is ga.result().plasm.schema)
+            self.assertTrue(np.allclose(newcomer.decode(), [2, 10]))
+            ga = GeneticAlgorithm({'a': 0, 'b': 1, 'c': 2}, 6, vectorize, seed=2, permutation='pmx')
+            ga.append({'a': 2, 'b': 0, 'c': 1})
+            newcomer = ga.people.curr_gen[-1].plasm
+            self.assertListEqual(newcomer.order.tolist(), [1, 2, 0])
+            self.assertEqual(newcomer._crossover, 'pmx')
+
 
 if __name__ == "__main__":
     unittest.main()
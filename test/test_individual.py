@@ -53,15 +53,29 @@ class TestIndividual(unittest.TestCase):
 
     def test_plasm(self):
         plasm = self.idv_0.plasm
-        self.assertListEqual(plasm._gene_names, self.gene_name)
+        self.assertListEqual(list(plasm._gene_names), self.gene_name)
         self.assertTrue(np.all(plasm.gene_values == self.plasm_0.gene_values))
         print(f'\norigin genes: {self.idv_1.plasm}')
         self.idv_1.plasm = plasm
         print(f'after set: {self.idv_1.plasm}')
-        self.assertListEqual(plasm._gene_names, self.idv_1.plasm._gene_names)
+        self.assertIs(plasm.schema, self.idv_1.plasm.schema)
         self.assertTrue(np.all(plasm.gene_values ==
                         self.idv_1.plasm.gene_values))
 
+    def test_gene_values(self):
+        view = self.idv_0.gene_values
+        self.assertFalse(view.flags.writeable)
+        self.idv_0.plasm = self.idv_1.plasm
+        self.assertTrue(np.all(view == self.idv_1.gene_values))
+
+    def test_footprint(self):
+        self.assertFalse(hasattr(self.idv_0, '__dict__'))
+        self.assertFalse(hasattr(self.idv_0._plasm, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.idv_0.feature = 1
+        # 80 bytes individual, 64 bytes chromosome, 112 + 8 * 4 bytes gene array
+        self.assertLessEqual(self.idv_0.nbytes, 80 + 64 + 112 + 8 * 4)
+
     def test_copy(self):
         person_clone = self.idv_0.copy()
         self.assertEqual(person_clone.gen_id, self.idv_0.gen_id)
@@ -69,6 +83,9 @@ class TestIndividual(unittest.TestCase):
         self.assertEqual(person_clone._check, self.idv_0._check)
         self.assertEqual(person_clone.plasm, self.idv_0.plasm)
         self.assertFalse(person_clone is self.idv_0)
+        self.assertFalse(person_clone._plasm is self.idv_0._plasm)
+        owner = Individual(self.plasm_0, copy=False)
+        self.assertIs(owner._plasm, self.plasm_0)
 
     def test_express(self):
         with self.assertRaises(NotImplementedError):
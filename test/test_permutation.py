@@ -0,0 +1,90 @@
+"""
+test cases for permutation chromosome
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import unittest
+import numpy as np
+
+from openGA import PermutationChromosome, GeneticAlgorithm, Individual
+from openGA.permutation import genes_to_order, order_to_genes, ox_kernel, pmx_kernel, swap_kernel, \
+    inversion_kernel
+from openGA.utils import RandomStream
+
+
+def is_permutation(orders: np.ndarray) -> bool:
+    return bool(np.all(np.sort(orders, axis=-1) == np.arange(orders.shape[-1])))
+
+
+def tour_length(values: np.ndarray, names) -> np.ndarray:
+    # cities on unit circle, shortest tour visits them in angle order
+    angle = 2 * np.pi * np.arange(values.shape[1]) / values.shape[1]
+    xy = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+    tour = xy[genes_to_order(values)]
+    return -np.linalg.norm(tour - np.roll(tour, 1, axis=1), axis=2).sum(axis=1)
+
+
+class TestPermutation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rng = RandomStream(7)
+        self.p0 = np.argsort(self.rng.random((500, 9)), axis=1)
+        self.p1 = np.argsort(self.rng.random((500, 9)), axis=1)
+
+    def test_convert(self):
+        genes = order_to_genes(self.p0)
+        self.assertTrue(np.all((0 <= genes) & (genes <= 1)))
+        self.assertTrue(np.array_equal(genes_to_order(genes), self.p0))
+
+    def test_ox(self):
+        c0, c1 = ox_kernel(self.p0, self.p1, self.rng)
+        self.assertTrue(is_permutation(c0) and is_permutation(c1))
+        # order cross-over keeps relative order of filler outside segment
+        same = np.mean(np.all(c0 == self.p0, axis=1))
+        self.assertLess(same, 0.5)
+
+    def test_pmx(self):
+        c0, c1 = pmx_kernel(self.p0, self.p1, self.rng)
+        self.assertTrue(is_permutation(c0) and is_permutation(c1))
+        # each gene comes from one parent at the same position, or maps out of segment
+        self.assertGreater(np.mean((c0 == self.p0) | (c0 == self.p1)), 0.8)
+
+    def test_mutation(self):
+        for kernel in (swap_kernel, inversion_kernel):
+            mutant = kernel(self.p0, self.rng)
+            self.assertTrue(is_permutation(mutant))
+            self.assertFalse(np.any(np.all(mutant == self.p0, axis=1)))
+        self.assertTrue(np.all(np.sum(swap_kernel(self.p0, self.rng) != self.p0, axis=1) == 2))
+
+    def test_chromosome(self):
+        plasm = PermutationChromosome(list('abcde'), crossover='pmx', mutation='swap')
+        self.assertListEqual(plasm.order.tolist(), [0, 1, 2, 3, 4])
+        plasm.order = [4, 3, 2, 1, 0]
+        self.assertListEqual(plasm.decode().tolist(), [4, 3, 2, 1, 0])
+        couple = plasm.random(rng=self.rng)
+        child, _ = plasm.crossover(couple, rng=self.rng)
+        self.assertIsInstance(child, PermutationChromosome)
+        self.assertTrue(is_permutation(child.order))
+        self.assertTrue(is_permutation(plasm.mutate(rng=self.rng).order))
+        self.assertTrue(is_permutation(plasm.copy().order))
+        self.assertTrue(is_permutation(Individual(plasm).asexual_reproduce(1).gene_values.argsort()))
+        with self.assertRaises(ValueError):
+            plasm.order = [0, 0, 1, 2, 3]
+        with self.assertRaises(ValueError):
+            PermutationChromosome(list('abc'), crossover='cx')
+
+    def test_ga(self):
+        items = [f'city{i}' for i in range(8)]
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm({name: pos for pos, name in enumerate(items[::-1])}, 40, vectorize,
+                                  seed=11, permutation='ox')
+            ga.add_batch_patch(tour_length)
+            ga.run(40)
+            self.assertTrue(is_permutation(ga.result().plasm.order))
+            self.assertAlmostEqual(ga.result().fitness, -16 * np.sin(np.pi / 8), places=6)
+        with self.assertRaises(ValueError):
+            GeneticAlgorithm({'a': 0, 'b': 1}, permutation=True, bounds={'a': (0, 2)})
+
+
+if __name__ == "__main__":
+    unittest.main()
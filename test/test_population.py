@@ -5,6 +5,7 @@ test case for population
 
 import unittest
 import numpy as np
+import pandas as pd
 
 from openGA import Population, Individual, Chromosome
 
@@ -65,8 +66,17 @@ class TestPopulation(unittest.TestCase):
         print(f'\nCurrent Generation Info:')
         print(df)
         print(f'people is {self.people_test}')
+        # columnar export equals frame built from dict of each individual
+        expected = pd.DataFrame([p.to_dict() for p in self.people_test.curr_gen])
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+        columns = self.people_test.to_columns()
+        self.assertListEqual(list(columns), ['gen_id', 'idv_id', 'fitness', 'a', 'b', 'c', 'd'])
+        self.assertTrue(np.all(columns['fitness'] == np.arange(10) * 2))
         df = self.people_1.to_df()
         print(df)
+        self.assertTrue(np.isnan(df['fitness'][0]))
+        self.assertEqual(self.people_1.to_df(default_fit=-1)['fitness'][0], -1)
+        self.assertEqual(len(self.people_0.to_df()), 0)
 
     def test_str(self):
         print(self.people_0)
@@ -116,6 +126,14 @@ class TestPopulation(unittest.TestCase):
         for i in self.people_test.parents:
             print(i)
 
+    def test_select_replace(self):
+        parents = self.people_test.select(10, 3)
+        self.assertEqual(len(set(id(p) for p in parents)), 10)
+        parents = self.people_test.select(40, 3, replace=True)
+        self.assertEqual(len(parents), 40)
+        with self.assertRaises(ValueError):
+            self.people_test.select(11)
+
     def test_reproduce(self):
         Individual.express = express
         Individual.evaluate = evaluate
@@ -151,6 +169,28 @@ class TestPopulation(unittest.TestCase):
         self.assertEqual(
             next_generation[0].gen_id, self.people_test.gen_id + 1)
         self.assertTrue(next_generation[0].is_growup())
+        ids = [(p.gen_id, p.idv_id) for p in self.people_test.curr_gen + self.people_test.children]
+        survivors = self.people_test.eliminate(copy=False)
+        # survivors share chromosome without clone, individuals of current generation keep their ids
+        for p in survivors:
+            self.assertTrue(any(p._plasm is q._plasm for q in self.people_test.curr_gen + self.people_test.children))
+        self.assertListEqual(
+            [(p.gen_id, p.idv_id) for p in self.people_test.curr_gen + self.people_test.children], ids)
+
+    def test_eliminate_comma(self):
+        Individual.express = express
+        Individual.evaluate = evaluate
+        self.people_test.select()
+        children = self.people_test.reproduce()
+        next_generation = self.people_test.eliminate('comma')
+        fitness = [p.fitness for p in next_generation]
+        self.assertListEqual(fitness, sorted(fitness, reverse=True))
+        if len(children) >= self.people_test._capacity:
+            child_fit = sorted([p.fitness for p in children], reverse=True)
+            self.assertListEqual(
+                fitness, child_fit[:self.people_test._capacity])
+        with self.assertRaises(ValueError):
+            self.people_test.eliminate('cross')
 
     def test_evolve(self):
         print(f'\ncurrent generation:')
@@ -159,9 +199,12 @@ class TestPopulation(unittest.TestCase):
         Individual.express = express
         Individual.evaluate = evaluate
         last_gen_id = self.people_test.gen_id
+        last_df = self.people_test.to_df()
         next_generation = self.people_test.evolve()
         curr_gen_id = next_generation.gen_id
         self.assertEqual(last_gen_id + 1, curr_gen_id)
+        # survivors handed over without clone leave current generation as it is
+        self.assertTrue(self.people_test.to_df().equals(last_df))
         del self.people_test
         print('next generation:')
         for p in next_generation.curr_gen:
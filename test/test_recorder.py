@@ -0,0 +1,110 @@
+"""
+test case for evolution recorder
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+
+from openGA import Recorder, read_record, GeneticAlgorithm
+
+
+def batch_fitness(genes, names):
+    return -np.sum((genes - 0.3) ** 2, axis=1)
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _columns(self, gen_id, rows=5):
+        return {'gen_id': np.full(rows, gen_id), 'idv_id': np.arange(rows),
+                'fitness': np.arange(rows) * 0.5, 'a': np.linspace(0, 1, rows)}
+
+    def test_memory(self):
+        recorder = Recorder(chunk_size=12)
+        for gen_id in range(5):
+            recorder.append(self._columns(gen_id))
+        self.assertEqual(len(recorder), 25)
+        df = recorder.to_df()
+        self.assertEqual(list(df.columns), ['gen_id', 'idv_id', 'fitness', 'a'])
+        self.assertEqual(len(df), 25)
+        self.assertEqual(df['gen_id'].tolist(), [i // 5 for i in range(25)])
+        # view is reused until next append
+        self.assertIs(recorder.to_df(), df)
+        recorder.append(self._columns(5))
+        self.assertEqual(len(recorder.to_df()), 30)
+        self.assertRaises(ValueError, Recorder, chunk_size=0)
+        self.assertRaises(ValueError, Recorder, keep=False)
+
+    def test_sink(self):
+        for fmt in ('csv', 'npz'):
+            path = self.dir / f'record.{fmt}'
+            with Recorder(path, chunk_size=7) as recorder:
+                for gen_id in range(4):
+                    recorder.append(self._columns(gen_id))
+                self.assertEqual(len(recorder.to_df()), 20)
+            df = read_record(path)
+            self.assertEqual(len(df), 20)
+            self.assertEqual(list(df.columns), ['gen_id', 'idv_id', 'fitness', 'a'])
+            self.assertTrue(np.allclose(df['a'], np.tile(np.linspace(0, 1, 5), 4)))
+        self.assertRaises(ValueError, Recorder, self.dir / 'record.txt')
+
+    def test_generation_blocks(self):
+        ga = GeneticAlgorithm({'x': 0.5, 'y': 0.2}, capacity=6, seed=1)
+        ga.add_batch_patch(batch_fitness)
+        ga.run(gen_max=3)
+        df = ga.record
+        self.assertEqual(len(df), 4 * 6)
+        for i in range(4):
+            block = df.iloc[i * 6:(i + 1) * 6]
+            self.assertListEqual(block['gen_id'].unique().tolist(), [i])
+            self.assertEqual(block['idv_id'].nunique(), 6)
+
+    def test_state(self):
+        spill = self.dir / 'spill.npz'
+        recorder = Recorder(chunk_size=7)
+        for gen_id in range(3):
+            recorder.append(self._columns(gen_id))
+        meta, arrays = recorder.get_state(spill)
+        # kept chunks go into sidecar, only buffer is in state
+        self.assertListEqual(meta['spill'], [str(spill), 1])
+        self.assertEqual(len(arrays['buffer/a']), 5)
+        for gen_id in range(3, 6):
+            recorder.append(self._columns(gen_id))
+        recorder.to_df()
+        meta, arrays = recorder.get_state(spill)
+        self.assertEqual(meta['spill'][1], 2)
+        self.assertEqual(len(read_record(spill)), 30)
+        resumed = Recorder.from_state(meta, arrays)
+        self.assertTrue(resumed.to_df().equals(recorder.to_df()))
+        self.assertEqual(len(resumed), 30)
+
+    def test_ga(self):
+        solution = {'a': 0.5, 'b': 0.7, 'c': 0.1}
+        path = self.dir / 'record.npz'
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm(solution, capacity=10, vectorize=vectorize, seed=3,
+                                  recorder=Recorder(path, keep=True))
+            ga.add_batch_patch(batch_fitness)
+            ga.run(gen_max=6)
+            # record is flushed into sink at end of run
+            self.assertEqual(len(read_record(path)), 7 * 10)
+            ga.recorder.close()
+            df = ga.record
+            self.assertEqual(len(df), 7 * 10)
+            self.assertEqual(list(df.columns), ['gen_id', 'idv_id', 'fitness', 'a', 'b', 'c'])
+            self.assertTrue(df.equals(read_record(path)))
+            last = df.iloc[-10:].reset_index(drop=True)
+            self.assertTrue(last.equals(ga.people.to_df()))
+
+
+if __name__ == '__main__':
+    unittest.main()
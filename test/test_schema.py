@@ -0,0 +1,116 @@
+"""
+test cases for gene schema
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import pickle
+import unittest
+import numpy as np
+
+from openGA import GeneSchema, Chromosome
+from openGA.schema import get_schema
+
+
+class TestGeneSchema(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.names = ['x', 'y', 'z']
+        self.schema = get_schema(self.names)
+
+    def test_intern(self):
+        self.assertIs(get_schema(['x', 'y', 'z']), self.schema)
+        self.assertIs(get_schema(self.schema), self.schema)
+        self.assertIsNot(get_schema(['x', 'y']), self.schema)
+        self.assertEqual(GeneSchema(self.names), self.schema)
+
+    def test_index(self):
+        self.assertEqual(len(self.schema), 3)
+        self.assertEqual(self.schema.index('y'), 1)
+        self.assertTrue('z' in self.schema)
+        self.assertListEqual(list(self.schema), self.names)
+        with self.assertRaises(ValueError):
+            self.schema.index('w')
+        with self.assertRaises(ValueError):
+            GeneSchema(['x', 'x'])
+
+    def test_precision_dtype(self):
+        schema = get_schema(self.names, None, np.float32)
+        self.assertIsNot(schema, self.schema)
+        self.assertIs(get_schema(self.names, None, 'float32'), schema)
+        self.assertEqual(self.schema.round(0.123456), 0.1235)
+        self.assertEqual(schema.round(0.123456), 0.123456)
+        plasm = Chromosome(schema)
+        plasm.gene_values = [0.123456, 0.5, 1]
+        self.assertEqual(plasm.gene_values.dtype, np.float32)
+        self.assertAlmostEqual(float(plasm.gene_values[0]), 0.123456, places=6)
+        self.assertEqual(plasm.copy().schema, schema)
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, -1)
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, dtype=int)
+
+    def test_decode(self):
+        schema = get_schema(self.names, bounds={'x': (-10, 10), 'z': (1e-3, 1e3)},
+                            log_scale=['z'])
+        genes = np.array([[0, 0.25, 0], [0.5, 1, 0.5], [1, 0, 1]])
+        values = schema.decode(genes)
+        self.assertTrue(np.allclose(values[:, 0], [-10, 0, 10]))
+        self.assertTrue(np.allclose(values[:, 1], [0.25, 1, 0]))
+        self.assertTrue(np.allclose(values[:, 2], [1e-3, 1, 1e3]))
+        self.assertTrue(np.allclose(schema.encode(values), genes))
+        self.assertTrue(np.allclose(schema.decode(genes[1]), values[1]))
+        plasm = Chromosome(schema)
+        plasm.gene_values = [0.5, 0.5, 0.5]
+        self.assertTrue(np.allclose(plasm.decode(), [0, 0.5, 1]))
+        self.assertIs(pickle.loads(pickle.dumps(schema)), schema)
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, bounds={'x': (1, 1)})
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, bounds={'x': (0, 1)}, log_scale=['x'])
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, bounds={'w': (0, 1)})
+
+    def test_gene_types(self):
+        schema = get_schema(['n', 'c', 'b', 'r'], bounds={'n': (2, 6)}, gene_types={'n': 'int', 'b': 'binary'},
+                            categories={'c': ['red', 'green', 'blue']})
+        self.assertTupleEqual(schema.gene_types, ('int', 'category', 'binary', 'real'))
+        genes = schema.round(schema.snap(np.array([[0.3, 0.3, 0.3, 0.3], [0.9, 0.8, 0.6, 0.9]])))
+        self.assertListEqual(genes[0].tolist(), [0.25, 0.5, 0, 0.3])
+        self.assertListEqual(schema.decode(genes).tolist(), [[3, 1, 0, 0.3], [6, 2, 1, 0.9]])
+        self.assertEqual(schema.snap(0.3, 0), 0.25)
+        packed = schema.pack(genes)
+        self.assertEqual(packed['code'].dtype, np.uint8)
+        self.assertEqual(packed['bits'].shape, (2, 1))
+        self.assertTrue(np.array_equal(schema.unpack(packed), genes))
+        self.assertIs(pickle.loads(pickle.dumps(schema)), schema)
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, gene_types={'x': 'complex'})
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, gene_types={'x': 'category'})
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, bounds={'x': (0, 2.5)}, gene_types={'x': 'int'})
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, bounds={'x': (1, 5)}, gene_types={'x': 'int'}, log_scale=['x'])
+        # 10**precision intervals at most, or levels merge on rounding
+        self.assertEqual(GeneSchema(self.names, 2, bounds={'x': (0, 100)}, gene_types={'x': 'int'})._steps[0], 100)
+        with self.assertRaises(ValueError):
+            GeneSchema(self.names, 2, bounds={'x': (0, 101)}, gene_types={'x': 'int'})
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(self.schema)), self.schema)
+        schema = get_schema(self.names, 2, np.float32)
+        self.assertIs(pickle.loads(pickle.dumps(schema)), schema)
+
+    def test_chromosome_share(self):
+        plasm = Chromosome(self.names)
+        twin = plasm.copy()
+        child, _ = plasm.crossover(twin)
+        self.assertIs(plasm.schema, self.schema)
+        self.assertIs(twin.schema, self.schema)
+        self.assertIs(child.schema, self.schema)
+        self.assertTrue(plasm.is_couple(Chromosome(['x', 'y', 'z'])))
+        self.assertFalse(plasm.is_couple(Chromosome(['x', 'y', 'w'])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+test case for generation statistics
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import unittest
+import numpy as np
+
+from openGA import GenerationStats, GeneticAlgorithm
+from openGA.utils import RandomStream
+
+
+def batch_fitness(genes, names):
+    return -np.sum((genes - 0.3) ** 2, axis=1)
+
+
+class TestGenerationStats(unittest.TestCase):
+
+    def test_update(self):
+        stats = GenerationStats(['a', 'b'], size=3)
+        genes = np.array([[0.0, 1.0], [1.0, 1.0], [0.5, 1.0]])
+        stats.update(0, np.array([1.0, 2.0, np.nan]), genes)
+        df = stats.to_df()
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df['best'][0], 2.0)
+        self.assertEqual(df['mean'][0], 1.5)
+        self.assertEqual(df['median'][0], 1.5)
+        self.assertEqual(df['std'][0], 0.5)
+        self.assertAlmostEqual(df['diversity'][0], genes[:, 0].std() / 2)
+        self.assertRaises(ValueError, GenerationStats, ['a'], 0)
+        self.assertRaises(ValueError, GenerationStats, ['a'], 3, -1)
+
+    def test_ring(self):
+        stats = GenerationStats(['a'], size=4, sample_size=10, seed=1)
+        nbytes = stats.nbytes
+        for gen_id in range(1000):
+            stats.update(gen_id, np.full(5, gen_id, dtype=float),
+                         np.full((5, 1), gen_id / 1000))
+        self.assertEqual(stats.nbytes, nbytes)
+        self.assertEqual(stats.count, 1000)
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(stats.to_df()['gen_id'].tolist(), [996, 997, 998, 999])
+        self.assertEqual(stats.to_df()['best'].tolist(), [996, 997, 998, 999])
+        sample = stats.sample()
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(list(sample.columns), ['gen_id', 'fitness', 'a'])
+        self.assertTrue(np.allclose(sample['gen_id'], sample['fitness']))
+        # reservoir spreads over whole run, not only latest generations
+        self.assertLess(sample['gen_id'].min(), 900)
+
+    def test_ga(self):
+        solution = {'a': 0.5, 'b': 0.7, 'c': 0.1}
+        for vectorize in (False, True):
+            ga = GeneticAlgorithm(solution, capacity=10, vectorize=vectorize, seed=3,
+                                  recorder=False, stats_size=5, sample_size=8)
+            ga.add_batch_patch(batch_fitness)
+            ga.run(gen_max=12)
+            self.assertEqual(len(ga.record), 0)
+            df = ga.stats.to_df()
+            self.assertEqual(df['gen_id'].tolist(), list(range(8, 13)))
+            # plus survival never loses best fitness
+            self.assertTrue(np.all(np.diff(df['best']) >= 0))
+            self.assertEqual(df['best'].iloc[-1], ga.result().fitness)
+            self.assertEqual(len(ga.stats.sample()), 8)
+
+    def test_seed(self):
+        solution = {'a': 0.5, 'b': 0.7}
+        draws = [GeneticAlgorithm(solution, seed=3, stats_size=2, sample_size=4).stats._rng.random(6)
+                 for _ in range(2)]
+        self.assertTrue(np.array_equal(draws[0], draws[1]))
+        # reservoir stream is independent of evolution stream of same seed
+        self.assertFalse(np.allclose(draws[0], RandomStream(3).random(6)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+test case for persistent fitness store
+"""
+# Copyright (c) 2015-2021 Neal Nie. All rights reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+
+from openGA import FitnessStore, FitnessCache, BatchEvaluator, GeneticAlgorithm, Chromosome
+
+
+class TestFitnessStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / 'fitness.db'
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+        genes = np.random.uniform(size=(1200, 3))
+        with FitnessStore(self.path, 'p0') as store:
+            keys = store.keys(genes)
+            store.put_many(dict(zip(keys, genes.sum(axis=1))))
+            self.assertEqual(len(store), len(set(keys)))
+            found = store.get_many(keys)
+            self.assertEqual(len(found), len(set(keys)))
+            self.assertAlmostEqual(found[keys[7]], genes[7].sum())
+            self.assertEqual(store.hits, len(set(keys)))
+        # fitness survives reopen but stays within its problem
+        with FitnessStore(self.path, 'p0') as store:
+            self.assertEqual(len(store.get_many(keys[:5])), 5)
+        with FitnessStore(self.path, 'p1') as store:
+            self.assertEqual(len(store.get_many(keys[:5])), 0)
+            self.assertEqual(store.misses, 5)
+
+    def test_evaluator(self):
+        calls = []
+
+        def funct(genes, names):
+            calls.append(len(genes))
+            return genes.sum(axis=1)
+        genes = np.round(np.random.uniform(size=(6, 2)), 4)
+        plasm = Chromosome(['a', 'b'])
+        with FitnessStore(self.path, 'p0') as store:
+            evaluator = BatchEvaluator(funct)
+            evaluator.store = store
+            evaluator.cache = FitnessCache()
+            fit_0 = evaluator.evaluate_genes(genes, plasm)
+        with FitnessStore(self.path, 'p0') as store:
+            evaluator = BatchEvaluator(funct)
+            evaluator.store = store
+            fit_1 = evaluator.evaluate_genes(genes[::-1], plasm)
+            self.assertEqual(store.hits, 6)
+        self.assertListEqual(calls, [6])
+        self.assertTrue(np.all(fit_0[::-1] == fit_1))
+
+    def test_precision(self):
+        # cache keys exact values, store keys rounded values
+        genes = np.random.uniform(size=(6, 2))
+        plasm = Chromosome(['a', 'b'])
+        with FitnessStore(self.path, 'p0') as store:
+            evaluator = BatchEvaluator(lambda genes, names: genes.sum(axis=1))
+            evaluator.store = store
+            evaluator.cache = FitnessCache(precision=None)
+            evaluator.evaluate_genes(genes, plasm)
+            self.assertEqual(len(store.get_many(store.keys(genes))), 6)
+        with FitnessStore(self.path, 'p0') as store:
+            evaluator = BatchEvaluator(lambda genes, names: genes.sum(axis=1))
+            evaluator.store = store
+            evaluator.cache = FitnessCache(precision=None)
+            evaluator.evaluate_genes(genes, plasm)
+            self.assertEqual(store.hits, 6)
+            self.assertEqual(len(store), 6)
+
+    def test_ga(self):
+        with FitnessStore(self.path, 'single-peak') as store:
+            ga = GeneticAlgorithm({'a': 0.2, 'b': 0.4}, 10, store=store)
+            ga.add_batch_patch(lambda genes, names: genes.sum(axis=1))
+            self.assertIs(ga.people.evaluator.store, store)
+            ga.run(gen_max=3)
+            self.assertGreater(len(store), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,9 @@ test case for utils
 # Copyright (c) 2015-2021 Neal Nie. All rights reserved.
 
 import unittest
+import numpy as np
 
-from openGA.utils import uniform_open, limit, GENE_MAX, GENE_MIN
+from openGA.utils import uniform_open, limit, tournament, top_k, survive, RandomStream, get_stream, GENE_MAX, GENE_MIN
 
 
 class TestUtils(unittest.TestCase):
@@ -24,6 +25,68 @@ class TestUtils(unittest.TestCase):
             self.assertLess(val, upper)
             self.assertGreater(val, lower)
 
+    def test_uniform_open_size(self):
+        val = uniform_open(1, 2, size=(100, 3))
+        self.assertTupleEqual(val.shape, (100, 3))
+        self.assertTrue(np.all((1 < val) & (val < 2)))
+
+    def test_stream_seed(self):
+        s0 = RandomStream(7, buffer_size=16)
+        s1 = RandomStream(7, buffer_size=16)
+        self.assertTrue(np.all(s0.random(40) == s1.random(40)))
+        self.assertEqual(s0.uniform_open(), s1.uniform_open())
+        self.assertTrue(np.all(s0.integers(0, 5, (3, 4)) == s1.integers(0, 5, (3, 4))))
+        self.assertFalse(np.all(RandomStream(8).random(10) == s0.random(10)))
+
+    def test_stream_range(self):
+        stream = RandomStream(buffer_size=64)
+        val = stream.uniform_open(1, 2, 1000)
+        self.assertTrue(np.all((1 < val) & (val < 2)))
+        val = stream.integers(2, 5, 1000)
+        self.assertSetEqual(set(val.tolist()), {2, 3, 4})
+        self.assertIsInstance(stream.random(), float)
+        self.assertIsInstance(stream.integers(0, 3), int)
+
+    def test_get_stream(self):
+        stream = RandomStream()
+        self.assertIs(get_stream(stream), stream)
+        self.assertIsInstance(get_stream(), RandomStream)
+
+    def test_tournament(self):
+        fitness = np.arange(10.0)
+        winners = tournament(fitness, 10, 3)
+        self.assertListEqual(sorted(winners.tolist()), list(range(10)))
+        winners = tournament(fitness, 1000, 10, replace=True)
+        self.assertEqual(len(winners), 1000)
+        self.assertGreater(winners.mean(), 6)
+        winners = tournament(fitness, 5, 1000)
+        self.assertEqual(len(set(winners.tolist())), 5)
+        with self.assertRaises(ValueError):
+            tournament(fitness, 11)
+        # candidates of a tournament are distinct, weakest never wins against others
+        for _ in range(20):
+            self.assertNotIn(0, tournament(fitness, 50, 2, replace=True).tolist())
+            self.assertNotIn(0, tournament(fitness, 9, 2).tolist())
+            self.assertNotIn(0, tournament(fitness[:2], 1, 5).tolist())
+
+    def test_top_k(self):
+        fitness = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0])
+        self.assertListEqual(top_k(fitness, 3).tolist(), [5, 7, 4])
+        self.assertListEqual(top_k(fitness, 20).tolist(),
+                             np.argsort(-fitness, kind='stable').tolist())
+
+    def test_survive(self):
+        parent_fit = np.array([9.0, 8.0, 1.0])
+        child_fit = np.array([5.0, 7.0])
+        self.assertListEqual(survive(parent_fit, child_fit, 3).tolist(), [0, 1, 4])
+        self.assertListEqual(
+            survive(parent_fit, child_fit, 2, 'comma').tolist(), [4, 3])
+        # parents fill up when children are not enough
+        self.assertListEqual(
+            survive(parent_fit, child_fit, 3, 'comma').tolist(), [0, 4, 3])
+        with self.assertRaises(ValueError):
+            survive(parent_fit, child_fit, 3, 'cross')
+
 
 if __name__ == "__main__":
     unittest.main()